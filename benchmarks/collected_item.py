@@ -0,0 +1,122 @@
+"""
+CollectedItem micro-benchmark.
+
+Creates items, reads their id a few times (as the service, seen filter
+and watermarks do) and serializes them to the queue dict, once with the
+current slotted model and once with the previous plain dataclass. Reports
+time and memory per 100k items. No external services needed.
+
+    python -m benchmarks.collected_item --items 100000
+"""
+import argparse
+import gc
+import hashlib
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from collector.models import CollectedItem, SourceType
+
+
+@dataclass
+class LegacyCollectedItem:
+    """CollectedItem as it was before slots and the cached id."""
+    source_type: SourceType
+    source_name: str
+    external_id: str
+    url: str
+    title: str
+    content: str
+    author: str | None
+    published_at: datetime
+    collected_at: datetime
+    search_phrase: str
+    metadata: dict
+
+    @property
+    def id(self) -> str:
+        key = f"{self.source_type}:{self.external_id}"
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["source_type"] = self.source_type.value
+        data["published_at"] = self.published_at.isoformat()
+        data["collected_at"] = self.collected_at.isoformat()
+        data["id"] = self.id
+        return data
+
+
+def make(cls, count: int, content: str) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        cls(
+            source_type=SourceType.REDDIT,
+            source_name="r/benchmark",
+            external_id=f"post{i}",
+            url=f"https://reddit.com/r/benchmark/comments/post{i}",
+            title=f"Benchmark post {i}",
+            content=content,
+            author="bench",
+            published_at=now,
+            collected_at=now,
+            search_phrase="benchmark",
+            metadata={"score": i, "num_comments": 3, "subreddit": "benchmark",
+                      "is_self": True, "link_url": None},
+        )
+        for i in range(count)
+    ]
+
+
+def measure(cls, count: int, id_reads: int, content: str) -> dict:
+    # Content is shared, so memory reflects the objects rather than the text
+    gc.collect()
+    tracemalloc.start()
+    items = make(cls, count, content)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+
+    gc.collect()
+    started = time.perf_counter()
+    items = make(cls, count, content)
+    create = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(id_reads):
+        for item in items:
+            item.id
+    ids = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for item in items:
+        item.to_dict()
+    serialize = time.perf_counter() - started
+
+    scale = 100_000 / count
+    return {
+        "create_ms": create * 1000 * scale,
+        "id_ms": ids * 1000 * scale,
+        "to_dict_ms": serialize * 1000 * scale,
+        "memory_mb": memory / 1e6 * scale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--id-reads", type=int, default=3)
+    args = parser.parse_args()
+
+    content = "x" * 1000
+    print(f"Per 100k items ({args.id_reads} id reads each)")
+    print(f"{'model':<10}  {'create ms':>10}  {'id ms':>8}  {'to_dict ms':>10}  {'memory MB':>9}")
+    for name, cls in (("legacy", LegacyCollectedItem), ("slotted", CollectedItem)):
+        r = measure(cls, args.items, args.id_reads, content)
+        print(f"{name:<10}  {r['create_ms']:>10,.0f}  {r['id_ms']:>8,.0f}  "
+              f"{r['to_dict_ms']:>10,.0f}  {r['memory_mb']:>9,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+End-to-end collector benchmark on replayed HTTP traffic.
+
+Drives CollectorService.collect with every source reading from cassettes
+(synthetic ones from benchmarks/fixtures.py by default) and an in-memory
+queue in place of Redis, so it runs without network access. Reports
+items/sec, per-source latency and memory allocated during the run.
+
+    python -m benchmarks.collector --items 2000 --latency 20
+    python -m benchmarks.collector --save baseline.json
+    python -m benchmarks.collector --compare baseline.json
+
+With --compare, exits non-zero if throughput dropped by more than
+--tolerance compared to the saved run.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import fixtures
+from collector.models import SearchRequest
+from collector.queue import QueueClient
+from collector.replay import ReplayTransport
+from collector.service import CollectorService
+from collector.sources.newsapi import NewsAPISource
+from collector.sources.reddit import RedditSource
+from collector.sources.rss import RSSSource
+from collector.sources.twitter import TwitterSource
+
+
+class MemoryQueue(QueueClient):
+    """Stands in for Redis: keeps message counts and sizes only."""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def publish(self, topic: str, message: str | bytes) -> None:
+        self.messages += 1
+        self.bytes += len(message)
+
+    def publish_many(self, topic: str, messages: list[str | bytes]) -> None:
+        self.messages += len(messages)
+        self.bytes += sum(len(m) for m in messages)
+
+    def health_check(self) -> bool:
+        return True
+
+
+def build_sources(cassettes: Path, feeds: dict[str, str], latency: float) -> list:
+    def replay(name: str) -> ReplayTransport:
+        return ReplayTransport([cassettes / f"{name}.json"], latency=latency)
+
+    return [
+        # Sequential paging: date windows would need a recording per window
+        NewsAPISource("replay", transport=replay("newsapi"), max_workers=1),
+        RedditSource(
+            "replay", "replay", "benchmark",
+            subreddits=fixtures.SUBREDDITS, transport=replay("reddit"),
+        ),
+        RSSSource(feeds, transport=replay("rss")),
+        TwitterSource("replay", transport=replay("twitter")),
+    ]
+
+
+def run_once(sources: list, request: SearchRequest, trace: bool) -> dict:
+    queue = MemoryQueue()
+    service = CollectorService(sources, queue, "benchmark")
+    finished: dict[str, float] = {}
+
+    def on_event(event: dict) -> None:
+        if event["type"] == "source_completed":
+            finished[event["source"]] = time.perf_counter() - started
+
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    stats = service.collect(request, on_event)
+    elapsed = time.perf_counter() - started
+    result = {
+        "items": stats["total"],
+        "elapsed": elapsed,
+        "sources": {name: finished.get(name) for name in stats["by_source"]},
+        "errors": stats["errors"],
+        "queued_bytes": queue.bytes,
+    }
+    if trace:
+        result["allocated_peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000, help="Items per source")
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated ms per request")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cassettes", help="Directory with recorded cassettes "
+                        "(newsapi/reddit/rss/twitter.json); default: synthetic")
+    parser.add_argument("--phrase", default=fixtures.PHRASE)
+    parser.add_argument("--start", type=datetime.fromisoformat, default=fixtures.WINDOW_START)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=fixtures.WINDOW_END)
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed items/sec drop for --compare (fraction)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.cassettes:
+            cassettes = Path(args.cassettes)
+            from config import Settings
+            feeds = Settings().rss_feeds
+        else:
+            cassettes = Path(tmp)
+            fixtures.build(cassettes, args.items, args.feeds, args.phrase)
+            feeds = fixtures.rss_feeds(args.feeds)
+
+        request = SearchRequest(
+            phrase=args.phrase, start_date=args.start, end_date=args.end, job_id="benchmark"
+        )
+        latency = args.latency / 1000
+        runs = [
+            run_once(build_sources(cassettes, feeds, latency), request, trace=False)
+            for _ in range(args.repeat)
+        ]
+        # Tracing slows everything down, so allocations get a run of their own
+        traced = run_once(build_sources(cassettes, feeds, latency), request, trace=True)
+
+    for error in runs[-1]["errors"]:
+        print(f"error: {error['source']}: {error['error']}", file=sys.stderr)
+
+    rate = statistics.median(r["items"] / r["elapsed"] for r in runs)
+    result = {
+        "items": runs[-1]["items"],
+        "items_per_sec": rate,
+        "elapsed_ms": statistics.median(r["elapsed"] for r in runs) * 1000,
+        "source_ms": {
+            name: statistics.median(r["sources"][name] for r in runs) * 1000
+            for name in runs[-1]["sources"]
+        },
+        "allocated_peak_mb": traced["allocated_peak"] / 1e6,
+        "queued_mb": runs[-1]["queued_bytes"] / 1e6,
+    }
+
+    print(f"{result['items']} items in {result['elapsed_ms']:,.0f} ms "
+          f"(median of {args.repeat}, {args.latency:g} ms simulated latency)")
+    print(f"  {result['items_per_sec']:,.0f} items/sec")
+    for name, ms in result["source_ms"].items():
+        print(f"  {name:<10} {ms:>8,.0f} ms")
+    print(f"  allocated peak {result['allocated_peak_mb']:,.1f} MB, "
+          f"queued {result['queued_mb']:,.1f} MB")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(result, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        change = rate / baseline["items_per_sec"] - 1
+        print(f"  {change:+.1%} items/sec vs {args.compare}")
+        if change < -args.tolerance:
+            sys.exit(f"Throughput regression: {change:+.1%} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
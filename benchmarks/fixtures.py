@@ -0,0 +1,234 @@
+"""
+Synthetic cassettes for the collector sources.
+
+Builds deterministic NewsAPI, Reddit, Twitter and RSS responses in the
+format RecordingTransport writes, so benchmarks can replay a realistic
+workload without network access or API keys. Real recordings can be used
+instead (see collector/replay.py).
+
+    python -m benchmarks.fixtures --out /tmp/cassettes --items 2000
+"""
+import argparse
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+import httpx
+
+from collector.replay import interaction, save_cassette
+from collector.sources.newsapi import NewsAPISource
+from collector.sources.reddit import RedditSource
+from collector.sources.twitter import TwitterSource
+
+PHRASE = "benchmark"
+WINDOW_END = datetime(2024, 1, 8, tzinfo=timezone.utc)
+WINDOW_START = WINDOW_END - timedelta(days=7)
+SUBREDDITS = ["news", "worldnews", "technology"]
+
+WORDS = (
+    "the market government said on in company new people year report "
+    "election technology climate energy shares would could after over "
+    "police court minister data security users growth prices against"
+).split()
+
+
+def _text(rng: random.Random, words: int, phrase: str | None) -> str:
+    out = [rng.choice(WORDS) for _ in range(words)]
+    if phrase:
+        out.insert(rng.randrange(len(out) + 1), phrase)
+    return " ".join(out)
+
+
+def _times(rng: random.Random, count: int) -> list[datetime]:
+    """Newest first, spread over the window."""
+    span = (WINDOW_END - WINDOW_START).total_seconds()
+    return sorted(
+        (WINDOW_START + timedelta(seconds=rng.uniform(1, span - 1)) for _ in range(count)),
+        reverse=True,
+    )
+
+
+def _url(base: str, params: dict) -> str:
+    return str(httpx.URL(base, params=params))
+
+
+def newsapi(items: int, phrase: str = PHRASE, page_size: int = 100) -> list[dict]:
+    rng = random.Random(1)
+    articles = [
+        {
+            "source": {"id": None, "name": f"Source {i % 40}"},
+            "author": f"Author {i % 300}",
+            "title": _text(rng, 10, phrase),
+            "description": _text(rng, 30, None),
+            "url": f"https://news.example.com/{published:%Y/%m/%d}/article-{i}",
+            "urlToImage": None,
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": _text(rng, 40, phrase),
+        }
+        for i, published in enumerate(_times(rng, items))
+    ]
+    pages = max(math.ceil(items / page_size), 1)
+    return [
+        interaction("GET", _url(f"{NewsAPISource.BASE_URL}/everything", {
+            "q": phrase, "pageSize": page_size, "page": page,
+            "sortBy": "publishedAt", "language": "en",
+        }), headers={"content-type": "application/json"}, body=json.dumps({
+            "status": "ok",
+            "totalResults": items,
+            "articles": articles[(page - 1) * page_size:page * page_size],
+        }))
+        for page in range(1, pages + 1)
+    ]
+
+
+def reddit(items: int, phrase: str = PHRASE, subreddits: list[str] = SUBREDDITS) -> list[dict]:
+    rng = random.Random(2)
+    entries = [interaction(
+        "POST", RedditSource.AUTH_URL,
+        headers={"content-type": "application/json"},
+        body=json.dumps({"access_token": "replay", "token_type": "bearer", "expires_in": 86400}),
+    )]
+    per_subreddit = math.ceil(items / len(subreddits))
+    for subreddit in subreddits:
+        posts = [
+            {"kind": "t3", "data": {
+                "id": f"{subreddit[:2]}{i}",
+                "subreddit": subreddit,
+                "permalink": f"/r/{subreddit}/comments/{subreddit[:2]}{i}/post/",
+                "title": _text(rng, 12, phrase),
+                "selftext": _text(rng, rng.choice((0, 60)), None),
+                "author": f"user{i % 500}",
+                "created_utc": created.timestamp(),
+                "score": rng.randrange(1000),
+                "num_comments": rng.randrange(200),
+                "is_self": True,
+                "url": f"https://reddit.com/r/{subreddit}/comments/{subreddit[:2]}{i}/",
+            }}
+            for i, created in enumerate(_times(rng, per_subreddit))
+        ]
+        after = None
+        for start in range(0, max(len(posts), 1), 100):
+            params = {
+                "q": phrase, "restrict_sr": subreddit != "all",
+                "sort": "new", "limit": 100,
+            }
+            if after:
+                params["after"] = after
+            page = posts[start:start + 100]
+            after = f"t3_{page[-1]['data']['id']}" if start + 100 < len(posts) else None
+            entries.append(interaction(
+                "GET", _url(f"{RedditSource.BASE_URL}/r/{subreddit}/search", params),
+                headers={"content-type": "application/json"},
+                body=json.dumps({"kind": "Listing", "data": {"children": page, "after": after}}),
+            ))
+    return entries
+
+
+def twitter(items: int, phrase: str = PHRASE, page_size: int = 100) -> list[dict]:
+    rng = random.Random(3)
+    tweets = [
+        {
+            "id": str(1743000000000000000 + items - i),
+            "text": _text(rng, 18, phrase),
+            "author_id": str(1000 + i % 200),
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "public_metrics": {"retweet_count": rng.randrange(50), "reply_count": 1,
+                               "like_count": rng.randrange(500), "quote_count": 0},
+            "entities": {"hashtags": [{"tag": phrase}]},
+        }
+        for i, created in enumerate(_times(rng, items))
+    ]
+    entries = []
+    pages = max(math.ceil(items / page_size), 1)
+    for page in range(pages):
+        params = {
+            "query": f"{phrase} {TwitterSource.QUERY_SUFFIX}",
+            "max_results": page_size,
+            "tweet.fields": "id,text,author_id,created_at,public_metrics,entities",
+            "user.fields": "username,name",
+            "expansions": "author_id",
+        }
+        if page:
+            params["next_token"] = f"page{page}"
+        chunk = tweets[page * page_size:(page + 1) * page_size]
+        users = {t["author_id"] for t in chunk}
+        meta = {"result_count": len(chunk)}
+        if page < pages - 1:
+            meta["next_token"] = f"page{page + 1}"
+        entries.append(interaction(
+            "GET", _url(f"{TwitterSource.BASE_URL}/tweets/search/recent", params),
+            headers={"content-type": "application/json"},
+            body=json.dumps({
+                "data": chunk,
+                "includes": {"users": [
+                    {"id": u, "username": f"user{u}", "name": f"User {u}"} for u in sorted(users)
+                ]},
+                "meta": meta,
+            }),
+        ))
+    return entries
+
+
+def rss_feeds(count: int) -> dict[str, str]:
+    return {f"Feed {i}": f"https://feeds.example.com/{i}.xml" for i in range(count)}
+
+
+def rss(items: int, feeds: dict[str, str], phrase: str = PHRASE, match_rate: float = 0.2) -> list[dict]:
+    """Feeds of ``items`` entries in total, ``match_rate`` of them mentioning the phrase."""
+    rng = random.Random(4)
+    per_feed = math.ceil(items / max(len(feeds), 1))
+    entries = []
+    for name, url in feeds.items():
+        entries_xml = "".join(
+            "<item>"
+            f"<title>{escape(_text(rng, 10, phrase if rng.random() < match_rate else None))}</title>"
+            f"<link>{url}/entry-{i}</link><guid>{url}/entry-{i}</guid>"
+            f"<description>{escape(_text(rng, 50, None))}</description>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            "</item>"
+            for i, published in enumerate(_times(rng, per_feed))
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(name)}</title><link>{url}</link>{entries_xml}</channel></rss>"
+        )
+        entries.append(interaction(
+            "GET", url, headers={"content-type": "application/rss+xml"}, body=body
+        ))
+    return entries
+
+
+def build(directory: str | Path, items: int, feeds: int = 20, phrase: str = PHRASE) -> dict[str, Path]:
+    """Write one cassette per source; returns their paths keyed by source."""
+    directory = Path(directory)
+    cassettes = {
+        "newsapi": newsapi(items, phrase),
+        "reddit": reddit(items, phrase),
+        "twitter": twitter(items, phrase),
+        # RSS entries mostly don't match, so generate more to yield ~items
+        "rss": rss(items * 5, rss_feeds(feeds), phrase),
+    }
+    paths = {}
+    for name, interactions in cassettes.items():
+        paths[name] = directory / f"{name}.json"
+        save_cassette(paths[name], interactions)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="Directory for the cassettes")
+    parser.add_argument("--items", type=int, default=2000, help="Items per source")
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--phrase", default=PHRASE)
+    args = parser.parse_args()
+
+    for name, path in build(args.out, args.items, args.feeds, args.phrase).items():
+        print(f"{name:<8} {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Publish throughput benchmark for RedisQueueClient.
+
+Publishes the same synthetic CollectedItem payloads one at a time and
+through PublishBuffer at several flush sizes, and reports items/sec.
+Needs a reachable Redis; the benchmark topic is deleted afterwards.
+
+    python -m benchmarks.queue_publish --redis-url redis://localhost:6379
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from collector.models import CollectedItem, SourceType
+from collector.queue import PublishBuffer, RedisQueueClient
+
+
+def make_messages(count: int, content_size: int) -> list[str]:
+    now = datetime.now(timezone.utc)
+    return [
+        CollectedItem(
+            source_type=SourceType.NEWS_API,
+            source_name="Benchmark Wire",
+            external_id=f"https://example.com/articles/{i}",
+            url=f"https://example.com/articles/{i}",
+            title=f"Benchmark article {i}",
+            content="x" * content_size,
+            author="Bench",
+            published_at=now,
+            collected_at=now,
+            search_phrase="benchmark",
+            metadata={"description": None, "image_url": None},
+        ).to_json()
+        for i in range(count)
+    ]
+
+
+def run(queue: RedisQueueClient, topic: str, messages: list[str], flush_size: int) -> float:
+    """Publish all messages and return items/sec."""
+    queue.client.delete(topic)
+    started = time.perf_counter()
+
+    if flush_size <= 1:
+        for message in messages:
+            queue.publish(topic, message)
+    else:
+        buffer = PublishBuffer(queue, topic, flush_size=flush_size, flush_interval=60.0)
+        for message in messages:
+            buffer.add(message)
+        buffer.flush()
+
+    elapsed = time.perf_counter() - started
+    queue.client.delete(topic)
+    return len(messages) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--content-size", type=int, default=1000)
+    parser.add_argument("--flush-sizes", default="1,10,100,500")
+    parser.add_argument("--streams", action="store_true", help="Publish with XADD")
+    parser.add_argument("--topic", default="benchmark:publish")
+    args = parser.parse_args()
+
+    queue = RedisQueueClient(args.redis_url, use_streams=args.streams)
+    if not queue.health_check():
+        raise SystemExit(f"Redis not reachable at {args.redis_url}")
+
+    messages = make_messages(args.items, args.content_size)
+    print(f"{args.items} items, ~{len(messages[0])} bytes each, "
+          f"{'XADD' if args.streams else 'RPUSH'}")
+    print(f"{'flush size':>10}  {'items/sec':>12}")
+
+    baseline = None
+    for flush_size in (int(s) for s in args.flush_sizes.split(",")):
+        rate = run(queue, args.topic, messages, flush_size)
+        baseline = baseline or rate
+        print(f"{flush_size:>10}  {rate:>12,.0f}  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Queue message format benchmark.
+
+Encodes and decodes synthetic CollectedItems in the legacy JSON format
+and in the binary format with and without compression, and reports
+items/sec plus message size. With --redis-url, also pushes the encoded
+items to a scratch list and reports Redis memory per 100k items.
+
+    python -m benchmarks.wire_format --redis-url redis://localhost:6379
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from collector.models import CollectedItem, SourceType
+from shared.wire import MessageEncoder, decode
+
+
+WORDS = (
+    "the market government said on in company new people year report "
+    "election technology climate energy shares would could after over "
+    "police court minister data security users growth prices against"
+).split()
+
+
+def make_items(count: int, content_size: int) -> list[CollectedItem]:
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(count):
+        # Word salad compresses roughly like prose, unlike a repeated character
+        words = []
+        while sum(len(w) + 1 for w in words) < content_size:
+            words.append(rng.choice(WORDS))
+        items.append(CollectedItem(
+            source_type=SourceType.NEWS_API,
+            source_name="Benchmark Wire",
+            external_id=f"https://example.com/articles/{i}",
+            url=f"https://example.com/articles/{i}",
+            title=f"Benchmark article {i}",
+            content=" ".join(words),
+            author="Bench",
+            published_at=now,
+            collected_at=now,
+            search_phrase="benchmark",
+            metadata={"description": None, "image_url": None},
+        ))
+    return items
+
+
+def rate(func, values: list) -> tuple[list, float]:
+    """Apply func to every value; returns (results, items/sec)."""
+    started = time.perf_counter()
+    results = [func(v) for v in values]
+    return results, len(values) / (time.perf_counter() - started)
+
+
+def redis_bytes_per_100k(client, topic: str, messages: list) -> float:
+    client.delete(topic)
+    for start in range(0, len(messages), 1000):
+        client.rpush(topic, *messages[start:start + 1000])
+    used = client.memory_usage(topic, samples=0) or 0
+    client.delete(topic)
+    return used / len(messages) * 100_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--content-size", type=int, default=4000)
+    parser.add_argument("--topic", default="benchmark:wire")
+    args = parser.parse_args()
+
+    items = make_items(args.items, args.content_size)
+    formats = {
+        "legacy json": (lambda item: item.to_json(), json.loads),
+        "json": (lambda item, e=MessageEncoder("json"): e.encode(item.to_dict()), decode),
+        "binary": (
+            lambda item, e=MessageEncoder(compress_threshold=None): e.encode(item.to_dict()),
+            decode,
+        ),
+        "binary+zlib": (lambda item, e=MessageEncoder(): e.encode(item.to_dict()), decode),
+    }
+
+    client = None
+    if args.redis_url:
+        import redis
+        client = redis.from_url(args.redis_url)
+        client.ping()
+
+    print(f"{args.items} items, ~{args.content_size} bytes of content each")
+    header = f"{'format':<12}  {'encode/s':>10}  {'decode/s':>10}  {'bytes/msg':>9}"
+    if client:
+        header += f"  {'Redis MB/100k':>13}"
+    print(header)
+
+    for name, (encode, decode_message) in formats.items():
+        messages, encode_rate = rate(encode, items)
+        _, decode_rate = rate(decode_message, messages)
+        size = sum(len(m) for m in messages) / len(messages)
+        line = f"{name:<12}  {encode_rate:>10,.0f}  {decode_rate:>10,.0f}  {size:>9,.0f}"
+        if client:
+            memory = redis_bytes_per_100k(client, args.topic, messages)
+            line += f"  {memory / 1e6:>13,.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+import hashlib
+import redis
+
+
+class ValidatorCache(ABC):
+    """Stores HTTP cache validators (ETag / Last-Modified) for conditional GETs."""
+
+    @abstractmethod
+    def get(self, key: str) -> dict:
+        """Return stored validators for ``key`` (empty dict if unknown)."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, validators: dict) -> None:
+        pass
+
+
+class RedisValidatorCache(ValidatorCache):
+    """Redis-backed validator cache shared by all collector replicas."""
+
+    def __init__(self, url: str, ttl: int = 7 * 24 * 3600, prefix: str = "validators"):
+        self.client = redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{hashlib.sha256(key.encode()).hexdigest()[:32]}"
+
+    def get(self, key: str) -> dict:
+        # The cache is an optimization; a Redis hiccup just means a full fetch
+        try:
+            return self.client.hgetall(self._key(key))
+        except redis.RedisError:
+            return {}
+
+    def set(self, key: str, validators: dict) -> None:
+        validators = {k: v for k, v in validators.items() if v}
+        if not validators:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(self._key(key))
+            pipe.hset(self._key(key), mapping=validators)
+            pipe.expire(self._key(key), self.ttl)
+            pipe.execute()
+        except redis.RedisError:
+            pass
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    args: Iterable[T],
+    max_workers: int
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """
+    Run ``func`` over ``args`` on a bounded thread pool.
+
+    Yields ``(arg, result, error)`` tuples in completion order so callers
+    can stream results while slower calls are still in flight. Exactly one
+    of ``result``/``error`` is meaningful for each tuple.
+    """
+    args = list(args)
+    if not args:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(args)))
+    ) as executor:
+        futures = {executor.submit(func, arg): arg for arg in args}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+        finally:
+            # Consumer stopped early: don't start work nobody will read
+            for future in futures:
+                future.cancel()
+
+
+_DONE = object()
+
+
+def stream_concurrently(
+    func: Callable[[T], Iterable[R]],
+    args: Iterable[T],
+    max_workers: int
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """
+    Run generator-like ``func`` over ``args`` on a bounded thread pool.
+
+    Like ``map_concurrently``, but yields ``(arg, value, None)`` for each
+    value as soon as any call produces it, instead of waiting for whole
+    results. A call that fails yields one ``(arg, None, error)`` after the
+    values it produced before failing.
+    """
+    args = list(args)
+    if not args:
+        return
+
+    results: queue.Queue = queue.Queue()
+    stopped = threading.Event()
+
+    def drain(arg: T) -> None:
+        try:
+            for value in func(arg):
+                if stopped.is_set():
+                    return
+                results.put((arg, value, None))
+        except Exception as e:
+            results.put((arg, None, e))
+        finally:
+            results.put(_DONE)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(args)))
+    ) as executor:
+        futures = [executor.submit(drain, arg) for arg in args]
+        try:
+            running = len(futures)
+            while running:
+                entry = results.get()
+                if entry is _DONE:
+                    running -= 1
+                    continue
+                yield entry
+        finally:
+            # Consumer stopped early: running calls stop at their next value
+            stopped.set()
+            for future in futures:
+                future.cancel()
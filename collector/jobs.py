@@ -0,0 +1,306 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+import redis
+
+
+class JobConflict(Exception):
+    """A job with the same ID is still queued or running."""
+
+
+class JobStore:
+    """
+    Collection job state in Redis.
+
+    Jobs are stored as JSON documents so that any collector replica can
+    answer status queries, not only the one running the job. Progress
+    events go to a per-job Redis stream that clients can follow live.
+
+    While a job is queued or running, its replica holds a lease on it (a
+    key with a short TTL that JobRunner keeps renewing). Creating a job
+    takes the lease atomically, so an ID can't be started twice, and a
+    job whose replica died without finishing it is reported as failed
+    once the lease runs out.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: int = 7 * 24 * 3600,
+        prefix: str = "job",
+        max_events: int = 10000
+    ):
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.max_events = max_events
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def _lease_key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}:lease"
+
+    def create(self, job: dict, lease: float) -> bool:
+        """
+        Save a new job unless one with its ID is still queued or running.
+
+        Takes the job's lease for ``lease`` seconds; returns False (and
+        saves nothing) if another job holds it.
+        """
+        if not self.client.set(
+            self._lease_key(job["id"]), 1, nx=True, px=max(int(lease * 1000), 1)
+        ):
+            return False
+        self.save(job)
+        return True
+
+    def renew(self, job_ids: list[str], lease: float) -> None:
+        """Extend the leases of jobs this replica is still working on."""
+        if not job_ids:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.pexpire(self._lease_key(job_id), max(int(lease * 1000), 1))
+        pipe.execute()
+
+    def release(self, job_id: str) -> None:
+        """Give up a finished job's lease, so its ID can be reused."""
+        self.client.delete(self._lease_key(job_id))
+
+    def save(self, job: dict) -> None:
+        self.client.set(self._key(job["id"]), json.dumps(job), ex=self.ttl)
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        The job document, or None.
+
+        An unfinished job whose lease has run out is returned as failed,
+        since no replica is working on it any more.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self._key(job_id))
+        pipe.exists(self._lease_key(job_id))
+        data, leased = pipe.execute()
+        if not data:
+            return None
+        job = json.loads(data)
+        if job["status"] in ("queued", "running") and not leased:
+            job["status"] = "failed"
+            job["error"] = "The collector running this job stopped before it finished"
+        return job
+
+    def _events_key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}:events"
+
+    def clear_events(self, job_id: str) -> None:
+        self.client.delete(self._events_key(job_id))
+
+    def append_event(self, job_id: str, event: dict) -> None:
+        """Add an event to the job's event stream (a capped Redis stream)."""
+        key = self._events_key(job_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xadd(key, {"event": json.dumps(event)}, maxlen=self.max_events, approximate=True)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def read_events(
+        self, job_id: str, after: str = "0", block_ms: int | None = None
+    ) -> list[tuple[str, dict]]:
+        """
+        Events after stream ID ``after`` as (id, event) pairs.
+
+        Waits up to ``block_ms`` for new events when there are none yet.
+        """
+        result = self.client.xread(
+            {self._events_key(job_id): after}, count=500, block=block_ms
+        )
+        return [
+            (event_id.decode(), json.loads(fields[b"event"]))
+            for _, entries in result or []
+            for event_id, fields in entries
+        ]
+
+    def follow(
+        self, job_id: str, after: str = "0", heartbeat: float = 15.0
+    ) -> Iterator[tuple[str | None, dict]]:
+        """
+        Events after stream ID ``after`` as (id, event) pairs, until the job ends.
+
+        Yields (None, {"type": "heartbeat"}) after ``heartbeat`` seconds
+        without events. Stops after the final status event, or, if the
+        job is gone or its replica stopped (see get), after a status
+        event saying so.
+        """
+        last_id = after
+        while True:
+            events = self.read_events(job_id, last_id, block_ms=int(heartbeat * 1000))
+            if not events:
+                job = self.get(job_id)
+                if job is None:
+                    return
+                if job["status"] in ("completed", "failed"):
+                    # The final event was missed (e.g. trimmed) or never sent
+                    yield None, {"type": "status", **{k: job.get(k) for k in _FINAL_FIELDS}}
+                    return
+                yield None, {"type": "heartbeat"}
+                continue
+
+            for last_id, event in events:
+                yield last_id, event
+                if event["type"] == "status" and event["status"] in ("completed", "failed"):
+                    return
+
+
+class JobRunner:
+    """
+    Runs collection jobs on a bounded background pool.
+
+    Jobs beyond ``max_concurrency`` wait in the pool's queue with status
+    "queued". Progress events from CollectorService are folded into the
+    job document and persisted as they arrive, and appended as-is to the
+    job's event stream together with status changes.
+
+    A background thread renews the lease (see JobStore) of every job the
+    runner holds, queued or running, every third of ``lease`` seconds.
+    """
+
+    def __init__(self, store: JobStore, max_concurrency: int = 4, lease: float = 60.0):
+        self.store = store
+        self.lease = lease
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="job"
+        )
+        self._active: set[str] = set()
+        self._active_lock = threading.Lock()
+        self._heartbeat: threading.Thread | None = None
+
+    def submit(
+        self,
+        run: Callable[[Callable[[dict], None]], dict],
+        job_id: str | None = None,
+        params: dict | None = None
+    ) -> dict:
+        """
+        Queue a job and return its initial state.
+
+        Args:
+            run: Called with a progress callback; returns the final stats
+            job_id: Caller-supplied ID (a random one is generated otherwise)
+            params: Request parameters echoed in the job document
+
+        Raises:
+            JobConflict: A job with this ID is still queued or running
+        """
+        job = {
+            "id": job_id or uuid.uuid4().hex,
+            "status": "queued",
+            "params": params or {},
+            "submitted_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": {"total": 0, "by_source": {}, "errors": []},
+            "stats": None,
+            "error": None,
+        }
+        if not self.store.create(job, self.lease):
+            raise JobConflict(f"Job {job['id']} is still queued or running")
+        with self._active_lock:
+            self._active.add(job["id"])
+        self._start_heartbeat()
+        # A reused ID must not replay the previous run's events
+        self.store.clear_events(job["id"])
+        self._publish(job, {"type": "status", "status": "queued"})
+        initial = dict(job)
+        self.executor.submit(self._run, job, run)
+        return initial
+
+    def _run(self, job: dict, run: Callable[[Callable[[dict], None]], dict]) -> None:
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def on_event(event: dict) -> None:
+            self._publish(job, event)
+            with lock:
+                progress = job["progress"]
+                if event["type"] == "progress":
+                    progress["by_source"][event["source"]] = event["count"]
+                    progress["total"] = sum(progress["by_source"].values())
+                elif event["type"] == "source_completed" and event.get("error"):
+                    progress["errors"].append({
+                        "source": event["source"], "error": event["error"]
+                    })
+                job["elapsed_seconds"] = round(time.monotonic() - started, 3)
+                self._save(job)
+
+        job["status"] = "running"
+        job["started_at"] = _now()
+        self._save(job)
+        self._publish(job, {"type": "status", "status": "running"})
+
+        try:
+            stats = run(on_event)
+            with lock:
+                job["status"] = "completed"
+                job["stats"] = stats
+        except Exception as e:
+            with lock:
+                job["status"] = "failed"
+                job["error"] = str(e)
+
+        with lock:
+            job["finished_at"] = _now()
+            job["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            self._save(job)
+        # Last event, so followers can stop reading
+        self._publish(job, {"type": "status", **{k: job[k] for k in _FINAL_FIELDS}})
+        with self._active_lock:
+            self._active.discard(job["id"])
+        try:
+            self.store.release(job["id"])
+        except redis.RedisError as e:
+            print(f"Failed to release job {job['id']}: {e}")
+
+    def _start_heartbeat(self) -> None:
+        with self._active_lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(
+                target=self._renew_leases, name="job-heartbeat", daemon=True
+            )
+            self._heartbeat.start()
+
+    def _renew_leases(self) -> None:
+        while True:
+            time.sleep(self.lease / 3)
+            with self._active_lock:
+                job_ids = list(self._active)
+            try:
+                self.store.renew(job_ids, self.lease)
+            except redis.RedisError as e:
+                print(f"Failed to renew job leases: {e}")
+
+    def _publish(self, job: dict, event: dict) -> None:
+        try:
+            self.store.append_event(job["id"], event)
+        except redis.RedisError as e:
+            print(f"Failed to publish event for job {job['id']}: {e}")
+
+    def _save(self, job: dict) -> None:
+        # A status write failing must not abort the collection itself
+        try:
+            self.store.save(job)
+        except redis.RedisError as e:
+            print(f"Failed to save job {job['id']}: {e}")
+
+
+# Fields of the final "status" event
+_FINAL_FIELDS = ("status", "stats", "error", "elapsed_seconds")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
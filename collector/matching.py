@@ -0,0 +1,17 @@
+class PhraseMatcher:
+    """
+    Case-insensitive multi-phrase substring matcher.
+
+    Lowercases a text once, then checks each phrase with ``in``. That finds
+    overlapping phrases too ("climate" and "climate change"), which a single
+    alternation regex would not, and for the tens of phrases tracked here
+    it beats a pure-Python automaton by a wide margin.
+    """
+
+    def __init__(self, phrases: list[str]):
+        self.phrases = sorted({p.lower() for p in phrases if p})
+
+    def find(self, text: str) -> set[str]:
+        """Return the (lowercased) phrases that occur in ``text``."""
+        text = text.lower()
+        return {phrase for phrase in self.phrases if phrase in text}
@@ -1,8 +1,9 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import json
 import hashlib
+from shared.urls import canonicalize_url
 
 
 class SourceType(str, Enum):
@@ -12,9 +13,15 @@ class SourceType(str, Enum):
     TWITTER = "twitter"
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectedItem:
-    """Normalized content item from any source."""
+    """
+    Normalized content item from any source.
+
+    Slotted because large collections create hundreds of thousands of
+    these; the id and canonical URL are computed on first use and then
+    cached.
+    """
     source_type: SourceType
     source_name: str          # e.g., "reuters", "r/technology"
     external_id: str          # Original ID from source
@@ -26,20 +33,50 @@ class CollectedItem:
     collected_at: datetime
     search_phrase: str
     metadata: dict            # Source-specific extras
+    article_url: str | None = None  # Linked article, e.g. of a Reddit link post
+    _id: str | None = field(default=None, init=False, repr=False, compare=False)
+    _canonical_url: str | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def id(self) -> str:
         """Deterministic ID based on source and external ID."""
-        key = f"{self.source_type}:{self.external_id}"
-        return hashlib.sha256(key.encode()).hexdigest()[:16]
+        if self._id is None:
+            key = f"{self.source_type}:{self.external_id}"
+            self._id = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return self._id
+
+    @property
+    def canonical_url(self) -> str:
+        """
+        Canonical URL of the article (see shared.urls), "" if none.
+
+        Unlike the id, this is the same whichever source the article was
+        collected through, so the processor uses it to reuse analyses.
+        """
+        if self._canonical_url is None:
+            self._canonical_url = canonicalize_url(self.article_url or self.url)
+        return self._canonical_url
+
+    def to_dict(self) -> dict:
+        """Queue message fields (see shared.wire for the encoding)."""
+        return {
+            "source_type": self.source_type.value,
+            "source_name": self.source_name,
+            "external_id": self.external_id,
+            "url": self.url,
+            "title": self.title,
+            "content": self.content,
+            "author": self.author,
+            "published_at": self.published_at.isoformat(),
+            "collected_at": self.collected_at.isoformat(),
+            "search_phrase": self.search_phrase,
+            "metadata": self.metadata,
+            "id": self.id,
+            "canonical_url": self.canonical_url,
+        }
 
     def to_json(self) -> str:
-        data = asdict(self)
-        data["source_type"] = self.source_type.value
-        data["published_at"] = self.published_at.isoformat()
-        data["collected_at"] = self.collected_at.isoformat()
-        data["id"] = self.id
-        return json.dumps(data)
+        return json.dumps(self.to_dict())
 
 
 @dataclass
@@ -50,3 +87,5 @@ class SearchRequest:
     end_date: datetime
     job_id: str               # For tracking/correlation
     sources: list[str] | None = None  # None means all enabled sources
+    incremental: bool = False  # Only fetch content newer than the watermark
+    cursor: dict | None = None  # Watermark for this source/phrase, set by the service
@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable
 import redis
+from collector.seen import SeenFilter
 
 
 class QueueClient(ABC):
     """Abstract queue interface."""
 
     @abstractmethod
-    def publish(self, topic: str, message: str) -> None:
+    def publish(self, topic: str, message: str | bytes) -> None:
         pass
 
+    def publish_many(self, topic: str, messages: list[str | bytes]) -> None:
+        """Publish several messages; backends override this to batch round trips."""
+        for message in messages:
+            self.publish(topic, message)
+
+    def depth(self, topic: str) -> int | None:
+        """Messages waiting to be consumed, or None if the backend can't tell."""
+        return None
+
     @abstractmethod
     def health_check(self) -> bool:
         pass
@@ -17,18 +30,327 @@ class QueueClient(ABC):
 class RedisQueueClient(QueueClient):
     """Redis-based queue using lists (simple) or streams (if you need consumer groups)."""
 
-    def __init__(self, url: str, use_streams: bool = False):
+    def __init__(self, url: str, use_streams: bool = False, pipeline_size: int = 500):
+        """
+        Args:
+            url: Redis connection URL
+            use_streams: Publish with XADD instead of RPUSH
+            pipeline_size: Max messages sent per round trip by publish_many
+        """
         self.client = redis.from_url(url)
         self.use_streams = use_streams
+        self.pipeline_size = pipeline_size
 
-    def publish(self, topic: str, message: str) -> None:
+    def publish(self, topic: str, message: str | bytes) -> None:
         if self.use_streams:
             self.client.xadd(topic, {"data": message})
         else:
             self.client.rpush(topic, message)
 
+    def publish_many(self, topic: str, messages: list[str | bytes]) -> None:
+        for start in range(0, len(messages), self.pipeline_size):
+            chunk = messages[start:start + self.pipeline_size]
+            if self.use_streams:
+                pipe = self.client.pipeline(transaction=False)
+                for message in chunk:
+                    pipe.xadd(topic, {"data": message})
+                pipe.execute()
+            else:
+                # A multi-value RPUSH is already a single round trip
+                self.client.rpush(topic, *chunk)
+
+    def depth(self, topic: str) -> int | None:
+        if not self.use_streams:
+            return self.client.llen(topic)
+        # Streams keep consumed entries, so XLEN says nothing about the
+        # backlog. Consumer groups report what the slowest group has yet
+        # to read (lag, Redis 7+) or acknowledge; without them it's unknown.
+        try:
+            groups = self.client.xinfo_groups(topic)
+        except redis.ResponseError:
+            return 0  # No such stream yet
+        backlog = [
+            g["lag"] + (g.get("pending") or 0)
+            for g in groups
+            if g.get("lag") is not None
+        ]
+        return max(backlog) if backlog else None
+
     def health_check(self) -> bool:
         try:
             return self.client.ping()
         except Exception:
             return False
+
+
+class QueueBackpressureTimeout(Exception):
+    """The queue stayed above its high watermark for too long."""
+
+
+class Backpressure:
+    """
+    Pauses publishers while the queue is too deep for the consumers.
+
+    Once the depth reaches ``high_watermark``, wait() blocks until it has
+    drained to ``low_watermark``, so Redis memory stays bounded when
+    collection outpaces analysis. Depth is polled at most every
+    ``check_interval`` seconds and shared by all publishing threads;
+    messages published in between are added to the last reading.
+    """
+
+    def __init__(
+        self,
+        queue: QueueClient,
+        topic: str,
+        high_watermark: int,
+        low_watermark: int | None = None,
+        check_interval: float = 1.0,
+        max_wait: float | None = None
+    ):
+        """
+        Args:
+            queue: Queue whose depth is watched
+            topic: Queue topic name
+            high_watermark: Depth at which publishing pauses
+            low_watermark: Depth at which it resumes (default: half the high mark)
+            check_interval: Min seconds between depth checks
+            max_wait: Max seconds one wait() may block before raising
+                QueueBackpressureTimeout (None = wait as long as it takes)
+        """
+        self.queue = queue
+        self.topic = topic
+        self.high_watermark = high_watermark
+        self.low_watermark = (
+            high_watermark // 2 if low_watermark is None else min(low_watermark, high_watermark)
+        )
+        self.check_interval = check_interval
+        self.max_wait = max_wait
+        self._depth: int | None = None
+        self._checked = 0.0
+        self._paused = False
+        self._lock = threading.Lock()
+
+    def _current_depth(self) -> int | None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked >= self.check_interval:
+                self._depth = self.queue.depth(self.topic)
+                self._checked = now
+            if self._depth is not None:
+                if self._depth >= self.high_watermark:
+                    self._paused = True
+                elif self._depth <= self.low_watermark:
+                    self._paused = False
+            return self._depth
+
+    def published(self, count: int) -> None:
+        """Account for messages published since the last depth check."""
+        with self._lock:
+            if self._depth is not None:
+                self._depth += count
+
+    def wait(self, on_event: Callable[[dict], None] | None = None) -> float:
+        """
+        Block while publishing is paused.
+
+        ``on_event`` receives {"type": "backpressure", "state": "paused" or
+        "resumed", "depth": n, ...} when this call starts and stops
+        waiting. Returns the seconds spent waiting.
+        """
+        depth = self._current_depth()
+        if not self._paused:
+            return 0.0
+
+        started = time.monotonic()
+        if on_event is not None:
+            on_event({
+                "type": "backpressure", "state": "paused", "depth": depth,
+                "high_watermark": self.high_watermark,
+                "low_watermark": self.low_watermark,
+            })
+        while self._paused:
+            waited = time.monotonic() - started
+            if self.max_wait is not None and waited >= self.max_wait:
+                raise QueueBackpressureTimeout(
+                    f"Queue {self.topic!r} stayed above {self.low_watermark} messages "
+                    f"for {waited:.1f}s (depth {depth})"
+                )
+            time.sleep(self.check_interval)
+            depth = self._current_depth()
+
+        waited = time.monotonic() - started
+        if on_event is not None:
+            on_event({
+                "type": "backpressure", "state": "resumed", "depth": depth,
+                "waited_seconds": round(waited, 3),
+            })
+        return waited
+
+
+class PublishBuffer:
+    """
+    Buffers messages for one topic and publishes them in batches.
+
+    A batch is flushed once it holds ``flush_size`` messages or when a
+    message is added more than ``flush_interval`` seconds after the oldest
+    buffered one. After start(), a background thread also flushes batches
+    that are due while no messages arrive (e.g. while the source waits on
+    a slow page or a rate limit). Callers must call close() (or flush())
+    when done.
+
+    With a ``seen_filter``, messages whose key was already published (in
+    this or an earlier run) are dropped at flush time instead of being
+    re-queued. With ``backpressure``, flushes wait while the queue is
+    over its high watermark; ``pauses`` and ``paused_seconds`` count the
+    waits and ``on_backpressure`` receives their events. ``on_flush``
+    receives the result of every flush, whichever thread ran it.
+    """
+
+    def __init__(
+        self,
+        queue: QueueClient,
+        topic: str,
+        flush_size: int = 100,
+        flush_interval: float = 1.0,
+        seen_filter: SeenFilter | None = None,
+        backpressure: Backpressure | None = None,
+        on_backpressure: Callable[[dict], None] | None = None,
+        on_flush: Callable[[list[bool]], None] | None = None
+    ):
+        self.queue = queue
+        self.topic = topic
+        self.flush_size = max(flush_size, 1)
+        self.flush_interval = flush_interval
+        self.seen_filter = seen_filter
+        self.backpressure = backpressure
+        self.on_backpressure = on_backpressure
+        self.on_flush = on_flush
+        self.pauses = 0
+        self.paused_seconds = 0.0
+        self._messages: list[str | bytes] = []
+        self._keys: list[str | None] = []
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._timer: threading.Thread | None = None
+        self._timer_error: Exception | None = None
+
+    def start(self) -> None:
+        """Flush due batches in a background thread until close()."""
+        if self._timer is None:
+            self._timer = threading.Thread(
+                target=self._flush_periodically, name="publish-flush", daemon=True
+            )
+            self._timer.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, leaving buffered messages as they are."""
+        self._stopped.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+
+    def close(self) -> list[bool]:
+        """Stop the background thread and flush what is left."""
+        self.stop()
+        self._raise_timer_error()
+        return self.flush()
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(min(self.flush_interval, 1.0)):
+            with self._lock:
+                due = (
+                    self._timer_error is None
+                    and self._oldest is not None
+                    and time.monotonic() - self._oldest >= self.flush_interval
+                )
+            if not due:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                # Messages stay buffered; the caller's next add() raises
+                self._timer_error = e
+
+    def _raise_timer_error(self) -> None:
+        if self._timer_error is not None:
+            error, self._timer_error = self._timer_error, None
+            raise error
+
+    def add(self, message: str | bytes, key: str | None = None) -> list[bool]:
+        """
+        Buffer a message, flushing if the batch is due.
+
+        Returns the flush() result, or an empty list if nothing was flushed.
+        """
+        with self._lock:
+            self._raise_timer_error()
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._messages.append(message)
+            self._keys.append(key)
+            due = (
+                len(self._messages) >= self.flush_size
+                or time.monotonic() - self._oldest >= self.flush_interval
+            )
+        return self.flush() if due else []
+
+    def flush(self) -> list[bool]:
+        """
+        Publish all buffered messages.
+
+        Returns one flag per buffered message, in order: True if it was
+        published, False if the seen filter dropped it. Messages added
+        while a flush waits on backpressure go to the next batch; if
+        publishing fails, the batch is put back in front of them.
+        """
+        # Flushes run one at a time so batches (and on_flush calls) keep
+        # their order; the buffer itself is only locked to swap batches
+        with self._flush_lock:
+            with self._lock:
+                if not self._messages:
+                    return []
+                messages, keys, oldest = self._messages, self._keys, self._oldest
+                self._messages, self._keys, self._oldest = [], [], None
+
+            try:
+                published = self._publish(messages, keys)
+            except Exception:
+                with self._lock:
+                    self._messages = messages + self._messages
+                    self._keys = keys + self._keys
+                    self._oldest = oldest
+                raise
+
+            if self.on_flush is not None:
+                self.on_flush(published)
+            return published
+
+    def _publish(self, messages: list[str | bytes], keys: list[str | None]) -> list[bool]:
+        published = [True] * len(messages)
+        if self.seen_filter is not None:
+            keyed = [i for i, key in enumerate(keys) if key is not None]
+            is_new = self.seen_filter.filter_new([keys[i] for i in keyed])
+            for i, new in zip(keyed, is_new):
+                published[i] = new
+
+        batch = [m for m, keep in zip(messages, published) if keep]
+        if batch and self.backpressure is not None:
+            waited = self.backpressure.wait(self.on_backpressure)
+            if waited:
+                self.pauses += 1
+                self.paused_seconds += waited
+        if len(batch) == 1:
+            self.queue.publish(self.topic, batch[0])
+        elif batch:
+            self.queue.publish_many(self.topic, batch)
+        if batch and self.backpressure is not None:
+            self.backpressure.published(len(batch))
+
+        # Mark only after publishing so a failed publish is retried next run
+        if self.seen_filter is not None:
+            self.seen_filter.mark(
+                [k for k, keep in zip(keys, published) if keep and k is not None]
+            )
+        return published
@@ -0,0 +1,96 @@
+import calendar
+from datetime import datetime, timezone
+import redis
+
+
+class QuotaPlanner:
+    """
+    Spreads a monthly item cap (e.g. Twitter's tweets/month) over the month.
+
+    Usage is counted in Redis so that all replicas and runs share one
+    budget. What is left at the start of a day is split evenly over the
+    remaining days, and each day's share is split evenly over the phrases
+    collected this month. A broad phrase can therefore use at most its own
+    share of the day, and the month's budget lasts until the month ends.
+
+    Months are calendar months in UTC.
+    """
+
+    def __init__(self, url: str, monthly_cap: int, prefix: str = "quota"):
+        """
+        Args:
+            url: Redis connection URL
+            monthly_cap: Items the API allows per month
+            prefix: Key prefix, e.g. "quota:twitter"
+        """
+        self.client = redis.from_url(url, decode_responses=True)
+        self.monthly_cap = monthly_cap
+        self.prefix = prefix
+
+    def _keys(self, now: datetime) -> tuple[str, str, str]:
+        month = f"{self.prefix}:{now:%Y-%m}"
+        return month, f"{month}:phrases", f"{self.prefix}:{now:%Y-%m-%d}"
+
+    def allowance(self, phrases: list[str]) -> dict[str, int]:
+        """Items each phrase may still fetch today, keyed by lowercased phrase."""
+        now = datetime.now(timezone.utc)
+        month_key, phrases_key, day_key = self._keys(now)
+        phrases = [p.lower() for p in phrases]
+
+        pipe = self.client.pipeline()
+        pipe.sadd(phrases_key, *phrases)
+        pipe.expire(phrases_key, 40 * 24 * 3600)
+        pipe.get(month_key)
+        pipe.scard(phrases_key)
+        pipe.hmget(day_key, ["_total", *phrases])
+        _, _, month_used, tracked, day_used = pipe.execute()
+
+        month_used = int(month_used or 0)
+        today_total = int(day_used[0] or 0)
+        days_left = calendar.monthrange(now.year, now.month)[1] - now.day + 1
+
+        # Budget for today is fixed at what was left when the day started
+        daily = (self.monthly_cap - (month_used - today_total)) / days_left
+        per_phrase = daily / max(tracked, 1)
+        month_left = max(self.monthly_cap - month_used, 0)
+
+        return {
+            phrase: max(min(int(per_phrase - int(used or 0)), month_left), 0)
+            for phrase, used in zip(phrases, day_used[1:])
+        }
+
+    def record(self, total: int, by_phrase: dict[str, int]) -> None:
+        """
+        Count items fetched.
+
+        Args:
+            total: Items the API returned (what the cap counts)
+            by_phrase: Items attributed to each phrase; an item matching
+                several phrases counts for each of them
+        """
+        if not total:
+            return
+        now = datetime.now(timezone.utc)
+        month_key, _, day_key = self._keys(now)
+
+        pipe = self.client.pipeline()
+        pipe.incrby(month_key, total)
+        pipe.expire(month_key, 40 * 24 * 3600)
+        pipe.hincrby(day_key, "_total", total)
+        for phrase, count in by_phrase.items():
+            if count:
+                pipe.hincrby(day_key, phrase.lower(), count)
+        pipe.expire(day_key, 2 * 24 * 3600)
+        pipe.execute()
+
+    def usage(self) -> dict:
+        """Items fetched this month and today."""
+        now = datetime.now(timezone.utc)
+        month_key, _, day_key = self._keys(now)
+        month_used = self.client.get(month_key)
+        day_used = self.client.hget(day_key, "_total")
+        return {
+            "monthly_cap": self.monthly_cap,
+            "month": int(month_used or 0),
+            "today": int(day_used or 0),
+        }
@@ -0,0 +1,253 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+import redis
+
+
+# Token bucket with a shared "blocked until" deadline. Uses the Redis
+# clock so replicas with skewed clocks still agree. Returns the number of
+# seconds to wait; 0 means a token was taken.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local blocked = tonumber(state[3]) or 0
+if blocked > now then
+    return tostring(blocked - now)
+end
+if rate <= 0 then
+    return '0'
+end
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+# Push the shared deadline forward (never backwards)
+_BLOCK_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local until_ts = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if until_ts > current then
+    redis.call('HSET', KEYS[1], 'blocked_until', tostring(until_ts))
+end
+redis.call('EXPIRE', KEYS[1], 3600)
+return 1
+"""
+
+
+class RateLimiter:
+    """
+    Per-host token buckets, shared across collector replicas through Redis.
+
+    Each configured host gets ``rate`` requests/second with bursts of up to
+    ``burst``. A host can also be blocked for a while (after a 429 or when
+    the API reports its quota as exhausted), which pauses every replica.
+    Falls back to process-local buckets if Redis is unreachable.
+    """
+
+    def __init__(
+        self,
+        url: str | None,
+        rates: dict[str, float],
+        burst: float = 5.0,
+        prefix: str = "ratelimit"
+    ):
+        self.client = redis.from_url(url) if url else None
+        self.rates = rates
+        self.burst = burst
+        self.prefix = prefix
+        self._acquire = self.client.register_script(_ACQUIRE_SCRIPT) if self.client else None
+        self._block = self.client.register_script(_BLOCK_SCRIPT) if self.client else None
+        self._lock = threading.Lock()
+        self._local: dict[str, dict] = {}
+
+    def acquire(self, host: str) -> None:
+        """Block until a request to ``host`` is allowed."""
+        rate = self.rates.get(host, 0.0)
+        while True:
+            wait = self._try_acquire(host, rate)
+            if wait <= 0:
+                return
+            time.sleep(min(wait, 60.0))
+
+    def block(self, host: str, seconds: float) -> None:
+        """Pause all requests to ``host`` for ``seconds``."""
+        if seconds <= 0:
+            return
+        if self._block is not None:
+            try:
+                self._block(keys=[f"{self.prefix}:{host}"], args=[seconds])
+                return
+            except redis.RedisError:
+                pass
+        with self._lock:
+            bucket = self._local.setdefault(host, {"tokens": self.burst, "ts": time.monotonic()})
+            bucket["blocked_until"] = max(
+                bucket.get("blocked_until", 0.0), time.monotonic() + seconds
+            )
+
+    def _try_acquire(self, host: str, rate: float) -> float:
+        if self._acquire is not None:
+            try:
+                return float(self._acquire(
+                    keys=[f"{self.prefix}:{host}"], args=[rate, self.burst]
+                ))
+            except redis.RedisError:
+                pass
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._local.setdefault(host, {"tokens": self.burst, "ts": now})
+            if bucket.get("blocked_until", 0.0) > now:
+                return bucket["blocked_until"] - now
+            if rate <= 0:
+                return 0.0
+            bucket["tokens"] = min(self.burst, bucket["tokens"] + (now - bucket["ts"]) * rate)
+            bucket["ts"] = now
+            if bucket["tokens"] < 1:
+                return (1 - bucket["tokens"]) / rate
+            bucket["tokens"] -= 1
+            return 0.0
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """
+    Seconds until the API accepts requests again, from rate-limit headers.
+
+    Understands Retry-After (seconds or HTTP date), Twitter's
+    x-rate-limit-reset (epoch seconds) and Reddit's X-Ratelimit-Reset
+    (seconds from now). Returns None if no header says.
+    """
+    headers = response.headers
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    value = headers.get("x-rate-limit-reset")
+    if value:
+        try:
+            return max(float(value) - time.time(), 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("x-ratelimit-reset")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+    return None
+
+
+def remaining_requests(response: httpx.Response) -> float | None:
+    """Requests left in the current window (x-rate-limit-remaining / X-Ratelimit-Remaining)."""
+    value = (
+        response.headers.get("x-rate-limit-remaining")
+        or response.headers.get("x-ratelimit-remaining")
+    )
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    httpx transport that applies a RateLimiter and retries rate-limited requests.
+
+    Every request waits for a token for its host. On 429 (or 503 with
+    Retry-After) the host is blocked for as long as the API asks, or with
+    exponential backoff if it doesn't say, and the same request is retried.
+    Because the retry happens below the adapter, pagination simply
+    continues from the page that was rate limited.
+
+    Rate-limit headers on successful responses are used to pace requests
+    so the remaining quota lasts until the window resets.
+
+    Pass ``extensions={"rate_limit": False}`` on a request (e.g. health
+    checks) to skip waiting and retries.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        transport: httpx.BaseTransport | None = None,
+        max_retries: int = 5,
+        backoff: float = 2.0,
+        max_wait: float = 900.0
+    ):
+        self.limiter = limiter
+        self.transport = transport or httpx.HTTPTransport()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        limited = request.extensions.get("rate_limit", True)
+
+        attempt = 0
+        while True:
+            if limited:
+                self.limiter.acquire(host)
+            response = self.transport.handle_request(request)
+
+            rate_limited = response.status_code == 429 or (
+                response.status_code == 503 and "retry-after" in response.headers
+            )
+            wait = retry_after(response)
+
+            if not rate_limited:
+                self._pace(host, response, wait)
+                return response
+
+            if wait is None:
+                wait = self.backoff * (2 ** attempt)
+            wait = min(wait, self.max_wait)
+            self.limiter.block(host, wait)
+
+            if not limited or attempt >= self.max_retries:
+                return response
+
+            print(f"Rate limited by {host}, retrying in {wait:.1f}s "
+                  f"(attempt {attempt + 1}/{self.max_retries})")
+            response.close()
+            attempt += 1
+
+    def _pace(self, host: str, response: httpx.Response, reset: float | None) -> None:
+        remaining = remaining_requests(response)
+        if remaining is None or reset is None:
+            return
+        if remaining < 1:
+            # Quota for this window is gone: pause until it resets
+            self.limiter.block(host, min(reset, self.max_wait))
+        else:
+            # Spread what is left evenly over the rest of the window
+            spacing = reset / remaining
+            if spacing > 1.0 / max(self.limiter.rates.get(host, 0.0), 1e-9):
+                self.limiter.block(host, min(spacing, self.max_wait))
+
+    def close(self) -> None:
+        self.transport.close()
@@ -0,0 +1,183 @@
+"""
+Record/replay httpx transports for running collector sources offline.
+
+RecordingTransport passes requests through to the network and saves every
+exchange to a cassette (a JSON file). ReplayTransport answers requests
+from cassettes without touching the network, e.g. for benchmarks:
+
+    transport = RecordingTransport("cassettes/reddit.json")
+    ...
+    RedditSource(..., transport=ReplayTransport(["cassettes/reddit.json"]))
+
+Requests are matched on method, URL and query parameters. Parameters that
+depend on the current time (from/to, start_time, Reddit's "t", ...) are
+ignored by default, so a recording keeps replaying as it ages.
+"""
+import base64
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+import httpx
+
+CASSETTE_VERSION = 1
+
+# Query parameters derived from "now" or the request window
+TIME_PARAMS = frozenset({"from", "to", "start_time", "end_time", "since_id", "t"})
+
+# Describe the wire encoding, which no longer applies to the stored body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def request_key(request: httpx.Request, ignore_params: frozenset[str] = TIME_PARAMS) -> str:
+    """Match key for a request: method, URL without volatile parameters."""
+    url = request.url
+    params = sorted(
+        (k, v) for k, v in url.params.multi_items() if k not in ignore_params
+    )
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{request.method} {url.scheme}://{url.host}{url.path}{query}"
+
+
+def load_cassette(path: str | Path) -> list[dict]:
+    data = json.loads(Path(path).read_text())
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version in {path}: {data.get('version')}")
+    return data["interactions"]
+
+
+def save_cassette(path: str | Path, interactions: list[dict]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(
+        {"version": CASSETTE_VERSION, "interactions": interactions}, indent=1
+    ))
+
+
+def interaction(
+    method: str,
+    url: str,
+    status: int = 200,
+    headers: dict | None = None,
+    body: str | bytes = ""
+) -> dict:
+    """Build a cassette entry (used by the recorder and fixture builders)."""
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            body = base64.b64encode(body).decode("ascii")
+            encoding = "base64"
+    else:
+        encoding = "utf-8"
+    return {
+        "request": {"method": method, "url": url},
+        "response": {
+            "status": status,
+            "headers": {
+                k: v for k, v in (headers or {}).items()
+                if k.lower() not in _DROPPED_HEADERS
+            },
+            "body": body,
+            "encoding": encoding,
+        },
+    }
+
+
+def _to_response(entry: dict, request: httpx.Request) -> httpx.Response:
+    response = entry["response"]
+    body = (
+        base64.b64decode(response["body"])
+        if response["encoding"] == "base64"
+        else response["body"].encode("utf-8")
+    )
+    return httpx.Response(
+        response["status"],
+        headers=response["headers"],
+        content=body,
+        request=request,
+    )
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Passes requests through and appends each exchange to a cassette."""
+
+    def __init__(self, path: str | Path, transport: httpx.BaseTransport | None = None):
+        """
+        Args:
+            path: Cassette file; existing interactions are kept
+            transport: Transport that performs the requests
+        """
+        self.path = Path(path)
+        self.transport = transport or httpx.HTTPTransport()
+        self.interactions = load_cassette(self.path) if self.path.exists() else []
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+
+        entry = interaction(
+            request.method, str(request.url), response.status_code,
+            dict(response.headers), body,
+        )
+        with self._lock:
+            self.interactions.append(entry)
+            # Save as we go so an interrupted run still leaves a usable cassette
+            save_cassette(self.path, self.interactions)
+        return _to_response(entry, request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Serves recorded responses; never touches the network.
+
+    Repeated requests with the same key get the recorded responses in
+    order, starting over once they run out, so a cassette can be replayed
+    any number of times. An unrecorded request raises LookupError.
+    """
+
+    def __init__(
+        self,
+        paths: list[str | Path],
+        latency: float = 0.0,
+        ignore_params: frozenset[str] = TIME_PARAMS
+    ):
+        """
+        Args:
+            paths: Cassette files to serve
+            latency: Seconds to sleep per request, to simulate the network
+            ignore_params: Query parameters left out of request matching
+        """
+        self.latency = latency
+        self.ignore_params = ignore_params
+        self._entries: dict[str, list[dict]] = {}
+        for path in paths:
+            for entry in load_cassette(path):
+                key = request_key(
+                    httpx.Request(entry["request"]["method"], entry["request"]["url"]),
+                    ignore_params,
+                )
+                self._entries.setdefault(key, []).append(entry)
+        self._next: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request, self.ignore_params)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise LookupError(f"No recorded response for {key}")
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(entries)
+        if self.latency:
+            time.sleep(self.latency)
+        return _to_response(entries[index], request)
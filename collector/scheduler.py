@@ -0,0 +1,261 @@
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+import redis
+
+from collector.jobs import JobRunner
+from collector.models import SearchRequest
+from collector.service import CollectorService
+
+
+@dataclass
+class TrackedPhrase:
+    """A phrase collected on a recurring schedule."""
+    phrase: str
+    interval: int                     # Seconds between runs
+    sources: list[str] | None = None  # None means all enabled sources
+    lookback: int = 7 * 24 * 3600     # Window of the first run, in seconds
+    next_run: float = 0.0             # Epoch seconds
+    last_run: float | None = None
+    last_job_id: str | None = None
+
+
+class PhraseRegistry:
+    """Tracked phrases in a Redis hash, shared by all collector replicas."""
+
+    def __init__(self, url: str, key: str = "scheduler:phrases"):
+        self.client = redis.from_url(url)
+        self.key = key
+
+    def list(self) -> list[TrackedPhrase]:
+        return [
+            TrackedPhrase(**json.loads(data))
+            for data in self.client.hvals(self.key)
+        ]
+
+    def get(self, phrase: str) -> TrackedPhrase | None:
+        data = self.client.hget(self.key, phrase.lower())
+        return TrackedPhrase(**json.loads(data)) if data else None
+
+    def save(self, tracked: TrackedPhrase) -> None:
+        self.client.hset(self.key, tracked.phrase.lower(), json.dumps(asdict(tracked)))
+
+    def update(self, phrase: str, **fields) -> TrackedPhrase | None:
+        """
+        Change fields of a tracked phrase, if it is still tracked.
+
+        Unlike save(), this never brings back a phrase that was removed
+        in the meantime. Returns the updated phrase, or None if it's gone.
+        """
+        name = phrase.lower()
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.key)
+                    data = pipe.hget(self.key, name)
+                    if data is None:
+                        pipe.unwatch()
+                        return None
+                    tracked = TrackedPhrase(**{**json.loads(data), **fields})
+                    pipe.multi()
+                    pipe.hset(self.key, name, json.dumps(asdict(tracked)))
+                    pipe.execute()
+                    return tracked
+                except redis.WatchError:
+                    continue  # Another replica changed the registry; retry
+
+    def remove(self, phrase: str) -> bool:
+        return bool(self.client.hdel(self.key, phrase.lower()))
+
+
+class LeaderLock:
+    """Redis lock that elects the one replica allowed to schedule."""
+
+    _RENEW_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, key: str = "scheduler:leader", ttl: float = 90.0):
+        self.client = redis.from_url(url, decode_responses=True)
+        self.key = key
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid.uuid4().hex
+        self._renew = self.client.register_script(self._RENEW_SCRIPT)
+
+    def acquire(self) -> bool:
+        """Take or renew leadership. Returns True while this replica leads."""
+        if self._renew(keys=[self.key], args=[self.token, self.ttl_ms]):
+            return True
+        return bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+
+
+class CollectionScheduler:
+    """
+    Runs tracked phrases through CollectorService on their intervals.
+
+    Every tick the leader replica picks the phrases that are due, groups
+    them by source selection and submits each group as one collect_many
+    job, so batching sources (RSS, Twitter) are hit once per group rather
+    than once per phrase. Runs are incremental and go through the shared
+    JobRunner, which bounds concurrency and makes scheduled runs visible
+    under GET /jobs/{id}. Next run times get random jitter so phrases
+    with equal intervals drift apart instead of hitting upstream together.
+    A phrase whose last run is still queued or running is skipped until
+    that run ends.
+    """
+
+    def __init__(
+        self,
+        service: CollectorService,
+        registry: PhraseRegistry,
+        lock: LeaderLock,
+        jobs: JobRunner,
+        tick: float = 30.0,
+        jitter: float = 0.1,
+        batch_size: int = 50
+    ):
+        """
+        Args:
+            service: Collector used for scheduled runs
+            registry: Tracked phrases
+            lock: Leader election lock (should outlive a few ticks)
+            jobs: Background job runner the runs are submitted to
+            tick: Seconds between scheduling passes
+            jitter: Random spread applied to intervals, as a fraction
+            batch_size: Max phrases per collection job
+        """
+        self.service = service
+        self.registry = registry
+        self.lock = lock
+        self.jobs = jobs
+        self.tick = tick
+        self.jitter = jitter
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(
+        self,
+        phrase: str,
+        interval: int,
+        sources: list[str] | None = None,
+        lookback: int = 7 * 24 * 3600
+    ) -> TrackedPhrase:
+        """Add or update a tracked phrase; new phrases start within one jittered interval."""
+        existing = self.registry.get(phrase)
+        tracked = TrackedPhrase(
+            phrase=phrase,
+            interval=interval,
+            sources=sources,
+            lookback=lookback,
+            next_run=(
+                existing.next_run
+                if existing
+                else time.time() + random.uniform(0, interval * self.jitter)
+            ),
+            last_run=existing.last_run if existing else None,
+            last_job_id=existing.last_job_id if existing else None,
+        )
+        self.registry.save(tracked)
+        return tracked
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, name="collection-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.lock.acquire():
+                    self.run_due()
+            except Exception as e:
+                print(f"Scheduler tick failed: {e}")
+            self._stop.wait(self.tick)
+
+    def run_due(self) -> list[str]:
+        """Submit jobs for every due phrase. Returns the submitted job IDs."""
+        now = time.time()
+        due = [t for t in self.registry.list() if t.next_run <= now]
+        in_flight = self._in_flight({t.last_job_id for t in due if t.last_job_id})
+        due = [t for t in due if t.last_job_id not in in_flight]
+        if not due:
+            return []
+
+        groups: dict[tuple, list[TrackedPhrase]] = {}
+        for tracked in due:
+            key = tuple(sorted(tracked.sources)) if tracked.sources else ()
+            groups.setdefault(key, []).append(tracked)
+
+        job_ids = []
+        for group in groups.values():
+            for start in range(0, len(group), self.batch_size):
+                job_id = self._submit(group[start:start + self.batch_size], now)
+                if job_id is not None:
+                    job_ids.append(job_id)
+        return job_ids
+
+    def _in_flight(self, job_ids: set[str]) -> set[str]:
+        """The given jobs that are still queued or running."""
+        in_flight = set()
+        for job_id in job_ids:
+            job = self.jobs.store.get(job_id)
+            if job is not None and job["status"] in ("queued", "running"):
+                in_flight.add(job_id)
+        return in_flight
+
+    def _submit(self, batch: list[TrackedPhrase], now: float) -> str | None:
+        """Submit one job for the batch; returns its ID, or None if every phrase is gone."""
+        job_id = f"scheduled-{now:.0f}-{uuid.uuid4().hex[:8]}"
+
+        # Reschedule before running so a slow run isn't picked up again.
+        # Phrases removed since they were listed are left out, not re-added.
+        rescheduled = []
+        for tracked in batch:
+            spread = tracked.interval * self.jitter
+            updated = self.registry.update(
+                tracked.phrase,
+                next_run=now + tracked.interval + random.uniform(-spread, spread),
+                last_run=now,
+                last_job_id=job_id,
+            )
+            if updated is not None:
+                rescheduled.append(updated)
+        batch = rescheduled
+        if not batch:
+            return None
+
+        end = datetime.now(timezone.utc)
+        requests = [
+            SearchRequest(
+                phrase=tracked.phrase,
+                start_date=end - timedelta(seconds=tracked.lookback),
+                end_date=end,
+                job_id=job_id,
+                sources=tracked.sources,
+                incremental=True,
+            )
+            for tracked in batch
+        ]
+        self.jobs.submit(
+            lambda on_event: self.service.collect_many(requests, on_event),
+            job_id=job_id,
+            params={"scheduled": True, "phrases": [t.phrase for t in batch]},
+        )
+        return job_id
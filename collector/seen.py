@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+import redis
+
+
+def seen_key(item_id: str, search_phrase: str) -> str:
+    """
+    Seen-filter key of a queued item.
+
+    An entry matching several phrases is queued once per phrase (see
+    RSSSource.search_many), so the phrase is part of the key.
+    """
+    return f"{item_id}:{search_phrase}"
+
+
+class SeenFilter(ABC):
+    """Remembers which items (see seen_key) were already published to the queue."""
+
+    @abstractmethod
+    def filter_new(self, ids: list[str]) -> list[bool]:
+        """
+        Return, for each ID, whether it has not been seen before.
+
+        Repeats within ``ids`` count as seen after their first occurrence.
+        Does not record anything; call mark() once the items are published.
+        """
+        pass
+
+    @abstractmethod
+    def mark(self, ids: list[str]) -> None:
+        """Record IDs as seen."""
+        pass
+
+
+class RedisSeenFilter(SeenFilter):
+    """
+    Seen-set in Redis, shared by all collector replicas.
+
+    IDs are kept in one set per UTC day, each expiring after ``ttl_days``,
+    so memory stays bounded without tracking per-member expiry. An ID
+    counts as seen if any bucket within the TTL window holds it.
+    """
+
+    def __init__(self, url: str, ttl_days: int = 7, prefix: str = "seen"):
+        self.client = redis.from_url(url)
+        self.ttl_days = ttl_days
+        self.prefix = prefix
+
+    def _buckets(self) -> list[str]:
+        today = datetime.now(timezone.utc).date()
+        return [
+            f"{self.prefix}:{(today - timedelta(days=d)).strftime('%Y%m%d')}"
+            for d in range(self.ttl_days + 1)
+        ]
+
+    def filter_new(self, ids: list[str]) -> list[bool]:
+        if not ids:
+            return []
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for bucket in self._buckets():
+                pipe.smismember(bucket, ids)
+            membership = pipe.execute()
+        except redis.RedisError as e:
+            # Fail open: re-publishing is wasteful, dropping items is not
+            print(f"Seen filter unavailable, publishing all items: {e}")
+            membership = []
+
+        seen = {i for bucket in membership for i, hit in zip(ids, bucket) if hit}
+        result = []
+        for item_id in ids:
+            result.append(item_id not in seen)
+            seen.add(item_id)
+        return result
+
+    def mark(self, ids: list[str]) -> None:
+        if not ids:
+            return
+
+        bucket = self._buckets()[0]
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.sadd(bucket, *ids)
+            pipe.expire(bucket, (self.ttl_days + 1) * 24 * 3600)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Seen filter unavailable, items not recorded: {e}")
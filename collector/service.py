@@ -1,6 +1,14 @@
-from collector.models import SearchRequest
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable
+from collector.models import CollectedItem, SearchRequest
+from shared.normalize import ContentNormalizer
 from collector.sources.base import SourceAdapter
-from collector.queue import QueueClient
+from collector.queue import Backpressure, PublishBuffer, QueueBackpressureTimeout, QueueClient
+from collector.seen import SeenFilter, seen_key
+from collector.watermarks import WatermarkStore
+from shared.wire import MessageEncoder
 
 
 class CollectorService:
@@ -10,43 +18,322 @@ class CollectorService:
         self,
         sources: list[SourceAdapter],
         queue: QueueClient,
-        topic: str = "raw_content"
+        topic: str = "raw_content",
+        max_workers: int | None = None,
+        flush_size: int = 100,
+        flush_interval: float = 1.0,
+        seen_filter: SeenFilter | None = None,
+        watermarks: WatermarkStore | None = None,
+        encoder: MessageEncoder | None = None,
+        normalizer: ContentNormalizer | None = None,
+        backpressure: Backpressure | None = None
     ):
+        """
+        Args:
+            sources: Source adapters to collect from
+            queue: Queue that collected items are published to
+            topic: Queue topic name
+            max_workers: Sources searched concurrently (default: all of them)
+            flush_size: Items buffered per source before publishing a batch
+            flush_interval: Max seconds an item waits in a source's buffer
+            seen_filter: Drops items already published by an earlier run
+            watermarks: Per (source, phrase) high-water marks; required for
+                incremental requests
+            encoder: Queue message format (default: JSON)
+            normalizer: Cleans and trims item content before publishing
+            backpressure: Pauses publishing while the queue is too deep
+        """
         self.sources = {s.source_type: s for s in sources}
         self.queue = queue
         self.topic = topic
+        self.max_workers = max_workers
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.seen_filter = seen_filter
+        self.watermarks = watermarks
+        self.encoder = encoder or MessageEncoder()
+        self.normalizer = normalizer
+        self.backpressure = backpressure
 
-    def collect(self, request: SearchRequest) -> dict:
+    def collect(
+        self,
+        request: SearchRequest,
+        on_event: Callable[[dict], None] | None = None
+    ) -> dict:
         """
         Run collection for a search request.
 
+        All active sources are searched concurrently, each in its own
+        worker thread, and items are published as soon as a source yields
+        them. Total latency is bounded by the slowest source rather than
+        the sum of all of them.
+
+        ``on_event`` receives progress events while sources run (from
+        worker threads):
+            {"type": "progress", "source": name, "count": published, "seen": n}
+            {"type": "source_progress", "source": name, ...adapter fields}
+            {"type": "backpressure", "source": name, "state": "paused" or
+             "resumed", "depth": queue depth, ...}
+            {"type": "source_completed", "source": name, "count": published,
+             "error": message or None}
+
+        ``source_progress`` events come from adapters as they finish a
+        page, feed or subreddit (see SourceAdapter.report_progress).
+
         Returns summary stats.
         """
-        stats = {"total": 0, "by_source": {}, "errors": []}
+        stats = self._collect([request], on_event)
+        del stats["by_phrase"]
+        return stats
 
-        active_sources = (
-            [self.sources[s] for s in request.sources if s in self.sources]
-            if request.sources
-            else list(self.sources.values())
-        )
+    def collect_many(
+        self,
+        requests: list[SearchRequest],
+        on_event: Callable[[dict], None] | None = None
+    ) -> dict:
+        """
+        Run collection for several search requests in one pass.
 
-        for source in active_sources:
-            source_count = 0
-            try:
-                for item in source.search(request):
-                    self.queue.publish(self.topic, item.to_json())
-                    source_count += 1
-            except Exception as e:
-                stats["errors"].append({
-                    "source": source.name,
-                    "error": str(e)
-                })
+        Each source receives every request that selects it through
+        SourceAdapter.search_many, so sources that support batching do
+        their upstream work once for all phrases.
+
+        Returns summary stats, with per-phrase totals under "by_phrase".
+        """
+        return self._collect(requests, on_event)
+
+    def _collect(
+        self,
+        requests: list[SearchRequest],
+        on_event: Callable[[dict], None] | None = None
+    ) -> dict:
+        stats = {
+            "total": 0, "by_source": {}, "by_phrase": {}, "errors": [], "details": {}
+        }
+        if self.seen_filter is not None:
+            stats["seen"] = {}
+        if self.normalizer is not None:
+            stats["normalization"] = {"bytes_saved": 0, "tokens_saved": 0}
+        if self.backpressure is not None:
+            stats["backpressure"] = {"pauses": 0, "paused_seconds": 0.0}
+
+        # Source -> the requests that selected it, in registration order
+        active: dict[str, list[SearchRequest]] = {}
+        for request in requests:
+            selected = (
+                [s for s in request.sources if s in self.sources]
+                if request.sources
+                else list(self.sources)
+            )
+            for source_type in selected:
+                active.setdefault(source_type, []).append(request)
+        active_sources = [
+            (self.sources[s], active[s]) for s in self.sources if s in active
+        ]
+        if not active_sources:
+            return stats
+
+        workers = min(self.max_workers or len(active_sources), len(active_sources))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="collect"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._collect_source, source, source_requests, on_event
+                )
+                for source, source_requests in active_sources
+            ]
 
-            stats["by_source"][source.name] = source_count
-            stats["total"] += source_count
+            # Report in source order so stats stay stable between runs
+            for (source, source_requests), future in zip(active_sources, futures):
+                result = future.result()
+                if result["error"] is not None:
+                    stats["errors"].append({
+                        "source": source.name,
+                        "error": result["error"]
+                    })
+
+                source_count = sum(result["by_phrase"].values())
+                stats["by_source"][source.name] = source_count
+                stats["total"] += source_count
+                if "seen" in stats:
+                    stats["seen"][source.name] = {
+                        "new": source_count, "seen": result["seen"]
+                    }
+                for phrase, count in result["by_phrase"].items():
+                    stats["by_phrase"][phrase] = stats["by_phrase"].get(phrase, 0) + count
+                if "normalization" in stats:
+                    for key, saved in result["normalization"].items():
+                        stats["normalization"][key] += saved
+                if "backpressure" in stats:
+                    stats["backpressure"]["pauses"] += result["backpressure"]["pauses"]
+                    stats["backpressure"]["paused_seconds"] = round(
+                        stats["backpressure"]["paused_seconds"]
+                        + result["backpressure"]["paused_seconds"], 3
+                    )
+
+                details = source.pop_request_stats(source_requests)
+                if details:
+                    stats["details"][source.name] = details
 
         return stats
 
+    def _collect_source(
+        self,
+        source: SourceAdapter,
+        requests: list[SearchRequest],
+        on_event: Callable[[dict], None] | None = None
+    ) -> dict:
+        """
+        Search one source and publish its items.
+
+        Returns {"by_phrase": published counts, "seen": items dropped by
+        the seen filter, "error": error message or None, "normalization":
+        bytes and estimated tokens removed from content, "backpressure":
+        pauses and seconds spent waiting for the queue to drain}.
+        """
+        result = {
+            "by_phrase": {}, "seen": 0, "error": None,
+            "normalization": {"bytes_saved": 0, "tokens_saved": 0},
+        }
+        by_phrase = result["by_phrase"]
+
+        def emit(event: dict):
+            if on_event is not None:
+                on_event({"source": source.name, **event})
+
+        # Phrases of buffered items; only counted once actually flushed
+        pending: list[str] = []
+
+        def commit(published: list[bool]):
+            # Runs once per flush, in order, possibly in the buffer's flush
+            # thread; pending may already hold the phrases of later messages
+            for phrase, was_published in zip(pending, published):
+                if was_published:
+                    by_phrase[phrase] = by_phrase.get(phrase, 0) + 1
+                else:
+                    result["seen"] += 1
+            del pending[:len(published)]
+            if published:
+                emit({
+                    "type": "progress",
+                    "count": sum(by_phrase.values()),
+                    "seen": result["seen"],
+                })
+
+        buffer = PublishBuffer(
+            self.queue,
+            self.topic,
+            self.flush_size,
+            self.flush_interval,
+            seen_filter=self.seen_filter,
+            backpressure=self.backpressure,
+            on_backpressure=emit,
+            on_flush=commit,
+        )
+        # Keeps flush_interval while the source blocks between items
+        buffer.start()
+
+        # Adapters key listeners by job; requests may be narrowed below
+        job_request = requests[0]
+        if on_event is not None:
+            source.set_progress_listener(
+                job_request, lambda event: emit({"type": "source_progress", **event})
+            )
+        source.set_flush_callback(job_request, buffer.flush)
+
+        try:
+            requests, cursors = self._apply_watermarks(source, requests)
+            items = (
+                source.search(requests[0])
+                if len(requests) == 1
+                else source.search_many(requests)
+            ) if requests else []
+            for item in items:
+                pending.append(item.search_phrase)
+                if item.search_phrase in cursors:
+                    source.update_cursor(cursors[item.search_phrase], item)
+                if self.normalizer is not None:
+                    self._normalize(item, result["normalization"])
+                buffer.add(
+                    self.encoder.encode(item.to_dict()),
+                    key=seen_key(item.id, item.search_phrase),
+                )
+            buffer.close()
+
+            # Only advance after a complete run: sources return newest
+            # first, so a partial run must not hide the older items it missed
+            for phrase, cursor in cursors.items():
+                if cursor:
+                    self.watermarks.set(source.source_type, phrase, cursor)
+        except Exception as e:
+            # Still publish what the source yielded before it failed (unless
+            # the queue itself is what we gave up waiting for)
+            buffer.stop()
+            if not isinstance(e, QueueBackpressureTimeout):
+                try:
+                    buffer.flush()
+                except Exception:
+                    pass
+            result["error"] = str(e)
+        finally:
+            buffer.stop()
+            source.set_progress_listener(job_request, None)
+            source.set_flush_callback(job_request, None)
+            result["backpressure"] = {
+                "pauses": buffer.pauses, "paused_seconds": buffer.paused_seconds,
+            }
+
+        emit({
+            "type": "source_completed",
+            "count": sum(by_phrase.values()),
+            "error": result["error"],
+        })
+        return result
+
+    def _normalize(self, item: CollectedItem, saved: dict) -> None:
+        """Clean the item's title and content in place, counting what was removed."""
+        before = item.content
+        item.title = self.normalizer.normalize(item.title, trim=False)
+        item.content = self.normalizer.normalize(before)
+        saved["bytes_saved"] += len(before.encode()) - len(item.content.encode())
+        saved["tokens_saved"] += (
+            self.normalizer.estimate_tokens(before)
+            - self.normalizer.estimate_tokens(item.content)
+        )
+
+    def _apply_watermarks(
+        self, source: SourceAdapter, requests: list[SearchRequest]
+    ) -> tuple[list[SearchRequest], dict[str, dict]]:
+        """
+        Narrow incremental requests to content newer than their watermark.
+
+        Returns the requests to run (those with nothing left to fetch are
+        dropped) and the cursors to advance, keyed by phrase.
+        """
+        if self.watermarks is None:
+            return requests, {}
+
+        narrowed = []
+        cursors = {}
+        for request in requests:
+            cursor = self.watermarks.get(source.source_type, request.phrase)
+            cursors[request.phrase] = dict(cursor)
+
+            if request.incremental and cursor:
+                start_date = request.start_date
+                if cursor.get("published_at"):
+                    start_date = max(
+                        start_date, datetime.fromisoformat(cursor["published_at"])
+                    )
+                if start_date >= request.end_date:
+                    continue
+                request = replace(request, start_date=start_date, cursor=cursor)
+
+            narrowed.append(request)
+
+        return narrowed, cursors
+
     def health(self) -> dict:
         """Check health of all components."""
         return {
@@ -1,10 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from datetime import datetime
+from typing import Callable, Iterator
 from collector.models import CollectedItem, SearchRequest
 
 
 class SourceAdapter(ABC):
-    """Base class for all content sources."""
+    """
+    Base class for all content sources.
+
+    Subclasses that define ``__init__`` must call ``super().__init__()``,
+    which sets up the per-job registries CollectorService uses while a
+    run is active (request stats, progress listeners, flush callbacks).
+    """
+
+    def __init__(self):
+        # Keyed by (job_id, phrase) and job_id; see request_stats and the
+        # set_* methods below
+        self._request_stats: dict[tuple[str, str], dict] = {}
+        self._progress_listeners: dict[str, Callable[[dict], None]] = {}
+        self._flush_callbacks: dict[str, Callable[[], object]] = {}
 
     @property
     @abstractmethod
@@ -28,7 +42,106 @@ class SourceAdapter(ABC):
         """
         pass
 
+    def search_many(self, requests: list[SearchRequest]) -> Iterator[CollectedItem]:
+        """
+        Yield items for several search requests in one pass.
+
+        Each yielded item carries the phrase of the request it matched.
+        The default runs the requests one after another; sources that can
+        share upstream work between phrases (e.g. fetching a feed once)
+        override this.
+        """
+        for request in requests:
+            yield from self.search(request)
+
+    def update_cursor(self, cursor: dict, item: CollectedItem) -> None:
+        """
+        Fold a collected item into the source's high-water mark.
+
+        The default tracks the latest ``published_at``, which the service
+        uses as the start date of the next incremental run. Sources with
+        an upstream cursor (e.g. Twitter since_id) extend this.
+        """
+        latest = cursor.get("published_at")
+        if latest is None or item.published_at > datetime.fromisoformat(latest):
+            cursor["published_at"] = item.published_at.isoformat()
+
     @abstractmethod
     def health_check(self) -> bool:
         """Verify the source is reachable and credentials are valid."""
         pass
+
+    def request_stats(self, request: SearchRequest) -> dict:
+        """
+        Mutable adapter-specific stats for a search request.
+
+        Adapters record per-run details here (timings, cache counters, ...)
+        while searching; CollectorService reports them under
+        ``stats["details"]`` once the source finishes. Stats are kept per
+        job and phrase, since batch runs share one job id.
+        """
+        return self._request_stats.setdefault((request.job_id, request.phrase), {})
+
+    def pop_request_stats(self, requests: list[SearchRequest]) -> dict:
+        """
+        Return and clear the stats recorded for a run's requests.
+
+        If stats were recorded for a single phrase (including sources
+        that record one set for a whole batch), they are returned as is;
+        otherwise they are returned by phrase under "by_phrase".
+        """
+        recorded = {}
+        for request in requests:
+            stats = self._request_stats.pop((request.job_id, request.phrase), None)
+            if stats:
+                recorded[request.phrase] = stats
+        if len(recorded) == 1:
+            return next(iter(recorded.values()))
+        return {"by_phrase": recorded} if recorded else {}
+
+    def set_progress_listener(
+        self, request: SearchRequest, listener: Callable[[dict], None] | None
+    ) -> None:
+        """Register (or with None, remove) the progress callback for a request's job."""
+        if listener is None:
+            self._progress_listeners.pop(request.job_id, None)
+        else:
+            self._progress_listeners[request.job_id] = listener
+
+    def set_flush_callback(
+        self, request: SearchRequest, callback: Callable[[], object] | None
+    ) -> None:
+        """Register (or with None, remove) the publish flush for a request's job."""
+        if callback is None:
+            self._flush_callbacks.pop(request.job_id, None)
+        else:
+            self._flush_callbacks[request.job_id] = callback
+
+    def flush_published(self, request: SearchRequest) -> None:
+        """
+        Publish every item yielded so far for the request's job.
+
+        Yielded items may still sit in the service's publish buffer.
+        Adapters call this before recording anything that assumes their
+        items reached the queue (e.g. HTTP cache validators); it raises
+        if publishing fails.
+        """
+        callback = self._flush_callbacks.get(request.job_id)
+        if callback is not None:
+            callback()
+
+    def report_progress(self, request: SearchRequest, **event) -> None:
+        """
+        Report fine-grained progress while searching.
+
+        Adapters call this as they finish a page, feed or subreddit, e.g.
+        ``report_progress(request, page=3, items=100)``. The service
+        forwards it as a ``source_progress`` event with the request's
+        phrase added (batch adapters pass ``phrases`` instead). Listeners
+        may be called from the adapter's worker threads.
+        """
+        listener = self._progress_listeners.get(request.job_id)
+        if listener is not None:
+            if "phrases" not in event:
+                event = {"phrase": request.phrase, **event}
+            listener(event)
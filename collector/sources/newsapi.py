@@ -1,6 +1,8 @@
 import httpx
-from datetime import datetime
+import math
+from datetime import datetime, timezone
 from typing import Iterator
+from collector.concurrency import stream_concurrently
 from collector.models import CollectedItem, SearchRequest, SourceType
 from collector.sources.base import SourceAdapter
 
@@ -10,12 +12,36 @@ class NewsAPISource(SourceAdapter):
 
     BASE_URL = "https://newsapi.org/v2"
 
-    def __init__(self, api_key: str, page_size: int = 100):
+    def __init__(
+        self,
+        api_key: str,
+        page_size: int = 100,
+        transport: httpx.BaseTransport | None = None,
+        max_workers: int = 4,
+        max_slices: int = 20,
+        max_pages: int | None = None
+    ):
+        """
+        Args:
+            api_key: NewsAPI key
+            page_size: Articles per request (max 100)
+            transport: Optional httpx transport (e.g. rate limiting)
+            max_workers: Date sub-windows fetched concurrently (1 = page sequentially)
+            max_slices: Max sub-windows a date range is split into
+            max_pages: Pages fetched per window (the Developer plan only
+                serves the first 100 results); None means no cap
+        """
+        super().__init__()
         self.api_key = api_key
         self.page_size = page_size
+        self.max_workers = max_workers
+        self.max_slices = max_slices
+        self.max_pages = max_pages
         self.client = httpx.Client(
             timeout=30.0,
-            headers={"X-Api-Key": self.api_key}
+            headers={"X-Api-Key": self.api_key},
+            limits=httpx.Limits(max_connections=max(max_workers, 10)),
+            transport=transport
         )
 
     @property
@@ -27,40 +53,133 @@ class NewsAPISource(SourceAdapter):
         return "NewsAPI"
 
     def search(self, request: SearchRequest) -> Iterator[CollectedItem]:
-        page = 1
-        total_results = None
-
-        while True:
-            params = {
-                "q": request.phrase,
-                "from": request.start_date.strftime("%Y-%m-%d"),
-                "to": request.end_date.strftime("%Y-%m-%d"),
-                "pageSize": self.page_size,
-                "page": page,
-                "sortBy": "publishedAt",
-                "language": "en",
-            }
-
-            response = self.client.get(f"{self.BASE_URL}/everything", params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data["status"] != "ok":
-                raise RuntimeError(f"NewsAPI error: {data.get('message', 'Unknown')}")
-
-            if total_results is None:
-                total_results = data["totalResults"]
-
-            for article in data["articles"]:
-                yield self._to_collected_item(article, request.phrase)
-
-            # Check if we've fetched all available results
-            fetched = page * self.page_size
-            if fetched >= total_results or not data["articles"]:
+        """
+        Search /everything for a phrase.
+
+        The first page tells how many results there are. If more pages are
+        needed and ``max_workers`` > 1, the rest of the date range (older
+        than the first page) is split into sub-windows that are paged
+        through concurrently. Pages are yielded as they arrive, and articles
+        are de-duplicated by URL. Otherwise pages are fetched one by one.
+        """
+        stats = self.request_stats(request)
+        stats.update({"pages": 1, "slices": 1})
+        seen: set[str] = set()
+
+        first = self._get_page(request.phrase, request.start_date, request.end_date, 1)
+        total = first["totalResults"]
+        self.report_progress(
+            request, page=1, items=len(first["articles"]), total_results=total
+        )
+        yield from self._new_items(first["articles"], request.phrase, seen)
+
+        if total <= self.page_size or not first["articles"]:
+            return
+
+        if self.max_workers <= 1:
+            for page, data in enumerate(
+                self._pages(request.phrase, request.start_date, request.end_date, 2, total),
+                start=2
+            ):
+                stats["pages"] += 1
+                self.report_progress(request, page=page, items=len(data["articles"]))
+                yield from self._new_items(data["articles"], request.phrase, seen)
+            return
+
+        # The first page holds the newest articles, down to its oldest one;
+        # only the range before that still needs fetching
+        covered_from = min(_parse_time(a["publishedAt"]) for a in first["articles"])
+        if covered_from <= request.start_date:
+            return
+        windows = self._slice(
+            request.start_date, covered_from, total - len(first["articles"])
+        )
+        stats["slices"] = len(windows) + 1
+
+        def fetch_window(window: tuple[datetime, datetime]) -> Iterator[dict]:
+            return self._pages(request.phrase, window[0], window[1], 1)
+
+        errors = []
+        for window, data, error in stream_concurrently(
+            fetch_window, windows, self.max_workers
+        ):
+            label = f"{_format_time(window[0])}..{_format_time(window[1])}"
+            if error is not None:
+                errors.append(f"{label}: {error}")
+                self.report_progress(request, window=label, error=str(error))
+                continue
+            stats["pages"] += 1
+            self.report_progress(request, window=label, items=len(data["articles"]))
+            yield from self._new_items(data["articles"], request.phrase, seen)
+
+        # Surface failures after yielding what the other windows found
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+    def _slice(
+        self, start_date: datetime, end_date: datetime, total: int
+    ) -> list[tuple[datetime, datetime]]:
+        """Equal sub-windows of a little under one page of results each."""
+        # Headroom for uneven publishing rates, so most windows need one page
+        count = min(math.ceil(total * 1.25 / self.page_size), self.max_slices)
+        step = (end_date - start_date) / count
+        return [
+            (start_date + step * i, end_date if i == count - 1 else start_date + step * (i + 1))
+            for i in range(count)
+        ]
+
+    def _pages(
+        self,
+        phrase: str,
+        start_date: datetime,
+        end_date: datetime,
+        page: int,
+        total: int | None = None
+    ) -> Iterator[dict]:
+        """Yield pages for a window from ``page`` on, up to the page cap."""
+        while self.max_pages is None or page <= self.max_pages:
+            if total is not None and (page - 1) * self.page_size >= total:
+                break
+            data = self._get_page(phrase, start_date, end_date, page)
+            if total is None:
+                total = data["totalResults"]
+            yield data
+            if not data["articles"]:
                 break
-
             page += 1
 
+    def _get_page(
+        self, phrase: str, start_date: datetime, end_date: datetime, page: int
+    ) -> dict:
+        params = {
+            "q": phrase,
+            # Full timestamps so incremental runs don't re-fetch the whole day
+            "from": _format_time(start_date),
+            "to": _format_time(end_date),
+            "pageSize": self.page_size,
+            "page": page,
+            "sortBy": "publishedAt",
+            "language": "en",
+        }
+
+        response = self.client.get(f"{self.BASE_URL}/everything", params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        if data["status"] != "ok":
+            raise RuntimeError(f"NewsAPI error: {data.get('message', 'Unknown')}")
+        return data
+
+    def _new_items(
+        self, articles: list[dict], phrase: str, seen: set[str]
+    ) -> Iterator[CollectedItem]:
+        # Sub-windows share their edges with each other and with the first page
+        for article in articles:
+            if article["url"] in seen:
+                continue
+            seen.add(article["url"])
+            yield self._to_collected_item(article, phrase)
+
     def _to_collected_item(self, article: dict, phrase: str) -> CollectedItem:
         return CollectedItem(
             source_type=self.source_type,
@@ -70,9 +189,7 @@ class NewsAPISource(SourceAdapter):
             title=article.get("title", ""),
             content=article.get("content") or article.get("description") or "",
             author=article.get("author"),
-            published_at=datetime.fromisoformat(
-                article["publishedAt"].replace("Z", "+00:00")
-            ),
+            published_at=_parse_time(article["publishedAt"]),
             collected_at=datetime.now(),
             search_phrase=phrase,
             metadata={
@@ -85,8 +202,20 @@ class NewsAPISource(SourceAdapter):
         try:
             response = self.client.get(
                 f"{self.BASE_URL}/top-headlines",
-                params={"country": "us", "pageSize": 1}
+                params={"country": "us", "pageSize": 1},
+                extensions={"rate_limit": False}
             )
             return response.status_code == 200
         except Exception:
             return False
+
+
+def _format_time(value: datetime) -> str:
+    """ISO 8601 timestamp in UTC, as accepted by the from/to parameters."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
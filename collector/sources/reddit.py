@@ -1,6 +1,9 @@
 import httpx
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Iterator
+from collector.concurrency import stream_concurrently
 from collector.models import CollectedItem, SearchRequest, SourceType
 from collector.sources.base import SourceAdapter
 
@@ -11,19 +14,56 @@ class RedditSource(SourceAdapter):
     AUTH_URL = "https://www.reddit.com/api/v1/access_token"
     BASE_URL = "https://oauth.reddit.com"
 
+    # Refresh the OAuth token this long before Reddit says it expires
+    TOKEN_REFRESH_MARGIN = 300
+
+    # Narrowest Reddit time filter ("t") covering a window of a given age
+    TIME_FILTERS = [
+        (timedelta(hours=1), "hour"),
+        (timedelta(days=1), "day"),
+        (timedelta(weeks=1), "week"),
+        (timedelta(days=31), "month"),
+        (timedelta(days=365), "year"),
+    ]
+
+    # A window is measured when the request is made, so it is always a little
+    # older by the time it runs; without slack a 7-day window maps to "month"
+    TIME_FILTER_SLACK = timedelta(minutes=15)
+
     def __init__(
         self,
         client_id: str,
         client_secret: str,
         user_agent: str,
-        subreddits: list[str] | None = None
+        subreddits: list[str] | None = None,
+        transport: httpx.BaseTransport | None = None,
+        max_workers: int = 5
     ):
+        """
+        Args:
+            client_id: Reddit app client ID
+            client_secret: Reddit app client secret
+            user_agent: User-Agent sent with every request
+            subreddits: Subreddits to search (default: r/all)
+            transport: Optional httpx transport (e.g. rate limiting)
+            max_workers: Subreddits searched concurrently
+        """
+        super().__init__()
         self.client_id = client_id
         self.client_secret = client_secret
         self.user_agent = user_agent
         self.subreddits = subreddits or ["all"]
+        self.max_workers = max_workers
         self._token: str | None = None
-        self._client: httpx.Client | None = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+        # One pooled client shared by all subreddit searches and token refreshes
+        self.client = httpx.Client(
+            timeout=30.0,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(max_connections=max(max_workers, 10)),
+            transport=transport
+        )
 
     @property
     def source_type(self) -> str:
@@ -33,75 +73,128 @@ class RedditSource(SourceAdapter):
     def name(self) -> str:
         return "Reddit"
 
-    @property
-    def client(self) -> httpx.Client:
-        if self._client is None:
-            self._authenticate()
-        return self._client
+    def _auth_headers(self, force_refresh: bool = False) -> dict:
+        """Authorization header with a token that is valid for a while yet."""
+        with self._token_lock:
+            if (
+                force_refresh
+                or self._token is None
+                or time.monotonic() >= self._token_expires_at - self.TOKEN_REFRESH_MARGIN
+            ):
+                self._authenticate()
+            return {"Authorization": f"Bearer {self._token}"}
 
     def _authenticate(self):
         """Get OAuth token using client credentials flow."""
-        auth_client = httpx.Client()
-        response = auth_client.post(
+        response = self.client.post(
             self.AUTH_URL,
             auth=(self.client_id, self.client_secret),
             data={"grant_type": "client_credentials"},
-            headers={"User-Agent": self.user_agent}
         )
         response.raise_for_status()
-        self._token = response.json()["access_token"]
+        data = response.json()
+        self._token = data["access_token"]
+        # Application-only tokens are valid for an hour unless Reddit says otherwise
+        self._token_expires_at = time.monotonic() + float(data.get("expires_in", 3600))
+
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with a fresh token, re-authenticating once if it was rejected."""
+        response = self.client.get(url, headers=self._auth_headers(), **kwargs)
+        if response.status_code == 401:
+            response = self.client.get(
+                url, headers=self._auth_headers(force_refresh=True), **kwargs
+            )
+        return response
 
-        self._client = httpx.Client(
-            timeout=30.0,
-            headers={
-                "Authorization": f"Bearer {self._token}",
-                "User-Agent": self.user_agent
-            }
-        )
+    def _time_filter(self, start_date: datetime) -> str:
+        age = datetime.now(timezone.utc) - start_date.astimezone(timezone.utc)
+        for window, name in self.TIME_FILTERS:
+            if age <= window + self.TIME_FILTER_SLACK:
+                return name
+        return "all"
 
     def search(self, request: SearchRequest) -> Iterator[CollectedItem]:
-        for subreddit in self.subreddits:
-            yield from self._search_subreddit(subreddit, request)
+        stats = self.request_stats(request)
+        stats["subreddits"] = {}
+        started = time.perf_counter()
+
+        def search_subreddit(subreddit: str) -> Iterator[list[CollectedItem]]:
+            return self._search_subreddit(subreddit, request)
+
+        errors = []
+        for subreddit, items, error in stream_concurrently(
+            search_subreddit, self.subreddits, self.max_workers
+        ):
+            if error is not None:
+                errors.append(f"r/{subreddit}: {error}")
+                stats["subreddits"][subreddit] = {
+                    **stats["subreddits"].get(subreddit, {}),
+                    "status": "error",
+                    "error": str(error),
+                }
+                self.report_progress(request, subreddit=subreddit, error=str(error))
+                continue
+
+            sub_stats = stats["subreddits"].setdefault(
+                subreddit, {"status": "ok", "pages": 0, "items": 0}
+            )
+            sub_stats["pages"] += 1
+            sub_stats["items"] += len(items)
+            sub_stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            yield from items
+
+        # Surface failures after yielding what the other subreddits found
+        if errors:
+            raise RuntimeError("; ".join(errors))
 
     def _search_subreddit(
         self, subreddit: str, request: SearchRequest
-    ) -> Iterator[CollectedItem]:
+    ) -> Iterator[list[CollectedItem]]:
+        """Page through one subreddit's results, yielding each page's items."""
+        pages = 0
         after = None
+        time_filter = self._time_filter(request.start_date)
 
         while True:
             params = {
                 "q": request.phrase,
                 "restrict_sr": True if subreddit != "all" else False,
                 "sort": "new",
-                "t": "all",
+                "t": time_filter,
                 "limit": 100,
             }
             if after:
                 params["after"] = after
 
-            response = self.client.get(
+            response = self._get(
                 f"{self.BASE_URL}/r/{subreddit}/search",
                 params=params
             )
             response.raise_for_status()
             data = response.json()
+            pages += 1
 
             posts = data["data"]["children"]
+            self.report_progress(request, subreddit=subreddit, page=pages, items=len(posts))
             if not posts:
-                break
+                yield []
+                return
 
+            items = []
             for post in posts:
                 item = self._to_collected_item(post["data"], request.phrase)
 
-                # Filter by date range (Reddit API doesn't support date filtering)
+                # Filter by date range ("t" is coarse, so trim to the exact window)
                 if item.published_at < request.start_date:
+                    yield items
                     return  # Posts are sorted by new, so we can stop
                 if item.published_at <= request.end_date:
-                    yield item
+                    items.append(item)
+            yield items
 
             after = data["data"].get("after")
             if not after:
-                break
+                return
 
     def _to_collected_item(self, post: dict, phrase: str) -> CollectedItem:
         return CollectedItem(
@@ -112,8 +205,8 @@ class RedditSource(SourceAdapter):
             title=post.get("title", ""),
             content=post.get("selftext", ""),
             author=post.get("author"),
-            published_at=datetime.fromtimestamp(post["created_utc"]),
-            collected_at=datetime.now(),
+            published_at=datetime.fromtimestamp(post["created_utc"], tz=timezone.utc),
+            collected_at=datetime.now(timezone.utc),
             search_phrase=phrase,
             metadata={
                 "score": post.get("score"),
@@ -121,12 +214,15 @@ class RedditSource(SourceAdapter):
                 "subreddit": post.get("subreddit"),
                 "is_self": post.get("is_self"),
                 "link_url": post.get("url") if not post.get("is_self") else None,
-            }
+            },
+            article_url=post.get("url") if not post.get("is_self") else None,
         )
 
     def health_check(self) -> bool:
         try:
-            response = self.client.get(f"{self.BASE_URL}/api/v1/me")
+            response = self._get(
+                f"{self.BASE_URL}/api/v1/me", extensions={"rate_limit": False}
+            )
             return response.status_code == 200
         except Exception:
             return False
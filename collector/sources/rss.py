@@ -1,8 +1,12 @@
 import httpx
 import feedparser
+import time
 from datetime import datetime, timezone
 from time import mktime
 from typing import Iterator
+from collector.cache import ValidatorCache
+from collector.concurrency import map_concurrently
+from collector.matching import PhraseMatcher
 from collector.models import CollectedItem, SearchRequest, SourceType
 from collector.sources.base import SourceAdapter
 
@@ -10,14 +14,33 @@ from collector.sources.base import SourceAdapter
 class RSSSource(SourceAdapter):
     """Adapter for RSS/Atom feeds."""
 
-    def __init__(self, feeds: dict[str, str]):
+    def __init__(
+        self,
+        feeds: dict[str, str],
+        max_workers: int = 10,
+        validator_cache: ValidatorCache | None = None,
+        transport: httpx.BaseTransport | None = None
+    ):
         """
         Args:
             feeds: Mapping of feed name to URL, e.g.:
                    {"Reuters World": "https://feeds.reuters.com/..."}
+            max_workers: Feeds fetched concurrently
+            validator_cache: Optional ETag/Last-Modified store; when set,
+                   feeds are fetched with conditional GETs and unchanged
+                   feeds (304) are skipped without parsing
+            transport: Optional httpx transport (e.g. rate limiting)
         """
+        super().__init__()
         self.feeds = feeds
-        self.client = httpx.Client(timeout=30.0, follow_redirects=True)
+        self.max_workers = max_workers
+        self.validator_cache = validator_cache
+        self.client = httpx.Client(
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max(max_workers, 10)),
+            transport=transport,
+        )
 
     @property
     def source_type(self) -> str:
@@ -28,42 +51,214 @@ class RSSSource(SourceAdapter):
         return "RSS"
 
     def search(self, request: SearchRequest) -> Iterator[CollectedItem]:
-        phrase_lower = request.phrase.lower()
+        yield from self.search_many([request])
 
-        for feed_name, feed_url in self.feeds.items():
-            try:
-                yield from self._search_feed(
-                    feed_name, feed_url, phrase_lower, request
-                )
-            except Exception as e:
+    def search_many(self, requests: list[SearchRequest]) -> Iterator[CollectedItem]:
+        """
+        Fetch and parse every feed once for all requests.
+
+        Entries are matched against all phrases in a single pass and one
+        item is yielded per (entry, matching request), so feed I/O and
+        parse cost stay constant as the phrase list grows.
+        """
+        if not requests:
+            return
+
+        by_phrase: dict[str, list[SearchRequest]] = {}
+        for request in requests:
+            by_phrase.setdefault(request.phrase.lower(), []).append(request)
+        matcher = PhraseMatcher(list(by_phrase))
+        # The date range every request covers, and the one they span
+        window = (
+            max(r.start_date for r in requests), min(r.end_date for r in requests)
+        )
+        span = (
+            min(r.start_date for r in requests), max(r.end_date for r in requests)
+        )
+
+        stats = self.request_stats(requests[0])
+        phrases = [r.phrase for r in requests]
+        stats.update({"cache_hits": 0, "cache_misses": 0, "errors": 0, "feeds": {}})
+
+        def fetch(feed: tuple[str, str]) -> tuple[list[CollectedItem], dict, float]:
+            feed_name, feed_url = feed
+            started = time.perf_counter()
+            items, validators = self._search_feed(
+                feed_name, feed_url, matcher, by_phrase, window, span
+            )
+            return items, validators, time.perf_counter() - started
+
+        for (feed_name, feed_url), result, error in map_concurrently(
+            fetch, self.feeds.items(), self.max_workers
+        ):
+            if error is not None:
                 # Log but don't fail entire collection
-                print(f"Error fetching feed {feed_name}: {e}")
+                print(f"Error fetching feed {feed_name}: {error}")
+                stats["errors"] += 1
+                stats["feeds"][feed_name] = {"status": "error", "error": str(error)}
+                self.report_progress(
+                    requests[0], phrases=phrases, feed=feed_name, error=str(error)
+                )
+                continue
+
+            items, validators, elapsed = result
+            cache_hit = validators is None
+            stats["cache_hits" if cache_hit else "cache_misses"] += 1
+            stats["feeds"][feed_name] = {
+                "status": "not_modified" if cache_hit else "fetched",
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "matched": len(items),
+            }
+            self.report_progress(
+                requests[0], phrases=phrases, feed=feed_name,
+                status=stats["feeds"][feed_name]["status"], matched=len(items),
+            )
+
+            yield from items
+
+            # Only remember validators once the feed's items are published,
+            # otherwise a failed publish would be hidden behind a 304 later
+            if validators and self.validator_cache is not None:
+                self.flush_published(requests[0])
+                self.validator_cache.set(self._cache_key(feed_url), validators)
+
+    def _cache_key(self, feed_url: str) -> str:
+        # One entry per feed, whatever phrases a run asks for; the entry
+        # records which phrases and dates the cached feed version was seen for
+        return f"rss:{feed_url}"
 
     def _search_feed(
         self,
         feed_name: str,
         feed_url: str,
-        phrase_lower: str,
-        request: SearchRequest
-    ) -> Iterator[CollectedItem]:
-        response = self.client.get(feed_url)
+        matcher: PhraseMatcher,
+        by_phrase: dict[str, list[SearchRequest]],
+        window: tuple[datetime, datetime],
+        span: tuple[datetime, datetime]
+    ) -> tuple[list[CollectedItem], dict | None]:
+        """
+        Fetch a feed and return its matching items.
+
+        ``window`` is the date range all requests cover and ``span`` the
+        range they cover together. Returns (items, validators);
+        validators is None when the feed was not modified since the last
+        fetch.
+        """
+        headers = {}
+        cached = {}
+        if self.validator_cache is not None:
+            cached = self.validator_cache.get(self._cache_key(feed_url))
+            # A 304 only means the earlier runs saw everything if they matched
+            # these phrases over a window covering this one; otherwise fetch
+            # the whole feed
+            seen_phrases = set(cached.get("phrases", "").split("\n"))
+            if seen_phrases.issuperset(matcher.phrases) and self._covers(cached, span):
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.client.get(feed_url, headers=headers)
+        if response.status_code == 304:
+            return [], None
         response.raise_for_status()
 
         feed = feedparser.parse(response.text)
+        validators = self._merge(cached, {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "phrases": "\n".join(matcher.phrases),
+            **self._coverage(feed.entries, window),
+        })
+        items = []
 
         for entry in feed.entries:
-            # Check if phrase appears in title or summary
+            # Check which phrases appear in title or summary
             title = entry.get("title", "")
             summary = entry.get("summary", "")
 
-            if phrase_lower not in title.lower() and phrase_lower not in summary.lower():
-                continue
+            for phrase in matcher.find(f"{title}\n{summary}"):
+                for request in by_phrase[phrase]:
+                    item = self._to_collected_item(entry, feed_name, request.phrase)
+
+                    # Filter by date range
+                    if request.start_date <= item.published_at <= request.end_date:
+                        items.append(item)
 
-            item = self._to_collected_item(entry, feed_name, request.phrase)
+        return items, validators
 
-            # Filter by date range
-            if request.start_date <= item.published_at <= request.end_date:
-                yield item
+    @staticmethod
+    def _coverage(entries: list, window: tuple[datetime, datetime]) -> dict:
+        """
+        The date window a fetch saw the feed's entries for.
+
+        A bound is "*" when no dated entry lies beyond it, i.e. a run with
+        any window on that side would have matched the same entries.
+        """
+        start, end = window
+        dates = [
+            datetime.fromtimestamp(mktime(parsed), tz=timezone.utc)
+            for parsed in (
+                entry.get("published_parsed") or entry.get("updated_parsed")
+                for entry in entries
+            )
+            if parsed
+        ]
+        return {
+            "window_start": "*" if not dates or start <= min(dates) else start.isoformat(),
+            "window_end": "*" if not dates or end >= max(dates) else end.isoformat(),
+        }
+
+    @staticmethod
+    def _merge(cached: dict, validators: dict) -> dict:
+        """
+        Add the phrases earlier runs matched to ``validators``, if they saw
+        the same feed version.
+
+        Scheduler batches each bring their own phrase mix; merging lets
+        every batch get 304s once the feed has been matched for all of
+        them, rather than the batches overwriting each other's entry.
+        """
+        same_version = (validators["etag"] or validators["last_modified"]) and (
+            cached.get("etag") == validators["etag"]
+            and cached.get("last_modified") == validators["last_modified"]
+        )
+        if not same_version or not cached.get("window_start") or not cached.get("window_end"):
+            return validators
+
+        def later(a: str, b: str) -> str:
+            if a == "*" or b == "*":
+                return b if a == "*" else a
+            return max(a, b, key=datetime.fromisoformat)
+
+        def earlier(a: str, b: str) -> str:
+            if a == "*" or b == "*":
+                return b if a == "*" else a
+            return min(a, b, key=datetime.fromisoformat)
+
+        phrases = set(cached.get("phrases", "").split("\n")) | set(
+            validators["phrases"].split("\n")
+        )
+        return {
+            **validators,
+            "phrases": "\n".join(sorted(p for p in phrases if p)),
+            # Only the dates every merged phrase was matched over are covered
+            "window_start": later(cached["window_start"], validators["window_start"]),
+            "window_end": earlier(cached["window_end"], validators["window_end"]),
+        }
+
+    @staticmethod
+    def _covers(cached: dict, span: tuple[datetime, datetime]) -> bool:
+        """Whether the fetch that stored ``cached`` saw every entry ``span`` needs."""
+        window_start = cached.get("window_start")
+        window_end = cached.get("window_end")
+        if not window_start or not window_end:
+            return False  # Stored before windows were recorded
+        start, end = span
+        return (
+            (window_start == "*" or start >= datetime.fromisoformat(window_start))
+            and (window_end == "*" or end <= datetime.fromisoformat(window_end))
+        )
 
     def _to_collected_item(
         self, entry: dict, feed_name: str, phrase: str
@@ -99,7 +294,7 @@ class RSSSource(SourceAdapter):
             return False
         try:
             url = list(self.feeds.values())[0]
-            response = self.client.head(url)
+            response = self.client.head(url, extensions={"rate_limit": False})
             return response.status_code == 200
         except Exception:
             return False
@@ -1,7 +1,10 @@
 import httpx
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
 from typing import Iterator
+from collector.matching import PhraseMatcher
 from collector.models import CollectedItem, SearchRequest, SourceType
+from collector.quota import QuotaPlanner
 from collector.sources.base import SourceAdapter
 
 
@@ -10,17 +13,38 @@ class TwitterSource(SourceAdapter):
 
     BASE_URL = "https://api.twitter.com/2"
 
-    def __init__(self, bearer_token: str, max_results: int = 100):
+    # /tweets/search/recent only covers the last 7 days
+    RECENT_SEARCH_WINDOW = timedelta(days=7)
+
+    # Query length limit of recent search (self-serve tiers)
+    MAX_QUERY_LENGTH = 512
+    QUERY_SUFFIX = "lang:en -is:retweet"
+
+    def __init__(
+        self,
+        bearer_token: str,
+        max_results: int = 100,
+        transport: httpx.BaseTransport | None = None,
+        batch_phrases: bool = True,
+        quota: QuotaPlanner | None = None
+    ):
         """
         Args:
             bearer_token: X API Bearer token (from developer portal)
             max_results: Results per request (10-100, default 100)
+            transport: Optional httpx transport (e.g. rate limiting)
+            batch_phrases: Combine phrases into OR queries in search_many
+            quota: Monthly tweet budget shared across phrases and runs
         """
+        super().__init__()
         self.bearer_token = bearer_token
         self.max_results = min(max(max_results, 10), 100)
+        self.batch_phrases = batch_phrases
+        self.quota = quota
         self.client = httpx.Client(
             timeout=30.0,
-            headers={"Authorization": f"Bearer {self.bearer_token}"}
+            headers={"Authorization": f"Bearer {self.bearer_token}"},
+            transport=transport
         )
 
     @property
@@ -38,53 +62,241 @@ class TwitterSource(SourceAdapter):
         Note: Free tier only allows 1,500 tweets/month.
         Basic tier ($100/month) allows 10,000 tweets/month.
         """
-        next_token = None
+        yield from self.search_many([request])
 
-        while True:
-            params = {
-                "query": f"{request.phrase} lang:en -is:retweet",
-                "max_results": self.max_results,
-                "start_time": request.start_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                "end_time": request.end_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                "tweet.fields": "id,text,author_id,created_at,public_metrics,entities",
-                "user.fields": "username,name",
-                "expansions": "author_id",
-            }
+    def search_many(self, requests: list[SearchRequest]) -> Iterator[CollectedItem]:
+        """
+        Search several phrases, packing them into as few queries as possible.
+
+        Phrases are ORed together up to the query length limit and each
+        returned tweet is routed back to the phrases its text contains.
+        With a quota planner, phrases that have used up today's share are
+        skipped, a phrase gets no more tweets once its share is spent, and
+        each query stops paging once all its phrases' shares are spent.
+        """
+        stats = self.request_stats(requests[0])
+        stats.setdefault("queries", 0)
+        stats.setdefault("tweets", 0)
+        stats.setdefault("unrouted", 0)
 
-            if next_token:
-                params["next_token"] = next_token
+        allowance = None
+        if self.quota is not None:
+            allowance = self.quota.allowance([r.phrase for r in requests])
+            skipped = [r.phrase for r in requests if not allowance[r.phrase.lower()]]
+            if skipped:
+                stats["quota_skipped"] = skipped
+            requests = [r for r in requests if allowance[r.phrase.lower()]]
 
-            response = self.client.get(
-                f"{self.BASE_URL}/tweets/search/recent",
-                params=params
+        # The API rejects the whole query if it's too long
+        too_long = [r.phrase for r in requests if not self._fits(r.phrase)]
+        if too_long:
+            stats["query_too_long"] = too_long
+            requests = [r for r in requests if self._fits(r.phrase)]
+
+        batches = self._batches(requests) if self.batch_phrases else [[r] for r in requests]
+        for batch in batches:
+            yield from self._search_batch(batch, allowance, stats)
+
+        if self.quota is not None:
+            stats["quota"] = self.quota.usage()
+
+        # Surface skipped phrases after yielding what the others found
+        if too_long:
+            raise RuntimeError(
+                f"Phrases too long for a {self.MAX_QUERY_LENGTH}-character query: "
+                + ", ".join(too_long)
             )
-            response.raise_for_status()
-            data = response.json()
-
-            # Handle errors from API
-            if "errors" in data and not "data" in data:
-                error_msg = data["errors"][0].get("message", "Unknown error")
-                raise RuntimeError(f"Twitter API error: {error_msg}")
-
-            # No results
-            if "data" not in data:
-                break
-
-            # Build user lookup for author info
-            users = {}
-            if "includes" in data and "users" in data["includes"]:
-                for user in data["includes"]["users"]:
-                    users[user["id"]] = user
-
-            for tweet in data["data"]:
-                author = users.get(tweet.get("author_id"), {})
-                yield self._to_collected_item(tweet, author, request.phrase)
-
-            # Check for more pages
-            meta = data.get("meta", {})
-            next_token = meta.get("next_token")
-            if not next_token:
-                break
+
+    def _fits(self, phrase: str) -> bool:
+        """Whether a phrase fits a query of its own."""
+        term = max(len(phrase), len(self._term(phrase)))
+        return term + len(" ") + len(self.QUERY_SUFFIX) <= self.MAX_QUERY_LENGTH
+
+    def _batches(self, requests: list[SearchRequest]) -> list[list[SearchRequest]]:
+        """
+        Group requests into OR queries that fit the query length limit.
+
+        Requests whose phrases differ only in case share one query term
+        and always land in the same batch.
+        """
+        groups: dict[str, list[SearchRequest]] = {}
+        for request in requests:
+            groups.setdefault(request.phrase.lower(), []).append(request)
+
+        batches: list[list[SearchRequest]] = []
+        length = 0
+        for group in groups.values():
+            term = len(self._term(group[0].phrase))
+            if batches and length + len(" OR ") + term <= self.MAX_QUERY_LENGTH:
+                batches[-1].extend(group)
+                length += len(" OR ") + term
+            else:
+                batches.append(list(group))
+                # "(terms) suffix", as built in _search_batch
+                length = len("()") + len(" ") + len(self.QUERY_SUFFIX) + term
+        return batches
+
+    @staticmethod
+    def _term(phrase: str) -> str:
+        """Query term for a phrase; multi-word phrases are matched exactly."""
+        phrase = phrase.replace('"', "").strip()
+        return f'"{phrase}"' if " " in phrase else phrase
+
+    def _search_batch(
+        self,
+        batch: list[SearchRequest],
+        allowance: dict[str, int] | None,
+        stats: dict
+    ) -> Iterator[CollectedItem]:
+        # Requests by lowercased phrase; phrases differing only in case
+        # share a query term but keep their own cursor and items
+        by_phrase: dict[str, list[tuple[SearchRequest, str | None]]] = {}
+        for request in batch:
+            by_phrase.setdefault(request.phrase.lower(), []).append(
+                (request, self._since_id(request))
+            )
+
+        # A lone phrase keeps its plain query syntax and needs no routing
+        if len(by_phrase) == 1:
+            query = batch[0].phrase
+            matcher = None
+        else:
+            query = "(" + " OR ".join(
+                self._term(group[0][0].phrase) for group in by_phrase.values()
+            ) + ")"
+            matcher = PhraseMatcher(list(by_phrase))
+
+        # Tweets are routed to a phrase only while it has some of its own
+        # share left, so a broad phrase can't use up the others' shares
+        budget = (
+            sum(allowance[p] for p in by_phrase) if allowance is not None else None
+        )
+        since_ids = [s for group in by_phrase.values() for _, s in group]
+        # One window covering every request; items are trimmed per request below
+        since_id = min(since_ids, key=int) if all(since_ids) else None
+        start_date = min(r.start_date for r in batch)
+        end_date = max(r.end_date for r in batch)
+
+        fetched = 0
+        pages = 0
+        used: dict[str, int] = {}
+
+        def unspent() -> list[str]:
+            return [p for p in by_phrase if used.get(p, 0) < allowance[p]]
+
+        next_token = None
+        try:
+            while budget is None or (fetched < budget and unspent()):
+                max_results = self.max_results
+                if budget is not None:
+                    left = min(
+                        sum(allowance[p] - used.get(p, 0) for p in unspent()),
+                        budget - fetched,
+                    )
+                    max_results = min(max(left, 10), self.max_results)
+                params = {
+                    "query": f"{query} {self.QUERY_SUFFIX}",
+                    "max_results": max_results,
+                    "end_time": _format_time(end_date),
+                    "tweet.fields": "id,text,author_id,created_at,public_metrics,entities",
+                    "user.fields": "username,name",
+                    "expansions": "author_id",
+                }
+                # since_id is exact where a start_time can only be approximate
+                if since_id:
+                    params["since_id"] = since_id
+                else:
+                    params["start_time"] = _format_time(start_date)
+
+                if next_token:
+                    params["next_token"] = next_token
+
+                response = self.client.get(
+                    f"{self.BASE_URL}/tweets/search/recent",
+                    params=params
+                )
+                response.raise_for_status()
+                data = response.json()
+                stats["queries"] += 1
+
+                # Handle errors from API
+                if "errors" in data and not "data" in data:
+                    error_msg = data["errors"][0].get("message", "Unknown error")
+                    raise RuntimeError(f"Twitter API error: {error_msg}")
+
+                # No results
+                if "data" not in data:
+                    break
+
+                fetched += len(data["data"])
+                stats["tweets"] += len(data["data"])
+                pages += 1
+                self.report_progress(
+                    batch[0], phrases=[r.phrase for r in batch],
+                    page=pages, tweets=len(data["data"]),
+                )
+
+                # Build user lookup for author info
+                users = {}
+                if "includes" in data and "users" in data["includes"]:
+                    for user in data["includes"]["users"]:
+                        users[user["id"]] = user
+
+                for tweet in data["data"]:
+                    author = users.get(tweet.get("author_id"), {})
+                    phrases = (
+                        list(by_phrase) if matcher is None
+                        else _route(matcher, tweet.get("text", ""))
+                    )
+                    if not phrases:
+                        stats["unrouted"] += 1
+                    if allowance is not None:
+                        phrases = [p for p in phrases if used.get(p, 0) < allowance[p]]
+                    for phrase in phrases:
+                        routed = False
+                        for request, request_since_id in by_phrase[phrase]:
+                            item = self._to_collected_item(tweet, author, request.phrase)
+                            if len(batch) > 1 and not self._in_window(
+                                item, request, request_since_id
+                            ):
+                                continue
+                            routed = True
+                            yield item
+                        if routed:
+                            used[phrase] = used.get(phrase, 0) + 1
+
+                # Check for more pages
+                meta = data.get("meta", {})
+                next_token = meta.get("next_token")
+                if not next_token:
+                    break
+        finally:
+            if self.quota is not None:
+                self.quota.record(fetched, used)
+
+    @staticmethod
+    def _in_window(item: CollectedItem, request: SearchRequest, since_id: str | None) -> bool:
+        if since_id:
+            return int(item.external_id) > int(since_id)
+        return request.start_date <= item.published_at <= request.end_date
+
+    def _since_id(self, request: SearchRequest) -> str | None:
+        """Watermark tweet ID, if it is still inside the recent-search window."""
+        cursor = request.cursor or {}
+        if not request.incremental or not cursor.get("since_id"):
+            return None
+        published = cursor.get("published_at")
+        if published and datetime.fromisoformat(published) < (
+            datetime.now(timezone.utc) - self.RECENT_SEARCH_WINDOW
+        ):
+            return None
+        return cursor["since_id"]
+
+    def update_cursor(self, cursor: dict, item: CollectedItem) -> None:
+        super().update_cursor(cursor, item)
+        # Tweet IDs are time-ordered, so the largest one is the high-water mark
+        if int(item.external_id) > int(cursor.get("since_id") or 0):
+            cursor["since_id"] = item.external_id
 
     def _to_collected_item(
         self, tweet: dict, author: dict, phrase: str
@@ -139,9 +351,25 @@ class TwitterSource(SourceAdapter):
             # Use a minimal request to check auth
             response = self.client.get(
                 f"{self.BASE_URL}/tweets/search/recent",
-                params={"query": "test", "max_results": 10}
+                params={"query": "test", "max_results": 10},
+                extensions={"rate_limit": False}
             )
             # 200 = OK, 429 = rate limited (but auth works)
             return response.status_code in (200, 429)
         except Exception:
             return False
+
+
+def _route(matcher: PhraseMatcher, text: str) -> list[str]:
+    """Phrases occurring in a tweet as whole words (so "ai" skips "said")."""
+    return [
+        phrase for phrase in matcher.find(text)
+        if re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", text, re.IGNORECASE)
+    ]
+
+
+def _format_time(value: datetime) -> str:
+    """RFC 3339 UTC timestamp as expected by the v2 API."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
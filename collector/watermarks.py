@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+import json
+import redis
+
+
+class WatermarkStore(ABC):
+    """High-water marks per (source, phrase) for incremental collection."""
+
+    @abstractmethod
+    def get(self, source_type: str, phrase: str) -> dict:
+        """Return the stored cursor (empty dict if the pair was never collected)."""
+        pass
+
+    @abstractmethod
+    def set(self, source_type: str, phrase: str, cursor: dict) -> None:
+        pass
+
+
+class RedisWatermarkStore(WatermarkStore):
+    """Watermarks in one Redis hash per source, keyed by lowercased phrase."""
+
+    def __init__(self, url: str, prefix: str = "watermark"):
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, source_type: str) -> str:
+        # Adapters report SourceType members; key on the plain value
+        return f"{self.prefix}:{getattr(source_type, 'value', source_type)}"
+
+    def get(self, source_type: str, phrase: str) -> dict:
+        data = self.client.hget(self._key(source_type), phrase.lower())
+        return json.loads(data) if data else {}
+
+    def set(self, source_type: str, phrase: str, cursor: dict) -> None:
+        self.client.hset(self._key(source_type), phrase.lower(), json.dumps(cursor))
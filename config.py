@@ -5,10 +5,60 @@ class Settings(BaseSettings):
     # Queue
     redis_url: str = "redis://localhost:6379"
     queue_topic: str = "raw_content"
+    queue_flush_size: int = 100  # Items per pipelined publish (1 = no batching)
+    queue_flush_interval: float = 1.0  # Max seconds an item stays buffered
+    # "json" or "binary" (orjson + zlib above the threshold); switch to
+    # binary only once every processor decodes it (see shared/wire.py)
+    queue_message_format: str = "json"
+    queue_compress_threshold: int | None = 1024  # Bytes; None = never compress
+    # Backpressure: publishing pauses once the queue holds the high
+    # watermark of unprocessed items and resumes at the low one
+    queue_high_watermark: int | None = 50000  # None = never pause
+    queue_low_watermark: int = 25000
+    queue_backpressure_max_wait: float | None = 1800  # Seconds before a source gives up
+
+    # Collection
+    collector_max_workers: int | None = None  # Concurrent sources (None = all)
+    seen_filter_enabled: bool = True  # Skip items already queued by earlier runs
+    seen_filter_ttl_days: int = 7
+    # Strip HTML/boilerplate from item content and trim it to a token budget
+    normalize_content: bool = True
+    content_max_tokens: int | None = 1000
+
+    # Background collection jobs
+    job_concurrency: int = 4  # Collections running at once per replica
+    job_ttl: int = 7 * 24 * 3600  # How long job status is kept in Redis
+    job_events_heartbeat: float = 15.0  # Seconds between keep-alives on event streams
+    job_lease: float = 60.0  # Seconds an unfinished job outlives its replica
+
+    # Recurring collection of tracked phrases (one replica schedules at a time)
+    scheduler_enabled: bool = False
+    scheduler_tick: float = 30.0  # Seconds between checks for due phrases
+    scheduler_jitter: float = 0.1  # Random spread of run times, as a fraction of the interval
+    scheduler_batch_size: int = 50  # Max phrases collected by one scheduled job
+
+    # Rate limiting for API sources: requests/second per host, shared
+    # across replicas through Redis. 429s are retried after the delay the
+    # API asks for (Retry-After / x-rate-limit-reset / X-Ratelimit-Reset).
+    rate_limits: dict[str, float] = {
+        "newsapi.org": 1.0,
+        "www.reddit.com": 1.0,       # OAuth token endpoint
+        "oauth.reddit.com": 1.5,     # 100 requests/minute per client
+        "api.twitter.com": 0.5,      # 450 requests/15 min (app auth)
+    }
+    rate_limit_burst: float = 5.0
+    rate_limit_max_retries: int = 5
+
+    # Record source HTTP traffic to cassettes, or serve it from them
+    # offline (see collector/replay.py); unset = live APIs
+    http_cassette_dir: str | None = None
+    http_cassette_mode: str = "replay"  # "record" or "replay"
 
     # NewsAPI
     newsapi_key: str | None = None
     newsapi_enabled: bool = True
+    newsapi_max_workers: int = 4  # Date sub-windows fetched concurrently (1 = sequential)
+    newsapi_max_pages: int | None = None  # Pages per window (Developer plan: 1)
 
     # Reddit
     reddit_client_id: str | None = None
@@ -16,14 +66,20 @@ class Settings(BaseSettings):
     reddit_user_agent: str = "SentimentCollector/1.0"
     reddit_subreddits: list[str] = ["news", "worldnews", "technology"]
     reddit_enabled: bool = True
+    reddit_max_workers: int = 5  # Subreddits searched concurrently
 
     # Twitter/X
     twitter_bearer_token: str | None = None
     twitter_enabled: bool = True
     twitter_max_results: int = 100
+    twitter_batch_phrases: bool = True  # OR several phrases into one query
+    twitter_monthly_cap: int | None = None  # Tweets/month of your tier; paces usage when set
 
     # RSS
     rss_enabled: bool = True
+    rss_max_workers: int = 10  # Feeds fetched concurrently
+    rss_conditional_get: bool = True  # ETag/Last-Modified validators in Redis
+    rss_validator_ttl: int = 7 * 24 * 3600
     rss_feeds: dict[str, str] = {
         # === US News ===
         "NPR News": "https://feeds.npr.org/1001/rss.xml",
@@ -12,6 +12,7 @@ fi
 if [ -n "$COLLECTOR_URL" ]; then
     echo "Configuring COLLECTOR_URL: $COLLECTOR_URL"
     find /usr/share/nginx/html -name "*.js" -exec sed -i "s|/collect|${COLLECTOR_URL}/collect|g" {} \;
+    find /usr/share/nginx/html -name "*.js" -exec sed -i "s|/jobs/|${COLLECTOR_URL}/jobs/|g" {} \;
 fi
 
 # Replace PROCESSOR_URL placeholder
@@ -73,13 +73,33 @@ export interface CollectRequest {
 
 export interface CollectResponse {
   status: string;
-  stats: {
-    total: number;
-    by_source: Record<string, number>;
-    errors: string[];
-  };
+  job_id: string;
+}
+
+export interface CollectStats {
+  total: number;
+  by_source: Record<string, number>;
+  errors: { source: string; error: string }[];
 }
 
+export interface CollectJob {
+  id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  submitted_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  elapsed_seconds?: number;
+  progress: CollectStats;
+  stats: CollectStats | null;
+  error: string | null;
+}
+
+export type CollectEvent =
+  | { type: 'status'; status: CollectJob['status']; stats?: CollectStats | null; error?: string | null }
+  | { type: 'progress'; source: string; count: number; seen: number }
+  | { type: 'source_progress'; source: string; [field: string]: unknown }
+  | { type: 'source_completed'; source: string; count: number; error: string | null };
+
 export interface ProcessResponse {
   status: string;
   stats: {
@@ -163,6 +183,29 @@ export const api = {
   collect: (request: CollectRequest) =>
     postJson<CollectResponse>('/collect', request),
 
+  getJob: (jobId: string) =>
+    fetchJson<CollectJob>(`/jobs/${encodeURIComponent(jobId)}`),
+
+  // Follow a job's events (SSE) until it finishes; resolves with the final status event
+  watchJob: (jobId: string, onEvent: (event: CollectEvent) => void) =>
+    new Promise<Extract<CollectEvent, { type: 'status' }>>((resolve, reject) => {
+      const source = new EventSource(`/jobs/${encodeURIComponent(jobId)}/events`);
+      source.onmessage = (message) => {
+        const event = JSON.parse(message.data) as CollectEvent;
+        onEvent(event);
+        if (event.type === 'status' && (event.status === 'completed' || event.status === 'failed')) {
+          source.close();
+          resolve(event);
+        }
+      };
+      source.onerror = () => {
+        // EventSource reconnects by itself; give up only once it has closed
+        if (source.readyState === EventSource.CLOSED) {
+          reject(new Error('Lost connection to job events'));
+        }
+      };
+    }),
+
   process: () =>
     postJson<ProcessResponse>('/process', {}),
 };
@@ -12,7 +12,7 @@ export function CollectForm({ onCollected }: CollectFormProps) {
   const [daysBack, setDaysBack] = useState(7);
   const [isCollecting, setIsCollecting] = useState(false);
   const [isProcessing, setIsProcessing] = useState(false);
-  const [status, setStatus] = useState<{ type: 'success' | 'error'; message: string } | null>(null);
+  const [status, setStatus] = useState<{ type: 'success' | 'error' | 'info'; message: string } | null>(null);
 
   const today = new Date();
   const startDate = subDays(today, daysBack);
@@ -25,11 +25,36 @@ export function CollectForm({ onCollected }: CollectFormProps) {
     setStatus(null);
 
     try {
-      const result = await api.collect({
+      const { job_id } = await api.collect({
         phrase: phrase.trim(),
         start_date: startDate.toISOString(),
         end_date: today.toISOString(),
       });
+
+      // Collection runs as a background job; follow its event stream
+      const counts: Record<string, number> = {};
+      let current = '';
+      const result = await api.watchJob(job_id, (event) => {
+        if (event.type === 'status' && event.status === 'queued') {
+          setStatus({ type: 'info', message: 'Collection queued...' });
+          return;
+        }
+        if (event.type === 'progress' || event.type === 'source_completed') {
+          counts[event.source] = event.count;
+        } else if (event.type === 'source_progress') {
+          const where = event.feed ?? event.subreddit ?? (event.page ? `page ${event.page}` : '');
+          current = where ? `${event.source}: ${where}` : event.source;
+        }
+        const total = Object.values(counts).reduce((sum, n) => sum + n, 0);
+        setStatus({
+          type: 'info',
+          message: `Collecting... ${total} items so far${current ? ` (${current})` : ''}`,
+        });
+      });
+      if (result.status === 'failed' || !result.stats) {
+        throw new Error(result.error ?? 'Collection failed');
+      }
+
       setStatus({
         type: 'success',
         message: `Collected ${result.stats.total} items from the last ${daysBack} days`,
@@ -177,7 +202,9 @@ export function CollectForm({ onCollected }: CollectFormProps) {
           className={`mt-4 p-3 rounded-lg text-sm ${
             status.type === 'success'
               ? 'bg-green-50 text-green-800'
-              : 'bg-red-50 text-red-800'
+              : status.type === 'info'
+                ? 'bg-blue-50 text-blue-800'
+                : 'bg-red-50 text-red-800'
           }`}
         >
           {status.message}
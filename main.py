@@ -1,26 +1,79 @@
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
-from fastapi import FastAPI, HTTPException
+import json
+from pathlib import Path
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from config import Settings
+from collector.cache import RedisValidatorCache
+from collector.jobs import JobConflict, JobRunner, JobStore
 from collector.service import CollectorService
-from collector.queue import RedisQueueClient
+from collector.queue import Backpressure, RedisQueueClient
+from collector.quota import QuotaPlanner
+from collector.ratelimit import RateLimitedTransport, RateLimiter
+from collector.replay import RecordingTransport, ReplayTransport
+from collector.scheduler import CollectionScheduler, LeaderLock, PhraseRegistry
+from collector.seen import RedisSeenFilter
+from collector.watermarks import RedisWatermarkStore
+from shared.wire import MessageEncoder
 from collector.sources.newsapi import NewsAPISource
 from collector.sources.reddit import RedditSource
 from collector.sources.rss import RSSSource
 from collector.sources.twitter import TwitterSource
 from collector.models import SearchRequest
+from shared.normalize import ContentNormalizer
 
 
 settings = Settings()
-app = FastAPI(title="Collector Service")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.scheduler_enabled:
+        scheduler.start()
+    yield
+    scheduler.stop()
+
+
+app = FastAPI(title="Collector Service", lifespan=lifespan)
 
 
 def build_service() -> CollectorService:
     sources = []
 
+    # One limiter shared by all API adapters (and, via Redis, all replicas)
+    limiter = RateLimiter(
+        settings.redis_url,
+        rates=settings.rate_limits,
+        burst=settings.rate_limit_burst,
+    )
+
+    def cassette(name: str) -> httpx.BaseTransport | None:
+        if not settings.http_cassette_dir:
+            return None
+        path = Path(settings.http_cassette_dir) / f"{name}.json"
+        if settings.http_cassette_mode == "record":
+            return RecordingTransport(path)
+        return ReplayTransport([path])
+
+    def rate_limited(name: str) -> RateLimitedTransport:
+        return RateLimitedTransport(
+            limiter,
+            transport=cassette(name),
+            max_retries=settings.rate_limit_max_retries,
+        )
+
     if settings.newsapi_enabled and settings.newsapi_key:
-        sources.append(NewsAPISource(settings.newsapi_key))
+        sources.append(NewsAPISource(
+            settings.newsapi_key,
+            transport=rate_limited("newsapi"),
+            max_workers=settings.newsapi_max_workers,
+            max_pages=settings.newsapi_max_pages,
+        ))
 
     if settings.reddit_enabled and settings.reddit_client_id:
         sources.append(RedditSource(
@@ -28,23 +81,136 @@ def build_service() -> CollectorService:
             client_secret=settings.reddit_client_secret,
             user_agent=settings.reddit_user_agent,
             subreddits=settings.reddit_subreddits,
+            transport=rate_limited("reddit"),
+            max_workers=settings.reddit_max_workers,
         ))
 
     if settings.rss_enabled and settings.rss_feeds:
-        sources.append(RSSSource(settings.rss_feeds))
+        validator_cache = (
+            RedisValidatorCache(settings.redis_url, ttl=settings.rss_validator_ttl)
+            if settings.rss_conditional_get
+            else None
+        )
+        sources.append(RSSSource(
+            settings.rss_feeds,
+            max_workers=settings.rss_max_workers,
+            validator_cache=validator_cache,
+            transport=cassette("rss"),
+        ))
 
     if settings.twitter_enabled and settings.twitter_bearer_token:
         sources.append(TwitterSource(
             bearer_token=settings.twitter_bearer_token,
             max_results=settings.twitter_max_results,
+            transport=rate_limited("twitter"),
+            batch_phrases=settings.twitter_batch_phrases,
+            quota=(
+                QuotaPlanner(
+                    settings.redis_url,
+                    settings.twitter_monthly_cap,
+                    prefix="quota:twitter",
+                )
+                if settings.twitter_monthly_cap
+                else None
+            ),
         ))
 
     queue = RedisQueueClient(settings.redis_url)
 
-    return CollectorService(sources, queue, settings.queue_topic)
+    seen_filter = (
+        RedisSeenFilter(settings.redis_url, ttl_days=settings.seen_filter_ttl_days)
+        if settings.seen_filter_enabled
+        else None
+    )
+
+    return CollectorService(
+        sources,
+        queue,
+        settings.queue_topic,
+        max_workers=settings.collector_max_workers,
+        flush_size=settings.queue_flush_size,
+        flush_interval=settings.queue_flush_interval,
+        seen_filter=seen_filter,
+        watermarks=RedisWatermarkStore(settings.redis_url),
+        encoder=MessageEncoder(
+            settings.queue_message_format,
+            compress_threshold=settings.queue_compress_threshold,
+        ),
+        normalizer=(
+            ContentNormalizer(max_tokens=settings.content_max_tokens)
+            if settings.normalize_content
+            else None
+        ),
+        backpressure=(
+            Backpressure(
+                queue,
+                settings.queue_topic,
+                settings.queue_high_watermark,
+                settings.queue_low_watermark,
+                max_wait=settings.queue_backpressure_max_wait,
+            )
+            if settings.queue_high_watermark
+            else None
+        ),
+    )
 
 
 service = build_service()
+jobs = JobRunner(
+    JobStore(settings.redis_url, ttl=settings.job_ttl),
+    max_concurrency=settings.job_concurrency,
+    lease=settings.job_lease,
+)
+scheduler = CollectionScheduler(
+    service,
+    PhraseRegistry(settings.redis_url),
+    LeaderLock(settings.redis_url, ttl=settings.scheduler_tick * 3),
+    jobs,
+    tick=settings.scheduler_tick,
+    jitter=settings.scheduler_jitter,
+    batch_size=settings.scheduler_batch_size,
+)
+
+
+def event_stream(job_id: str, request: Request, after: str = "0") -> StreamingResponse:
+    """
+    Stream a job's events until it finishes.
+
+    Server-sent events when the client accepts text/event-stream (or asks
+    with ?format=sse), NDJSON otherwise. Heartbeats keep idle connections
+    from timing out while a slow source is running; the stream also ends
+    if the replica running the job stops (see JobStore.follow).
+    """
+    fmt = request.query_params.get("format")
+    sse = fmt == "sse" or (fmt is None and "text/event-stream" in request.headers.get("accept", ""))
+
+    def generate():
+        for event_id, event in jobs.store.follow(job_id, after, settings.job_events_heartbeat):
+            data = json.dumps(event)
+            if not sse:
+                yield data + "\n"
+            elif event["type"] == "heartbeat":
+                yield ": heartbeat\n\n"
+            elif event_id is None:
+                yield f"data: {data}\n\n"
+            else:
+                yield f"id: {event_id}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        # Stop proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def submit_job(job_id: str, run, params: dict) -> dict:
+    """Queue a collection job, refusing to reuse the ID of an unfinished one."""
+    try:
+        job = jobs.submit(run, job_id=job_id, params=params)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": job["status"], "job_id": job["id"]}
 
 
 class CollectRequest(BaseModel):
@@ -53,21 +219,134 @@ class CollectRequest(BaseModel):
     end_date: datetime | None = None
     sources: list[str] | None = None
     job_id: str | None = None
+    incremental: bool = False  # Only fetch content newer than the last run
 
 
-@app.post("/collect")
-def collect(req: CollectRequest):
-    """Trigger a collection run."""
+@app.post("/collect", status_code=202)
+def collect(req: CollectRequest, request: Request, stream: bool = False):
+    """Queue a collection run; poll GET /jobs/{job_id} for progress.
+
+    With ?stream=true the response is the job's event stream instead
+    (see GET /jobs/{job_id}/events).
+    """
     search = SearchRequest(
         phrase=req.phrase,
         start_date=req.start_date or datetime.now(timezone.utc) - timedelta(days=7),
         end_date=req.end_date or datetime.now(timezone.utc),
         job_id=req.job_id or f"manual-{datetime.now(timezone.utc).timestamp()}",
         sources=req.sources,
+        incremental=req.incremental,
+    )
+
+    job = submit_job(
+        search.job_id,
+        lambda on_event: service.collect(search, on_event),
+        params=req.model_dump(mode="json"),
     )
+    return event_stream(job["job_id"], request) if stream else job
+
+
+class BatchCollectRequest(BaseModel):
+    phrases: list[str]
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    sources: list[str] | None = None
+    job_id: str | None = None
+    incremental: bool = False  # Only fetch content newer than the last run
+
+
+@app.post("/collect/batch", status_code=202)
+def collect_batch(req: BatchCollectRequest, request: Request, stream: bool = False):
+    """Queue one collection run for many phrases.
+
+    Sources that support batching (RSS) fetch and parse each feed once and
+    match all phrases in a single pass. Supports ?stream=true like /collect.
+    """
+    phrases = list(dict.fromkeys(p for p in req.phrases if p.strip()))
+    if not phrases:
+        raise HTTPException(status_code=422, detail="At least one phrase is required")
+
+    now = datetime.now(timezone.utc)
+    job_id = req.job_id or f"batch-{now.timestamp()}"
+    searches = [
+        SearchRequest(
+            phrase=phrase,
+            start_date=req.start_date or now - timedelta(days=7),
+            end_date=req.end_date or now,
+            job_id=job_id,
+            sources=req.sources,
+            incremental=req.incremental,
+        )
+        for phrase in phrases
+    ]
+
+    job = submit_job(
+        job_id,
+        lambda on_event: service.collect_many(searches, on_event),
+        params=req.model_dump(mode="json"),
+    )
+    return event_stream(job["job_id"], request) if stream else job
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status and progress of a collection job."""
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+def get_job_events(job_id: str, request: Request):
+    """Follow a job's progress as server-sent events or NDJSON.
+
+    Replays the events so far, then streams new ones until the job
+    finishes. SSE clients resume after a reconnect via Last-Event-ID.
+    """
+    if jobs.store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return event_stream(job_id, request, after=request.headers.get("last-event-id") or "0")
+
+
+class TrackPhraseRequest(BaseModel):
+    phrase: str
+    interval_minutes: float = 60
+    sources: list[str] | None = None
+    lookback_days: float = 7  # Window of the first run; later runs are incremental
+
+
+@app.get("/phrases")
+def list_phrases():
+    """Phrases collected on a schedule."""
+    return sorted(
+        (asdict(t) for t in scheduler.registry.list()),
+        key=lambda t: t["phrase"].lower(),
+    )
+
+
+@app.put("/phrases")
+def track_phrase(req: TrackPhraseRequest):
+    """Start collecting a phrase on a schedule, or change its settings."""
+    if not req.phrase.strip():
+        raise HTTPException(status_code=422, detail="Phrase is required")
+    if req.interval_minutes <= 0:
+        raise HTTPException(status_code=422, detail="interval_minutes must be positive")
+    tracked = scheduler.track(
+        req.phrase.strip(),
+        interval=int(req.interval_minutes * 60),
+        sources=req.sources,
+        lookback=int(req.lookback_days * 24 * 3600),
+    )
+    return asdict(tracked)
+
 
-    stats = service.collect(search)
-    return {"status": "completed", "stats": stats}
+@app.delete("/phrases/{phrase}")
+def untrack_phrase(phrase: str):
+    """Stop collecting a phrase on a schedule."""
+    if not scheduler.registry.remove(phrase):
+        raise HTTPException(status_code=404, detail="Phrase not tracked")
+    return {"status": "removed", "phrase": phrase}
 
 
 @app.get("/health")
@@ -0,0 +1,182 @@
+"""
+Local stand-in for the Anthropic API, for testing the processor offline.
+
+Serves the Messages API and the Message Batches API with canned analysis
+responses, so the synchronous path and the bulk path (submit, poll,
+results) can run end to end without an API key or network access:
+
+    python -m processor.batch_standin --port 8090 --batch-delay 5
+    ANTHROPIC_BASE_URL=http://localhost:8090 ANTHROPIC_API_KEY=test \\
+        python -m processor.main bulk
+
+Batches end ``batch_delay`` seconds after they are created. A request
+whose prompt contains ``STANDIN_ERROR`` gets an errored result. State
+is in memory only.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
+
+_TITLE = re.compile(r"^Title: (.*)$", re.M)
+_ITEM = re.compile(r'<item index="(\d+)"[^>]*>\s*Title: (.*)$', re.M)
+
+
+def _analysis(title: str) -> dict:
+    return {
+        "themes": [{"name": "Stand-in theme", "confidence": 0.5, "keywords": ["standin"]}],
+        "sentiment": "neutral",
+        "sentiment_score": 0.0,
+        "summary": f"Stand-in analysis of: {title[:80]}",
+        "key_points": ["Generated by processor.batch_standin"],
+        "entities": [],
+    }
+
+
+def _respond(prompt: str) -> str:
+    """Canned answer in the format the prompt asks for (single or batched)."""
+    items = _ITEM.findall(prompt)
+    if items:
+        return json.dumps({
+            "results": [{"index": int(i), **_analysis(title)} for i, title in items]
+        })
+    match = _TITLE.search(prompt)
+    return json.dumps(_analysis(match.group(1) if match else ""))
+
+
+def _message(model: str, prompt: str, usage: dict) -> dict:
+    text = _respond(prompt)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {**usage, "output_tokens": len(text) // 4},
+    }
+
+
+def _prompt(params: dict) -> str:
+    content = params["messages"][-1]["content"]
+    if isinstance(content, list):
+        content = "".join(block.get("text", "") for block in content)
+    return content
+
+
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def create_app(batch_delay: float = 5.0) -> FastAPI:
+    app = FastAPI(title="Anthropic API stand-in")
+    batches: dict[str, dict] = {}
+    lock = threading.Lock()
+
+    def usage(params: dict) -> dict:
+        """Input token count, at about four characters per token."""
+        system = params.get("system") or ""
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+        return {"input_tokens": (len(_prompt(params)) + len(system)) // 4}
+
+    def batch_view(batch: dict, base_url: str) -> dict:
+        ended = time.time() >= batch["created"] + batch_delay
+        count = len(batch["requests"])
+        errored = sum(1 for r in batch["requests"] if "STANDIN_ERROR" in _prompt(r["params"]))
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "ended_at": _iso(batch["created"] + batch_delay) if ended else None,
+            "created_at": _iso(batch["created"]),
+            "expires_at": _iso(batch["created"] + timedelta(days=1).total_seconds()),
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"{base_url}v1/messages/batches/{batch['id']}/results" if ended else None
+            ),
+        }
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        params = await request.json()
+        return _message(params["model"], _prompt(params), usage(params))
+
+    @app.post("/v1/messages/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        batch = {
+            "id": f"msgbatch_{uuid.uuid4().hex[:24]}",
+            "created": time.time(),
+            "requests": body["requests"],
+        }
+        with lock:
+            batches[batch["id"]] = batch
+        return batch_view(batch, str(request.base_url))
+
+    @app.get("/v1/messages/batches/{batch_id}")
+    def get_batch(batch_id: str, request: Request):
+        batch = batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        return batch_view(batch, str(request.base_url))
+
+    @app.get("/v1/messages/batches/{batch_id}/results")
+    def batch_results(batch_id: str):
+        batch = batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        if time.time() < batch["created"] + batch_delay:
+            raise HTTPException(status_code=400, detail="Batch is still processing")
+
+        lines = []
+        for entry in batch["requests"]:
+            prompt = _prompt(entry["params"])
+            if "STANDIN_ERROR" in prompt:
+                result = {"type": "errored", "error": {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": "Stand-in error"},
+                }}
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": _message(
+                        entry["params"]["model"], prompt, usage(entry["params"])
+                    ),
+                }
+            lines.append(json.dumps({"custom_id": entry["custom_id"], "result": result}))
+        return Response("\n".join(lines) + "\n", media_type="application/x-jsonl")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--batch-delay", type=float, default=5.0,
+                        help="Seconds until a batch ends")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.batch_delay), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Bulk analysis through provider batch APIs.
+
+Draining a large backlog with synchronous calls is the slowest and most
+expensive option. Anthropic's Message Batches API and OpenAI's Batch API
+take many requests at once, finish them asynchronously (usually well
+within the hour) at half the price, and don't count against the
+synchronous rate limits.
+
+ProcessorService.submit_bulk() takes items off the queue and submits one
+batch; BulkBatchStore keeps the batch id and the prepared items in Redis
+until ProcessorService.poll_bulk() finds the batch finished and writes the
+results to Postgres. Real-time traffic stays on the synchronous path.
+
+For offline testing, processor/batch_standin.py serves the Anthropic
+endpoints locally (see ANTHROPIC_BASE_URL).
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterator
+import redis
+
+
+@dataclass
+class BulkRequest:
+    """One prompt of a batch; ``system`` is its static part."""
+    custom_id: str
+    prompt: str
+    system: str | None = None
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one request: response text and token usage, or an error."""
+    custom_id: str
+    text: str | None = None
+    error: str | None = None
+    usage: dict | None = None  # USAGE_KEYS counts, see LLMClient.track_usage
+
+
+class BulkBackend(ABC):
+    """Provider batch API."""
+
+    @property
+    @abstractmethod
+    def provider(self) -> str:
+        pass
+
+    @abstractmethod
+    def submit(self, requests: list[BulkRequest]) -> str:
+        """Create a batch; returns its id."""
+        pass
+
+    @abstractmethod
+    def is_finished(self, batch_id: str) -> bool:
+        """Whether the batch has ended (results are final)."""
+        pass
+
+    @abstractmethod
+    def results(self, batch_id: str) -> Iterator[BulkResult]:
+        """
+        Results of a finished batch.
+
+        Requests without a result (e.g. an expired batch) are simply not
+        yielded.
+        """
+        pass
+
+
+class AnthropicBulkBackend(BulkBackend):
+    """Anthropic Message Batches API (up to 100,000 requests per batch)."""
+
+    def __init__(self, client, model: str, max_tokens: int = 1024):
+        """
+        Args:
+            client: anthropic.Anthropic client
+            model: Model for every request in the batch
+            max_tokens: Response limit per request
+        """
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+
+    @property
+    def provider(self) -> str:
+        return "anthropic"
+
+    def submit(self, requests: list[BulkRequest]) -> str:
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": r.custom_id, "params": self._params(r)} for r in requests
+            ]
+        )
+        return batch.id
+
+    def _params(self, request: BulkRequest) -> dict:
+        params = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": request.prompt}],
+        }
+        if request.system:
+            params["system"] = request.system
+        return params
+
+    def is_finished(self, batch_id: str) -> bool:
+        return self.client.messages.batches.retrieve(batch_id).processing_status == "ended"
+
+    def results(self, batch_id: str) -> Iterator[BulkResult]:
+        for entry in self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                usage = result.message.usage
+                yield BulkResult(
+                    entry.custom_id,
+                    text=result.message.content[0].text,
+                    usage={
+                        "input_tokens": usage.input_tokens,
+                        "output_tokens": usage.output_tokens,
+                    },
+                )
+            else:
+                error = getattr(result, "error", None)
+                yield BulkResult(
+                    entry.custom_id, error=f"{result.type}: {error}" if error else result.type
+                )
+
+
+class OpenAIBulkBackend(BulkBackend):
+    """OpenAI Batch API (a JSONL file of chat completion requests)."""
+
+    FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+    def __init__(self, client, model: str, max_tokens: int = 1024):
+        """
+        Args:
+            client: openai.OpenAI client
+            model: Model for every request in the batch
+            max_tokens: Response limit per request
+        """
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+
+    @property
+    def provider(self) -> str:
+        return "openai"
+
+    def submit(self, requests: list[BulkRequest]) -> str:
+        lines = "\n".join(
+            json.dumps({
+                "custom_id": r.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "max_tokens": self.max_tokens,
+                    "messages": (
+                        [{"role": "system", "content": r.system}] if r.system else []
+                    ) + [{"role": "user", "content": r.prompt}],
+                    "response_format": {"type": "json_object"},
+                },
+            })
+            for r in requests
+        )
+        upload = self.client.files.create(
+            file=("analysis.jsonl", lines.encode("utf-8")), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def is_finished(self, batch_id: str) -> bool:
+        return self.client.batches.retrieve(batch_id).status in self.FINAL_STATUSES
+
+    def results(self, batch_id: str) -> Iterator[BulkResult]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200:
+                    body = response["body"]
+                    usage = body.get("usage") or {}
+                    yield BulkResult(
+                        entry["custom_id"],
+                        text=body["choices"][0]["message"]["content"],
+                        usage={
+                            "input_tokens": usage.get("prompt_tokens", 0),
+                            "output_tokens": usage.get("completion_tokens", 0),
+                        },
+                    )
+                else:
+                    error = entry.get("error") or response.get("body", {}).get("error")
+                    yield BulkResult(entry["custom_id"], error=str(error))
+
+
+class BulkBatchStore:
+    """
+    Submitted batches and their prepared items, in Redis.
+
+    Open batch ids are kept in a set; poll_bulk claims one by moving it
+    to the processing set, so several processors can poll without
+    writing a batch twice. Finished batches keep their metadata for
+    ``ttl`` seconds. Items are recorded as pending before they are
+    submitted, so a crash before the batch is saved doesn't lose them.
+    """
+
+    def __init__(self, url: str, ttl: int = 7 * 86400, prefix: str = "bulk"):
+        self.client = redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def save_pending(self, submission_id: str, provider: str, items: dict[str, dict]) -> None:
+        """
+        Record items about to be submitted, before the provider has the batch.
+
+        save() replaces the record once the batch id is known. If the
+        process dies in between, claim_stale_pending() hands the items to
+        the next poller instead of losing them.
+        """
+        pipe = self.client.pipeline()
+        pipe.hset(self._key("pending", submission_id), mapping={
+            "provider": provider,
+            "items": len(items),
+            "created_at": time.time(),
+        })
+        pipe.hset(
+            self._key("pending", submission_id, "items"),
+            mapping={cid: json.dumps(item) for cid, item in items.items()},
+        )
+        pipe.sadd(self._key("pending"), submission_id)
+        pipe.execute()
+
+    def claim_stale_pending(self, max_age: float) -> list[str]:
+        """
+        Claim pending submissions older than ``max_age`` seconds.
+
+        Each is claimed by one poller for ``max_age`` seconds; if that
+        poller dies too, it can be claimed again afterwards.
+        """
+        claimed = []
+        for submission_id in self.client.smembers(self._key("pending")):
+            created_at = self.client.hget(self._key("pending", submission_id), "created_at")
+            if created_at is not None and time.time() - float(created_at) <= max_age:
+                continue
+            if self.client.set(
+                self._key("pending", submission_id, "claim"), 1, nx=True, ex=int(max_age) or 1
+            ):
+                claimed.append(submission_id)
+        return claimed
+
+    def pending_items(self, submission_id: str) -> dict[str, dict]:
+        return {
+            cid: json.loads(item)
+            for cid, item in self.client.hgetall(
+                self._key("pending", submission_id, "items")
+            ).items()
+        }
+
+    def discard_pending(self, submission_id: str) -> None:
+        """Drop a pending submission whose items were handled another way."""
+        pipe = self.client.pipeline()
+        self._discard_pending(pipe, submission_id)
+        pipe.execute()
+
+    def _discard_pending(self, pipe, submission_id: str) -> None:
+        pipe.delete(
+            self._key("pending", submission_id),
+            self._key("pending", submission_id, "items"),
+            self._key("pending", submission_id, "claim"),
+        )
+        pipe.srem(self._key("pending"), submission_id)
+
+    def save(
+        self,
+        batch_id: str,
+        provider: str,
+        items: dict[str, dict],
+        pending_id: str | None = None
+    ) -> None:
+        """Record a submitted batch and its items by custom id, replacing its pending record."""
+        pipe = self.client.pipeline()
+        pipe.hset(self._key("batch", batch_id), mapping={
+            "batch_id": batch_id,
+            "provider": provider,
+            "status": "submitted",
+            "items": len(items),
+            "submitted_at": time.time(),
+        })
+        pipe.hset(
+            self._key("batch", batch_id, "items"),
+            mapping={cid: json.dumps(item) for cid, item in items.items()},
+        )
+        pipe.sadd(self._key("open"), batch_id)
+        if pending_id is not None:
+            self._discard_pending(pipe, pending_id)
+        pipe.execute()
+
+    def open_batches(self) -> list[str]:
+        return sorted(self.client.smembers(self._key("open")))
+
+    def claim(self, batch_id: str) -> bool:
+        """Take an open batch for processing; False if another poller has it."""
+        if not self.client.smove(self._key("open"), self._key("processing"), batch_id):
+            return False
+        self.client.hset(self._key("batch", batch_id), mapping={
+            "status": "processing", "claimed_at": time.time(),
+        })
+        return True
+
+    def release(self, batch_id: str) -> None:
+        """Return a claimed batch to the open set (e.g. after a failure)."""
+        self.client.hset(self._key("batch", batch_id), "status", "submitted")
+        self.client.smove(self._key("processing"), self._key("open"), batch_id)
+
+    def release_stale(self, max_age: float) -> list[str]:
+        """Release batches claimed more than ``max_age`` seconds ago (crashed pollers)."""
+        released = []
+        for batch_id in self.client.smembers(self._key("processing")):
+            claimed_at = self.client.hget(self._key("batch", batch_id), "claimed_at")
+            if claimed_at is None or time.time() - float(claimed_at) > max_age:
+                self.release(batch_id)
+                released.append(batch_id)
+        return released
+
+    def items(self, batch_id: str) -> dict[str, dict]:
+        return {
+            cid: json.loads(item)
+            for cid, item in self.client.hgetall(self._key("batch", batch_id, "items")).items()
+        }
+
+    def complete(self, batch_id: str, stats: dict) -> None:
+        """Mark a claimed batch written and drop its items."""
+        key = self._key("batch", batch_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={
+            "status": "completed",
+            "completed_at": time.time(),
+            "stats": json.dumps(stats),
+        })
+        pipe.expire(key, self.ttl)
+        pipe.delete(self._key("batch", batch_id, "items"))
+        pipe.srem(self._key("processing"), batch_id)
+        pipe.execute()
+
+    def get(self, batch_id: str) -> dict | None:
+        data = self.client.hgetall(self._key("batch", batch_id))
+        if not data:
+            return None
+        if "stats" in data:
+            data["stats"] = json.loads(data["stats"])
+        return data
+
+    def list(self) -> list[dict]:
+        """Open and processing batches."""
+        ids = self.client.smembers(self._key("open")) | self.client.smembers(
+            self._key("processing")
+        )
+        return [b for b in (self.get(batch_id) for batch_id in sorted(ids)) if b]
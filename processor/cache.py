@@ -0,0 +1,223 @@
+"""
+Analysis cache keyed on content.
+
+The same text comes back under new ids (syndicated news, reposts), under
+other search phrases, and whenever items are reprocessed. The cache key is
+a hash of the normalized title and content, the search phrase, the model
+and the prompt version, so any of those changing means a fresh analysis
+while identical requests cost no LLM call at all.
+
+Unlike the cluster reuse in processor/dedup.py, which matches similar
+items for a few days, this only matches identical inputs and keeps them
+until they are evicted (least recently used beyond ``max_entries``) or
+expire (``ttl``).
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+import redis
+
+
+def analysis_cache_key(
+    title: str,
+    content: str,
+    search_phrase: str,
+    model: str,
+    prompt_version: str
+) -> str:
+    """Cache key for an analysis request; whitespace and title case don't matter."""
+    parts = (
+        " ".join(title.split()).casefold(),
+        " ".join(content.split()),
+        " ".join(search_phrase.split()).casefold(),
+        model,
+        prompt_version,
+    )
+    return hashlib.blake2b(
+        json.dumps(parts).encode(), digest_size=16
+    ).hexdigest()
+
+
+class AnalysisCache(ABC):
+    """Analyses (as Analysis.to_dict()) by analysis_cache_key."""
+
+    @abstractmethod
+    def get(self, key: str) -> dict | None:
+        """The cached analysis, or None; counts a hit or a miss."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, analysis: dict) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Entries, hits, misses and hit_rate since the cache was created."""
+        pass
+
+    @staticmethod
+    def _stats(entries: int, hits: int, misses: int) -> dict:
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+class RedisAnalysisCache(AnalysisCache):
+    """
+    Analysis cache in Redis, shared by all processor replicas.
+
+    Each entry is a string key with the TTL; a sorted set scored by last
+    use tracks recency, and puts drop the least recently used entries
+    beyond ``max_entries``. Hit and miss counters are kept in Redis too.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_entries: int = 100000,
+        ttl_hours: float = 720,
+        prefix: str = "analysis_cache"
+    ):
+        """
+        Args:
+            url: Redis URL
+            max_entries: Entries kept before the least recently used go
+            ttl_hours: Max age of an entry
+            prefix: Redis key prefix
+        """
+        self.client = redis.from_url(url, decode_responses=True)
+        self.max_entries = max_entries
+        self.ttl = int(ttl_hours * 3600)
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> dict | None:
+        value = self.client.get(self._key(key))
+        pipe = self.client.pipeline(transaction=False)
+        if value is not None:
+            pipe.zadd(f"{self.prefix}:lru", {key: time.time()})
+        pipe.hincrby(f"{self.prefix}:stats", "hits" if value is not None else "misses", 1)
+        pipe.execute()
+        return json.loads(value) if value is not None else None
+
+    def put(self, key: str, analysis: dict) -> None:
+        now = time.time()
+        lru = f"{self.prefix}:lru"
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self._key(key), json.dumps(analysis), ex=self.ttl)
+        pipe.zadd(lru, {key: now})
+        # Entries not used within the TTL have expired on their own
+        pipe.zremrangebyscore(lru, "-inf", now - self.ttl)
+        pipe.zcard(lru)
+        size = pipe.execute()[-1]
+
+        if size > self.max_entries:
+            evicted = [k for k, _ in self.client.zpopmin(lru, size - self.max_entries)]
+            if evicted:
+                self.client.delete(*(self._key(k) for k in evicted))
+
+    def stats(self) -> dict:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zcount(f"{self.prefix}:lru", time.time() - self.ttl, "+inf")
+        pipe.hgetall(f"{self.prefix}:stats")
+        entries, counters = pipe.execute()
+        return self._stats(
+            entries, int(counters.get("hits", 0)), int(counters.get("misses", 0))
+        )
+
+
+class DiskAnalysisCache(AnalysisCache):
+    """
+    Analysis cache in a local SQLite file, for a single processor.
+
+    Survives restarts without Redis memory cost; puts drop the least
+    recently used entries beyond ``max_entries``. Hit and miss counts
+    are per process.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl_hours: float = 720):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_entries: Entries kept before the least recently used go
+            ttl_hours: Max age of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_used ON analysis_cache (used_at)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON analysis_cache (created_at)"
+        )
+        self._entries = self._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT analysis FROM analysis_cache WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE analysis_cache SET used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, analysis: dict) -> None:
+        now = time.time()
+        value = json.dumps(analysis)
+        with self._lock:
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO analysis_cache VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            ).rowcount
+            if not inserted:
+                self._db.execute(
+                    "UPDATE analysis_cache SET analysis = ?, created_at = ?, used_at = ? "
+                    "WHERE key = ?",
+                    (value, now, now, key),
+                )
+            self._entries += inserted
+            if self._entries > self.max_entries:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # Both deletes walk an index, so eviction stays cheap at any size
+        self._entries -= self._db.execute(
+            "DELETE FROM analysis_cache WHERE created_at <= ?", (now - self.ttl,)
+        ).rowcount
+        if self._entries > self.max_entries:
+            self._entries -= self._db.execute("""
+                DELETE FROM analysis_cache WHERE key IN (
+                    SELECT key FROM analysis_cache ORDER BY used_at LIMIT ?
+                )
+            """, (self._entries - self.max_entries,)).rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._stats(self._entries, self.hits, self.misses)
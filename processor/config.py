@@ -12,6 +12,9 @@ class ProcessorSettings(BaseSettings):
     anthropic_api_key: str | None = None
     openai_api_key: str | None = None
     llm_model: str | None = None  # Uses provider default if not set
+    # API endpoint overrides (e.g. processor/batch_standin.py for offline tests)
+    anthropic_base_url: str | None = None
+    openai_base_url: str | None = None
 
     # Vertex AI (for llm_provider="vertex")
     gcp_project_id: str | None = None
@@ -31,6 +34,39 @@ class ProcessorSettings(BaseSettings):
     # Processing
     batch_size: int = 10
     skip_existing: bool = True
+    # Items analysed concurrently per processor (1 = one at a time)
+    analysis_concurrency: int = 1
+    # Short items (tweets, headlines) are analysed several per prompt
+    analysis_batch_size: int = 1  # Items per prompt (1 = one at a time)
+    analysis_batch_item_tokens: int = 300  # Longer items are analysed alone
+    analysis_batch_tokens: int = 4000  # Content budget per batched prompt
+    # Clean and trim content before analysis (for items queued by
+    # collectors that don't normalize; see shared/normalize.py)
+    normalize_before_analysis: bool = False
+    content_max_tokens: int | None = 1000
+    # Duplicate clustering across sources (similar text, and the same
+    # canonical URL): "off", "tag" (record clusters only) or "reuse"
+    # (analyse one item per cluster and store its analysis for the others)
+    dedup_policy: str = "tag"
+    dedup_match_text: bool = True  # False = canonical URL only
+    dedup_canonical_urls: bool = True  # False = similar text only
+    # MinHash-LSH bands x rows; matches above ~(1/bands)^(1/rows) similarity
+    dedup_bands: int = 16
+    dedup_rows: int = 4
+    dedup_window_hours: float = 72
+    dedup_min_tokens: int = 20
+    # Cache of analyses by content hash (title, content, phrase, model and
+    # prompt version): "off", "redis" (shared) or "disk" (local SQLite file)
+    analysis_cache: str = "off"
+    analysis_cache_path: str = "analysis_cache.sqlite3"
+    analysis_cache_max_entries: int = 100000  # Least recently used go first
+    analysis_cache_ttl_hours: float = 720
+    # Bulk mode ("python -m processor.main bulk"): backlogs of at least
+    # bulk_min_backlog items are submitted to the provider batch API
+    # (Anthropic/OpenAI, half price, results within 24h)
+    bulk_min_backlog: int = 5000
+    bulk_max_items: int = 10000  # Items per submitted batch
+    bulk_poll_interval: float = 60  # Seconds between batch status checks
 
     class Config:
         env_file = ".env"
@@ -59,6 +59,12 @@ class PostgresDatabase:
                     CREATE INDEX IF NOT EXISTS idx_processed_items_source_type
                         ON processed_items(source_type);
 
+                    -- Near-duplicate cluster (syndicated copies of one story)
+                    ALTER TABLE processed_items
+                        ADD COLUMN IF NOT EXISTS cluster_id VARCHAR(64);
+                    CREATE INDEX IF NOT EXISTS idx_processed_items_cluster_id
+                        ON processed_items(cluster_id);
+
                     CREATE TABLE IF NOT EXISTS themes (
                         id SERIAL PRIMARY KEY,
                         item_id VARCHAR(64) REFERENCES processed_items(id),
@@ -92,16 +98,17 @@ class PostgresDatabase:
                         id, source_type, source_name, url, title, content,
                         author, published_at, collected_at, processed_at,
                         search_phrase, raw_storage_path, sentiment,
-                        sentiment_score, summary, analysis
+                        sentiment_score, summary, analysis, cluster_id
                     ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
                     )
                     ON CONFLICT (id) DO UPDATE SET
                         processed_at = EXCLUDED.processed_at,
                         sentiment = EXCLUDED.sentiment,
                         sentiment_score = EXCLUDED.sentiment_score,
                         summary = EXCLUDED.summary,
-                        analysis = EXCLUDED.analysis
+                        analysis = EXCLUDED.analysis,
+                        cluster_id = EXCLUDED.cluster_id
                 """, (
                     item.id,
                     item.source_type,
@@ -118,7 +125,8 @@ class PostgresDatabase:
                     item.analysis.sentiment.value,
                     item.analysis.sentiment_score,
                     item.analysis.summary,
-                    Json(item.analysis.to_dict())
+                    Json(item.analysis.to_dict()),
+                    item.cluster_id
                 ))
 
                 # Delete existing themes/entities for this item (for reprocessing)
@@ -0,0 +1,197 @@
+"""
+Duplicate detection across sources.
+
+A wire story syndicated through AP, NPR, NewsAPI and a few Reddit reposts
+arrives as several items with different ids but (nearly) the same text.
+NearDuplicateIndex groups them into clusters so the processor can analyse
+one representative and reuse its analysis for the rest.
+
+Items with the same canonical URL (see shared/urls.py) are the same
+article and always share a cluster; that check is a single Redis GET.
+Otherwise items are compared by the Jaccard similarity of their word
+3-shingles, estimated with MinHash and indexed with LSH: the
+``bands * rows`` MinHash values are cut into bands, and items sharing any
+whole band are near-duplicates. Two items with similarity s match with probability
+1 - (1 - s^rows)^bands, a steep curve around (1 / bands)^(1 / rows)
+(about 0.5 for the defaults). Each band value is a small Redis sorted set
+of recent cluster ids scored by time, so a lookup touches ``bands`` tiny
+sets regardless of volume.
+"""
+import hashlib
+import json
+import random
+import re
+import time
+import redis
+
+_WORDS = re.compile(r"\w+")
+_PRIME = (1 << 61) - 1
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class NearDuplicateIndex:
+    """
+    Clusters duplicate items by canonical URL and MinHash-LSH, in Redis.
+
+    The first item of a cluster is its representative and the cluster id
+    is the representative's item id. Copies processed at the same moment
+    by different workers may each start a cluster; that only costs an
+    extra analysis.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        bands: int = 16,
+        rows: int = 4,
+        window_hours: float = 72,
+        min_tokens: int = 20,
+        match_text: bool = True,
+        match_url: bool = True,
+        prefix: str = "dedup"
+    ):
+        """
+        Args:
+            url: Redis URL
+            bands: LSH bands (more = lower similarity threshold)
+            rows: MinHash values per band (more = steeper, higher threshold)
+            window_hours: How long items stay matchable (and analyses reusable)
+            min_tokens: Texts with fewer words are not clustered; short
+                texts (tweets, bare headlines) collide too easily
+            match_text: Cluster by text similarity
+            match_url: Cluster by canonical URL
+            prefix: Redis key prefix
+        """
+        self.client = redis.from_url(url, decode_responses=True)
+        self.bands = bands
+        self.rows = rows
+        self.window = int(window_hours * 3600)
+        self.min_tokens = min_tokens
+        self.match_text = match_text
+        self.match_url = match_url
+        self.prefix = prefix
+        # Fixed seed: signatures must agree across workers and restarts
+        rng = random.Random(0x5EED)
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(bands * rows)
+        ]
+
+    def signature(self, title: str, content: str, shingle: int = 3) -> list[int] | None:
+        """MinHash signature of an item's text, or None if it's too short to cluster."""
+        tokens = _WORDS.findall(f"{title}\n{content}".lower())
+        if len(tokens) < self.min_tokens:
+            return None
+        hashes = {
+            int.from_bytes(
+                hashlib.blake2b(" ".join(tokens[i:i + shingle]).encode(), digest_size=8).digest(),
+                "big",
+            )
+            for i in range(len(tokens) - shingle + 1)
+        }
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._permutations]
+
+    def _band_keys(self, signature: list[int]) -> list[str]:
+        keys = []
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows]
+            keys.append(f"{self.prefix}:band:{band}:{_digest(','.join(map(str, values)))}")
+        return keys
+
+    def cluster(
+        self,
+        item_id: str,
+        canonical_url: str,
+        title: str,
+        content: str,
+        now: float | None = None
+    ) -> str | None:
+        """
+        Add an item to the index and return its cluster id.
+
+        An item whose canonical URL was seen within the window joins that
+        URL's cluster; otherwise it is matched by text (see ``assign``).
+        Returns None if the item has neither a URL nor enough text.
+        """
+        url_key = (
+            f"{self.prefix}:url:{_digest(canonical_url)}"
+            if canonical_url and self.match_url else None
+        )
+        cluster_id = self.client.get(url_key) if url_key else None
+
+        signature = self.signature(title, content) if self.match_text else None
+        if signature is not None:
+            # Index the text too, so copies under other URLs find the cluster
+            cluster_id = self.assign(item_id, signature, now, cluster_id=cluster_id)
+        elif cluster_id is None and url_key:
+            cluster_id = item_id
+
+        if url_key and cluster_id:
+            self.client.set(url_key, cluster_id, ex=self.window, nx=True)
+        return cluster_id
+
+    def assign(
+        self,
+        item_id: str,
+        signature: list[int],
+        now: float | None = None,
+        cluster_id: str | None = None
+    ) -> str:
+        """
+        Add an item's signature to the index and return its cluster id.
+
+        Unless ``cluster_id`` is already known, the item joins the recent
+        cluster it shares the most bands with (on a tie, the one seen
+        longest ago), or starts its own.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.window
+        keys = self._band_keys(signature)
+
+        if cluster_id is None:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.zrangebyscore(key, cutoff, "+inf", withscores=True)
+            shared: dict[str, list] = {}
+            for members in pipe.execute():
+                for candidate, score in members:
+                    entry = shared.setdefault(candidate, [0, score])
+                    entry[0] += 1
+                    entry[1] = min(entry[1], score)
+            cluster_id = (
+                min(shared, key=lambda c: (-shared[c][0], shared[c][1])) if shared else item_id
+            )
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.zadd(key, {cluster_id: now})
+            pipe.zremrangebyscore(key, "-inf", cutoff)
+            pipe.expire(key, self.window)
+        pipe.execute()
+        return cluster_id
+
+    def _analysis_key(self, cluster_id: str, search_phrase: str) -> str:
+        # The prompt includes the search phrase, so analyses are per phrase
+        return f"{self.prefix}:analysis:{cluster_id}:{search_phrase.strip().lower()}"
+
+    def get_analysis(self, cluster_id: str, search_phrase: str) -> dict | None:
+        """Analysis stored for a cluster and search phrase, if any."""
+        data = self.client.get(self._analysis_key(cluster_id, search_phrase))
+        return json.loads(data) if data else None
+
+    def put_analysis(self, cluster_id: str, search_phrase: str, analysis: dict) -> None:
+        """Store a cluster's analysis for its other members (first one wins)."""
+        self.client.set(
+            self._analysis_key(cluster_id, search_phrase),
+            json.dumps(analysis),
+            ex=self.window,
+            nx=True,
+        )
+
+    def health_check(self) -> bool:
+        try:
+            return self.client.ping()
+        except Exception:
+            return False
@@ -1,6 +1,12 @@
-from processor.llm.base import LLMClient
+from processor.llm.base import AnalysisRequest, LLMClient
 from processor.llm.anthropic import AnthropicLLMClient
 from processor.llm.openai import OpenAILLMClient
 from processor.llm.vertex import VertexAIClaudeClient
 
-__all__ = ["LLMClient", "AnthropicLLMClient", "OpenAILLMClient", "VertexAIClaudeClient"]
+__all__ = [
+    "AnalysisRequest",
+    "LLMClient",
+    "AnthropicLLMClient",
+    "OpenAILLMClient",
+    "VertexAIClaudeClient",
+]
@@ -1,6 +1,6 @@
 import json
 import anthropic
-from processor.llm.base import LLMClient
+from processor.llm.base import ANALYSIS_INSTRUCTIONS, LLMClient
 from processor.models import Analysis, Theme, Sentiment
 
 
@@ -11,25 +11,33 @@ class AnthropicLLMClient(LLMClient):
         self,
         api_key: str,
         model: str = "claude-sonnet-4-20250514",
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        base_url: str | None = None
     ):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url)
         self.model = model
         self.max_tokens = max_tokens
 
     def analyze(self, title: str, content: str, search_phrase: str) -> Analysis:
         prompt = self.build_analysis_prompt(title, content, search_phrase)
+        response_text = self.complete(prompt, self.max_tokens, ANALYSIS_INSTRUCTIONS)
+        return self._parse_response(response_text)
 
+    def complete(self, prompt: str, max_tokens: int, system: str | None = None) -> str:
+        kwargs = {}
+        if system:
+            kwargs["system"] = system
         message = self.client.messages.create(
             model=self.model,
-            max_tokens=self.max_tokens,
+            max_tokens=max_tokens,
             messages=[
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            **kwargs
         )
-
-        response_text = message.content[0].text
-        return self._parse_response(response_text)
+        usage = message.usage
+        self.record_usage(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+        return message.content[0].text
 
     def _parse_response(self, response: str) -> Analysis:
         """Parse the JSON response into an Analysis object."""
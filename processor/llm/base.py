@@ -1,10 +1,43 @@
+import html
+import json
+import logging
+import math
+import threading
 from abc import ABC, abstractmethod
-from processor.models import Analysis
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+from processor.models import Analysis, Theme, Sentiment
+
+logger = logging.getLogger(__name__)
+
+# Token counts of the calls made by each thread, while track_usage() is on
+_usage = threading.local()
+
+# Part of the analysis cache key (processor/cache.py): bump it when the
+# instructions or the prompt format change, so cached analyses are redone
+PROMPT_VERSION = "4"
+
+USAGE_KEYS = ("input_tokens", "output_tokens")
+
+
+@dataclass
+class AnalysisRequest:
+    """One item for LLMClient.analyze_many."""
+    title: str
+    content: str
+    search_phrase: str
 
 
 class LLMClient(ABC):
     """Abstract interface for LLM providers."""
 
+    # Rough English average for Claude/GPT tokenizers; enough for budgets
+    CHARS_PER_TOKEN = 4
+    # Output allowance per item in a batched prompt, and the overall cap
+    BATCH_TOKENS_PER_ITEM = 600
+    MAX_BATCH_OUTPUT_TOKENS = 8192
+
     @abstractmethod
     def analyze(self, title: str, content: str, search_phrase: str) -> Analysis:
         """
@@ -20,23 +53,170 @@ class LLMClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def complete(self, prompt: str, max_tokens: int, system: str | None = None) -> str:
+        """
+        Send a single-message prompt and return the response text.
+
+        ``system`` is the static part of the prompt (e.g.
+        ANALYSIS_INSTRUCTIONS), sent as the system prompt.
+        Implementations report token counts with record_usage().
+        """
+        pass
+
     @abstractmethod
     def health_check(self) -> bool:
         """Verify the LLM service is reachable."""
         pass
 
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.CHARS_PER_TOKEN)
+
+    @contextmanager
+    def track_usage(self) -> Iterator[dict]:
+        """
+        Count the tokens used by this thread's calls inside the block.
+
+        Yields a dict of USAGE_KEYS, filled in as calls complete.
+        """
+        previous = getattr(_usage, "counts", None)
+        counts = dict.fromkeys(USAGE_KEYS, 0)
+        _usage.counts = counts
+        try:
+            yield counts
+        finally:
+            _usage.counts = previous
+            if previous is not None:
+                for key, value in counts.items():
+                    previous[key] += value
+
+    def record_usage(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        counts = getattr(_usage, "counts", None)
+        if counts is None:
+            return
+        counts["input_tokens"] += input_tokens or 0
+        counts["output_tokens"] += output_tokens or 0
+
+    def analyze_many(
+        self,
+        items: list[AnalysisRequest],
+        max_input_tokens: int = 4000,
+        max_items: int = 20
+    ) -> list[Analysis | Exception]:
+        """
+        Analyze several items with as few requests as possible.
+
+        Items are packed into prompts of up to ``max_items`` items and
+        about ``max_input_tokens`` tokens of content, so short texts
+        (tweets, headlines, link posts) share the instructions and the
+        round trip. Items missing from a batch response or failing to
+        parse are retried on their own with analyze().
+
+        Returns one entry per item, in order: its Analysis, or the
+        exception raised while analysing it.
+        """
+        results: list[Analysis | Exception | None] = [None] * len(items)
+
+        batch: list[int] = []
+        budget = 0
+        for index, item in enumerate(items):
+            size = self.estimate_tokens(item.title) + self.estimate_tokens(item.content)
+            if batch and (len(batch) >= max_items or budget + size > max_input_tokens):
+                self._analyze_batch(items, batch, results)
+                batch, budget = [], 0
+            batch.append(index)
+            budget += size
+        if batch:
+            self._analyze_batch(items, batch, results)
+
+        return results
+
+    def _analyze_batch(
+        self,
+        items: list[AnalysisRequest],
+        batch: list[int],
+        results: list
+    ) -> None:
+        """Fill ``results`` for the item indexes in ``batch``."""
+        parsed: dict[int, Analysis] = {}
+        if len(batch) > 1:
+            prompt = self.build_batch_prompt([items[i] for i in batch])
+            max_tokens = min(
+                self.BATCH_TOKENS_PER_ITEM * len(batch), self.MAX_BATCH_OUTPUT_TOKENS
+            )
+            try:
+                parsed = self._parse_batch_response(
+                    self.complete(prompt, max_tokens, BATCH_ANALYSIS_INSTRUCTIONS)
+                )
+            except Exception as e:
+                logger.warning(f"Batched analysis of {len(batch)} items failed: {e}")
+
+        missing = 0
+        for position, index in enumerate(batch):
+            if position in parsed:
+                results[index] = parsed[position]
+                continue
+            missing += 1
+            item = items[index]
+            try:
+                results[index] = self.analyze(item.title, item.content, item.search_phrase)
+            except Exception as e:
+                results[index] = e
+        if len(batch) > 1 and missing:
+            logger.info(f"{missing} of {len(batch)} batched items analysed individually")
+
+    def _parse_batch_response(self, response: str) -> dict[int, Analysis]:
+        """
+        Analyses by item index from a batch response.
+
+        Entries that are malformed are left out (and retried by the
+        caller). A response cut off mid-way still yields the entries
+        completed before the cut.
+        """
+        response = _strip_code_fence(response)
+        try:
+            data = json.loads(response)
+            entries = data["results"] if isinstance(data, dict) else data
+        except (ValueError, KeyError):
+            entries = _complete_entries(response)
+
+        parsed = {}
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                parsed[int(entry["index"])] = _to_analysis(entry)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        return parsed
+
+    def parse_analysis(self, response: str) -> Analysis:
+        """Parse a single-item analysis response (e.g. from a bulk batch)."""
+        return _to_analysis(json.loads(_strip_code_fence(response)))
+
     def build_analysis_prompt(self, title: str, content: str, search_phrase: str) -> str:
-        """Build the analysis prompt."""
+        """Build the per-item part of the analysis prompt (see ANALYSIS_INSTRUCTIONS)."""
         return f"""Analyze the following content that was collected while searching for "{search_phrase}".
 
 Title: {title}
 
 Content:
-{content}
+{content}"""
+
+    def build_batch_prompt(self, items: list[AnalysisRequest]) -> str:
+        """Build the per-batch part of a batched prompt (see BATCH_ANALYSIS_INSTRUCTIONS)."""
+        # Phrases are user input; a quote or bracket must not end the tag
+        blocks = "\n\n".join(
+            f'<item index="{i}" search_phrase="{html.escape(item.search_phrase, quote=True)}">\n'
+            f"Title: {item.title}\n\nContent:\n{item.content}\n</item>"
+            for i, item in enumerate(items)
+        )
+        return f"""Analyze each of the following {len(items)} items independently. Each was collected while searching for the phrase given with it.
 
-Provide a structured analysis with:
+{blocks}"""
 
-1. THEMES: Identify 1-5 main themes. For each theme provide:
+
+# The static part of every analysis prompt, sent as the system prompt;
+# everything item-specific goes in the user message.
+_ANALYSIS_GUIDE = """1. THEMES: Identify 1-5 main themes. For each theme provide:
    - name: A short descriptive name (2-4 words)
    - confidence: How confident you are this theme is present (0.0-1.0)
    - keywords: 2-5 keywords associated with this theme
@@ -49,7 +229,11 @@ Provide a structured analysis with:
 
 4. KEY_POINTS: 2-5 bullet points capturing the main takeaways
 
-5. ENTITIES: List any people, organizations, or locations mentioned
+5. ENTITIES: List any people, organizations, or locations mentioned"""
+
+ANALYSIS_INSTRUCTIONS = f"""Provide a structured analysis with:
+
+{_ANALYSIS_GUIDE}
 
 Respond in JSON format:
 {{
@@ -62,3 +246,71 @@ Respond in JSON format:
   "key_points": ["...", "..."],
   "entities": ["...", "..."]
 }}"""
+
+BATCH_ANALYSIS_INSTRUCTIONS = f"""For EACH item provide a structured analysis with:
+
+{_ANALYSIS_GUIDE}
+
+Respond in JSON format, with one entry per item in item order and its index:
+{{
+  "results": [
+    {{
+      "index": 0,
+      "themes": [
+        {{"name": "...", "confidence": 0.0, "keywords": ["...", "..."]}}
+      ],
+      "sentiment": "neutral",
+      "sentiment_score": 0.0,
+      "summary": "...",
+      "key_points": ["...", "..."],
+      "entities": ["...", "..."]
+    }}
+  ]
+}}"""
+
+
+def _strip_code_fence(response: str) -> str:
+    # Handle potential markdown code blocks
+    if "```json" in response:
+        response = response.split("```json")[1].split("```")[0]
+    elif "```" in response:
+        response = response.split("```")[1].split("```")[0]
+    return response.strip()
+
+
+def _to_analysis(data: dict) -> Analysis:
+    themes = [
+        Theme(
+            name=t["name"],
+            confidence=float(t["confidence"]),
+            keywords=t.get("keywords", [])
+        )
+        for t in data.get("themes", [])
+    ]
+
+    return Analysis(
+        themes=themes,
+        sentiment=Sentiment(data["sentiment"]),
+        sentiment_score=float(data["sentiment_score"]),
+        summary=data["summary"],
+        key_points=data.get("key_points", []),
+        entities=data.get("entities", []),
+    )
+
+
+def _complete_entries(response: str) -> list:
+    """The complete objects of a truncated ``{"results": [...`` response."""
+    start = response.find("[")
+    if start < 0:
+        return []
+    decoder = json.JSONDecoder()
+    entries = []
+    position = start + 1
+    while True:
+        while position < len(response) and response[position] in " \t\r\n,":
+            position += 1
+        try:
+            entry, position = decoder.raw_decode(response, position)
+        except ValueError:
+            return entries
+        entries.append(entry)
@@ -1,6 +1,6 @@
 import json
 from openai import OpenAI
-from processor.llm.base import LLMClient
+from processor.llm.base import ANALYSIS_INSTRUCTIONS, LLMClient
 from processor.models import Analysis, Theme, Sentiment
 
 
@@ -11,26 +11,35 @@ class OpenAILLMClient(LLMClient):
         self,
         api_key: str,
         model: str = "gpt-4o",
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        base_url: str | None = None
     ):
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
         self.model = model
         self.max_tokens = max_tokens
 
     def analyze(self, title: str, content: str, search_phrase: str) -> Analysis:
         prompt = self.build_analysis_prompt(title, content, search_phrase)
+        response_text = self.complete(prompt, self.max_tokens, ANALYSIS_INSTRUCTIONS)
+        return self._parse_response(response_text)
 
+    def complete(self, prompt: str, max_tokens: int, system: str | None = None) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        # Both the single and batched prompts ask for a JSON object
         response = self.client.chat.completions.create(
             model=self.model,
-            max_tokens=self.max_tokens,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+            max_tokens=max_tokens,
+            messages=messages,
             response_format={"type": "json_object"}
         )
-
-        response_text = response.choices[0].message.content
-        return self._parse_response(response_text)
+        usage = response.usage
+        if usage is not None:
+            self.record_usage(
+                input_tokens=usage.prompt_tokens, output_tokens=usage.completion_tokens
+            )
+        return response.choices[0].message.content
 
     def _parse_response(self, response: str) -> Analysis:
         """Parse the JSON response into an Analysis object."""
@@ -2,8 +2,12 @@ import logging
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
+from shared.normalize import ContentNormalizer
 from processor.config import ProcessorSettings
 from processor.service import ProcessorService
+from processor.bulk import AnthropicBulkBackend, OpenAIBulkBackend, BulkBatchStore
+from processor.dedup import NearDuplicateIndex
+from processor.cache import DiskAnalysisCache, RedisAnalysisCache
 from processor.queue import RedisQueueConsumer
 from processor.llm.anthropic import AnthropicLLMClient
 from processor.llm.openai import OpenAILLMClient
@@ -26,7 +30,8 @@ def build_llm_client():
             raise ValueError("ANTHROPIC_API_KEY required for Anthropic provider")
         return AnthropicLLMClient(
             api_key=settings.anthropic_api_key,
-            model=settings.llm_model or "claude-sonnet-4-20250514"
+            model=settings.llm_model or "claude-sonnet-4-20250514",
+            base_url=settings.anthropic_base_url
         )
     elif settings.llm_provider == "vertex":
         if not settings.gcp_project_id:
@@ -41,12 +46,24 @@ def build_llm_client():
             raise ValueError("OPENAI_API_KEY required for OpenAI provider")
         return OpenAILLMClient(
             api_key=settings.openai_api_key,
-            model=settings.llm_model or "gpt-4o"
+            model=settings.llm_model or "gpt-4o",
+            base_url=settings.openai_base_url
         )
     else:
         raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
 
 
+def build_bulk_backend(llm):
+    """Provider batch API for the LLM client, or None if it has none here."""
+    if isinstance(llm, AnthropicLLMClient):
+        return AnthropicBulkBackend(llm.client, llm.model, llm.max_tokens)
+    if isinstance(llm, OpenAILLMClient):
+        return OpenAIBulkBackend(llm.client, llm.model, llm.max_tokens)
+    # Vertex AI batch prediction reads from and writes to GCS/BigQuery,
+    # which doesn't fit this submit/poll flow
+    return None
+
+
 def build_service() -> ProcessorService:
     queue = RedisQueueConsumer(
         url=settings.redis_url,
@@ -73,13 +90,57 @@ def build_service() -> ProcessorService:
 
     database = PostgresDatabase(settings.database_url)
 
+    if settings.dedup_policy not in ("off", "tag", "reuse"):
+        raise ValueError(f"Unknown dedup policy: {settings.dedup_policy}")
+    dedup = None
+    if settings.dedup_policy != "off":
+        dedup = NearDuplicateIndex(
+            url=settings.redis_url,
+            bands=settings.dedup_bands,
+            rows=settings.dedup_rows,
+            window_hours=settings.dedup_window_hours,
+            min_tokens=settings.dedup_min_tokens,
+            match_text=settings.dedup_match_text,
+            match_url=settings.dedup_canonical_urls
+        )
+
+    if settings.analysis_cache not in ("off", "redis", "disk"):
+        raise ValueError(f"Unknown analysis cache: {settings.analysis_cache}")
+    analysis_cache = None
+    if settings.analysis_cache == "redis":
+        analysis_cache = RedisAnalysisCache(
+            url=settings.redis_url,
+            max_entries=settings.analysis_cache_max_entries,
+            ttl_hours=settings.analysis_cache_ttl_hours
+        )
+    elif settings.analysis_cache == "disk":
+        analysis_cache = DiskAnalysisCache(
+            path=settings.analysis_cache_path,
+            max_entries=settings.analysis_cache_max_entries,
+            ttl_hours=settings.analysis_cache_ttl_hours
+        )
+
     return ProcessorService(
         queue=queue,
         llm=llm,
         storage=storage,
         database=database,
         topic=settings.queue_topic,
-        skip_existing=settings.skip_existing
+        skip_existing=settings.skip_existing,
+        normalizer=(
+            ContentNormalizer(max_tokens=settings.content_max_tokens)
+            if settings.normalize_before_analysis
+            else None
+        ),
+        dedup=dedup,
+        reuse_analysis=settings.dedup_policy == "reuse",
+        max_concurrency=settings.analysis_concurrency,
+        analysis_batch_size=settings.analysis_batch_size,
+        analysis_batch_item_tokens=settings.analysis_batch_item_tokens,
+        analysis_batch_tokens=settings.analysis_batch_tokens,
+        bulk=build_bulk_backend(llm),
+        bulk_store=BulkBatchStore(settings.redis_url),
+        analysis_cache=analysis_cache,
     )
 
 
@@ -115,6 +176,59 @@ def process_continuous(background_tasks: BackgroundTasks):
     return {"status": "started", "message": "Continuous processing started in background"}
 
 
+class BulkSubmitRequest(BaseModel):
+    max_items: int | None = None
+
+
+def get_bulk_service() -> ProcessorService:
+    service = get_service()
+    if service.bulk is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bulk mode is not supported for LLM provider {settings.llm_provider}"
+        )
+    return service
+
+
+@app.post("/bulk/submit")
+def bulk_submit(req: BulkSubmitRequest):
+    """Submit queued items to the provider batch API."""
+    service = get_bulk_service()
+    stats = service.submit_bulk(req.max_items or settings.bulk_max_items)
+    return {"status": "submitted" if stats["batch_id"] else "completed", "stats": stats}
+
+
+@app.post("/bulk/poll")
+def bulk_poll():
+    """Write the results of finished batches."""
+    stats = get_bulk_service().poll_bulk()
+    return {"status": "completed", "stats": stats}
+
+
+@app.get("/bulk/batches")
+def bulk_batches():
+    """List batches that are submitted or being written."""
+    return {"batches": get_service().bulk_store.list()}
+
+
+@app.get("/bulk/batches/{batch_id}")
+def bulk_batch(batch_id: str):
+    """Get a batch, including the stats of a written one."""
+    batch = get_service().bulk_store.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+@app.get("/cache")
+def cache_stats():
+    """Analysis cache size and hit rate."""
+    service = get_service()
+    if service.analysis_cache is None:
+        return {"backend": "off"}
+    return {"backend": settings.analysis_cache, **service.analysis_cache.stats()}
+
+
 @app.get("/health")
 def health():
     """Health check endpoint."""
@@ -135,6 +249,17 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "worker":
         service = build_service()
         service.process_continuous(settings.batch_size)
+    elif len(sys.argv) > 1 and sys.argv[1] == "bulk":
+        service = build_service()
+        if service.bulk is None:
+            sys.exit(f"Bulk mode is not supported for LLM provider {settings.llm_provider}")
+        if settings.use_redis_streams:
+            sys.exit("Bulk mode needs the queue depth, which Redis streams don't report")
+        service.process_bulk_continuous(
+            min_backlog=settings.bulk_min_backlog,
+            max_items=settings.bulk_max_items,
+            poll_interval=settings.bulk_poll_interval
+        )
     else:
         import uvicorn
         uvicorn.run(app, host="0.0.0.0", port=8081)
@@ -40,6 +40,17 @@ class Analysis:
             "entities": self.entities,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Analysis":
+        return cls(
+            themes=[Theme(**t) for t in data["themes"]],
+            sentiment=Sentiment(data["sentiment"]),
+            sentiment_score=data["sentiment_score"],
+            summary=data["summary"],
+            key_points=data["key_points"],
+            entities=data["entities"],
+        )
+
 
 @dataclass
 class ProcessedItem:
@@ -57,6 +68,7 @@ class ProcessedItem:
     search_phrase: str
     analysis: Analysis
     raw_storage_path: str
+    cluster_id: str | None = None  # Near-duplicate cluster (see processor/dedup.py)
 
     def to_dict(self) -> dict:
         return {
@@ -73,4 +85,5 @@ class ProcessedItem:
             "search_phrase": self.search_phrase,
             "analysis": self.analysis.to_dict(),
             "raw_storage_path": self.raw_storage_path,
+            "cluster_id": self.cluster_id,
         }
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Iterator
-import json
 import redis
+from shared.wire import decode
 
 
 class QueueConsumer(ABC):
@@ -16,6 +16,10 @@ class QueueConsumer(ABC):
         """
         pass
 
+    def depth(self, topic: str) -> int | None:
+        """Messages waiting to be consumed, or None if the backend can't tell."""
+        return None
+
     @abstractmethod
     def health_check(self) -> bool:
         pass
@@ -44,7 +48,7 @@ class RedisQueueConsumer(QueueConsumer):
                 break  # No more messages within timeout
 
             _, message = result
-            yield json.loads(message)
+            yield decode(message)
 
     def _consume_stream(self, topic: str, batch_size: int) -> Iterator[dict]:
         """Consume from Redis stream."""
@@ -64,7 +68,12 @@ class RedisQueueConsumer(QueueConsumer):
             for stream_name, messages in results:
                 for message_id, data in messages:
                     last_id = message_id
-                    yield json.loads(data[b"data"])
+                    yield decode(data[b"data"])
+
+    def depth(self, topic: str) -> int | None:
+        # Streams are read from the start and never trimmed, so their
+        # length isn't a backlog
+        return None if self.use_streams else self.client.llen(topic)
 
     def health_check(self) -> bool:
         try:
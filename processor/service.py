@@ -1,9 +1,23 @@
+import functools
+import itertools
 import json
 import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from processor.models import ProcessedItem
+from typing import Iterable, Iterator
+from shared.normalize import ContentNormalizer
+from shared.urls import canonicalize_url
+from processor.bulk import BulkBackend, BulkBatchStore, BulkRequest
+from processor.cache import AnalysisCache, analysis_cache_key
+from processor.dedup import NearDuplicateIndex
+from processor.models import Analysis, ProcessedItem
 from processor.queue import QueueConsumer
-from processor.llm.base import LLMClient
+from processor.llm.base import (
+    ANALYSIS_INSTRUCTIONS, PROMPT_VERSION, USAGE_KEYS, AnalysisRequest, LLMClient
+)
 from processor.storage.base import ObjectStorage
 from processor.database.postgres import PostgresDatabase
 
@@ -20,7 +34,17 @@ class ProcessorService:
         storage: ObjectStorage,
         database: PostgresDatabase,
         topic: str = "raw_content",
-        skip_existing: bool = True
+        skip_existing: bool = True,
+        normalizer: ContentNormalizer | None = None,
+        dedup: NearDuplicateIndex | None = None,
+        reuse_analysis: bool = False,
+        max_concurrency: int = 1,
+        analysis_batch_size: int = 1,
+        analysis_batch_item_tokens: int = 300,
+        analysis_batch_tokens: int = 4000,
+        bulk: BulkBackend | None = None,
+        bulk_store: BulkBatchStore | None = None,
+        analysis_cache: AnalysisCache | None = None
     ):
         self.queue = queue
         self.llm = llm
@@ -28,20 +52,142 @@ class ProcessorService:
         self.database = database
         self.topic = topic
         self.skip_existing = skip_existing
+        # For items queued by collectors that don't normalize content themselves
+        self.normalizer = normalizer
+        # Near-duplicate clustering; with reuse_analysis, only the first
+        # member of a cluster is sent to the LLM
+        self.dedup = dedup
+        self.reuse_analysis = reuse_analysis
+        # Items analysed at once; LLM calls take seconds and mostly wait
+        # on the network, so threads scale well up to the provider's limits
+        self.max_concurrency = max_concurrency
+        # Short items (up to analysis_batch_item_tokens) are analysed up to
+        # analysis_batch_size per prompt, so they share the instructions
+        self.analysis_batch_size = analysis_batch_size
+        self.analysis_batch_item_tokens = analysis_batch_item_tokens
+        self.analysis_batch_tokens = analysis_batch_tokens
+        # Provider batch API for draining backlogs (submit_bulk/poll_bulk)
+        self.bulk = bulk
+        self.bulk_store = bulk_store
+        # Analyses of identical inputs, across ids, phrases and reprocessing
+        self.analysis_cache = analysis_cache
 
     def process_batch(self, batch_size: int = 10) -> dict:
         """
         Process a batch of items from the queue.
 
+        With ``max_concurrency`` above 1, up to that many items (or
+        groups of short items, see ``analysis_batch_size``) are analysed
+        at once in worker threads; the queue is only read as workers free
+        up. Errors stay isolated per item either way.
+
         Returns summary stats.
         """
+        stats = self._new_stats()
+        groups = self._group_items(self.queue.consume(self.topic, batch_size))
+
+        if self.max_concurrency <= 1:
+            for group in groups:
+                self._merge_stats(stats, self._handle_items(group))
+            self._log_usage(stats)
+            return stats
+
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_concurrency)
+
+        def done(group, future):
+            # Always free the slot, or the reader blocks once they have all leaked
+            try:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = self._new_stats()
+                    for raw_item in group:
+                        self._record_error(result, raw_item, e)
+                with lock:
+                    self._merge_stats(stats, result)
+            except Exception as e:
+                logger.error(f"Could not merge processing stats: {e}")
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="process"
+        ) as executor:
+            for group in groups:
+                slots.acquire()
+                executor.submit(self._handle_items, group).add_done_callback(
+                    functools.partial(done, group)
+                )
+
+        self._log_usage(stats)
+        return stats
+
+    @staticmethod
+    def _log_usage(stats: dict) -> None:
+        if stats["input_tokens"]:
+            logger.info(
+                f"LLM tokens: {stats['input_tokens']} input, {stats['output_tokens']} output"
+            )
+
+    def _group_items(self, items: Iterator[dict]) -> Iterator[list[dict]]:
+        """Group short items for batched analysis; other items go alone."""
+        group = []
+        for raw_item in items:
+            size = self.llm.estimate_tokens(
+                (raw_item.get("title") or "") + (raw_item.get("content") or "")
+            )
+            if self.analysis_batch_size <= 1 or size > self.analysis_batch_item_tokens:
+                yield [raw_item]
+                continue
+            group.append(raw_item)
+            if len(group) >= self.analysis_batch_size:
+                yield group
+                group = []
+        if group:
+            yield group
+
+    def _new_stats(self) -> dict:
         stats = {
             "processed": 0,
             "skipped": 0,
-            "errors": []
+            "errors": [],
+            # LLM tokens
+            **dict.fromkeys(USAGE_KEYS, 0)
         }
+        if self.normalizer is not None:
+            stats["bytes_saved"] = 0
+            stats["tokens_saved"] = 0
+        if self.dedup is not None:
+            stats["duplicates"] = 0
+            stats["analyses_reused"] = 0
+        if self.analysis_cache is not None:
+            stats["analysis_cache_hits"] = 0
+            stats["analysis_cache_misses"] = 0
+        return stats
+
+    @staticmethod
+    def _merge_stats(total: dict, stats: dict) -> None:
+        for key, value in stats.items():
+            total[key] += value
+
+    def _handle_items(self, raw_items: list[dict]) -> dict:
+        """
+        Skip or process queue items, analysing them together.
 
-        for raw_item in self.queue.consume(self.topic, batch_size):
+        Returns their stats; never raises.
+        """
+        stats = self._new_stats()
+        prepared = self._prepare_items(raw_items, stats)
+        # Run LLM analysis for items without a reused one
+        self._analyze_items([item for item in prepared if item["analysis"] is None], stats)
+        self._insert_items(prepared, stats)
+        return stats
+
+    def _prepare_items(self, raw_items: Iterable[dict], stats: dict) -> list[dict]:
+        """Skip processed items and prepare the rest (see _prepare_item)."""
+        prepared = []
+        for raw_item in raw_items:
             try:
                 item_id = raw_item.get("id")
 
@@ -51,52 +197,372 @@ class ProcessorService:
                     stats["skipped"] += 1
                     continue
 
-                processed = self._process_item(raw_item)
-                self.database.insert(processed)
-                stats["processed"] += 1
-                logger.info(f"Processed item: {item_id}")
+                prepared.append(self._prepare_item(raw_item, stats))
+            except Exception as e:
+                self._record_error(stats, raw_item, e)
+        return prepared
+
+    def _analyze_items(self, items: list[dict], stats: dict) -> None:
+        """Analyse prepared items synchronously; failures are recorded as errors."""
+        if not items:
+            return
+        with self.llm.track_usage() as usage:
+            try:
+                results = self.llm.analyze_many(
+                    [
+                        AnalysisRequest(item["title"], item["content"], item["search_phrase"])
+                        for item in items
+                    ],
+                    max_input_tokens=self.analysis_batch_tokens,
+                    max_items=max(self.analysis_batch_size, 1),
+                )
+            except Exception as e:
+                results = [e] * len(items)
+        self._merge_stats(stats, usage)
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                self._record_error(stats, item["raw_item"], result)
+            else:
+                self._set_analysis(item, result)
 
+    def _set_analysis(self, item: dict, analysis: Analysis) -> None:
+        item["analysis"] = analysis
+        if item.get("cache_key") is not None:
+            try:
+                self.analysis_cache.put(item["cache_key"], analysis.to_dict())
             except Exception as e:
-                logger.error(f"Error processing item: {e}")
-                stats["errors"].append({
-                    "item_id": raw_item.get("id", "unknown"),
-                    "error": str(e)
-                })
+                logger.warning(f"Could not store analysis in cache: {e}")
+        if item["cluster_id"] is not None and self.reuse_analysis:
+            # Also when a member was analysed because the representative's
+            # analysis wasn't stored yet, so later members can reuse it
+            try:
+                self.dedup.put_analysis(
+                    item["cluster_id"], item["search_phrase"], analysis.to_dict()
+                )
+            except Exception as e:
+                logger.warning(f"Could not store cluster analysis: {e}")
 
-        return stats
+    def _insert_items(self, items: list[dict], stats: dict) -> None:
+        """Store analysed items; items whose analysis failed are left out."""
+        for item in items:
+            if item["analysis"] is None:
+                continue
+            try:
+                self.database.insert(self._build_item(item))
+                stats["processed"] += 1
+                logger.info(f"Processed item: {item['raw_item']['id']}")
+            except Exception as e:
+                self._record_error(stats, item["raw_item"], e)
+
+    def _record_error(self, stats: dict, raw_item: dict, error: Exception) -> None:
+        logger.error(f"Error processing item: {error}")
+        stats["errors"].append({
+            "item_id": raw_item.get("id", "unknown"),
+            "error": str(error)
+        })
 
-    def _process_item(self, raw_item: dict) -> ProcessedItem:
-        """Process a single item."""
+    def _prepare_item(self, raw_item: dict, stats: dict) -> dict:
+        """
+        Store, normalize and cluster an item ahead of analysis.
+
+        Returns the fields _build_item needs; "analysis" is already set
+        if one was reused from the item's cluster.
+        """
         item_id = raw_item["id"]
 
         # Store raw content
         raw_path = f"raw/{raw_item['source_type']}/{item_id}.json"
         self.storage.put(raw_path, json.dumps(raw_item))
 
-        # Run LLM analysis
-        analysis = self.llm.analyze(
-            title=raw_item.get("title", ""),
-            content=raw_item.get("content", ""),
-            search_phrase=raw_item.get("search_phrase", "")
-        )
+        title = raw_item.get("title") or ""
+        content = raw_item.get("content") or ""
+        if self.normalizer is not None:
+            original = content
+            title = self.normalizer.normalize(title, trim=False)
+            content = self.normalizer.normalize(original)
+            stats["bytes_saved"] += len(original.encode()) - len(content.encode())
+            stats["tokens_saved"] += (
+                self.normalizer.estimate_tokens(original)
+                - self.normalizer.estimate_tokens(content)
+            )
+
+        search_phrase = raw_item.get("search_phrase", "")
+        cluster_id = None
+        analysis = None
+        if self.dedup is not None:
+            # Messages from older collectors have no canonical_url
+            canonical_url = raw_item.get("canonical_url")
+            if canonical_url is None:
+                canonical_url = canonicalize_url(raw_item.get("url", ""))
+            cluster_id = self.dedup.cluster(item_id, canonical_url, title, content)
+            if cluster_id is not None and cluster_id != item_id:
+                stats["duplicates"] += 1
+                if self.reuse_analysis:
+                    cached = self.dedup.get_analysis(cluster_id, search_phrase)
+                    if cached is not None:
+                        analysis = Analysis.from_dict(cached)
+                        stats["analyses_reused"] += 1
+
+        item = {
+            "raw_item": raw_item,
+            "raw_path": raw_path,
+            "title": title,
+            "content": content,
+            "search_phrase": search_phrase,
+            "cluster_id": cluster_id,
+            "analysis": analysis,
+            "cache_key": None,  # Set while the analysis is yet to be cached
+        }
+        if analysis is None and self.analysis_cache is not None:
+            key = analysis_cache_key(
+                title, content, search_phrase,
+                getattr(self.llm, "model", type(self.llm).__name__), PROMPT_VERSION
+            )
+            try:
+                cached = self.analysis_cache.get(key)
+            except Exception as e:
+                logger.warning(f"Analysis cache unavailable: {e}")
+                cached = None
+            if cached is not None:
+                stats["analysis_cache_hits"] += 1
+                # Also shares it with the item's cluster
+                self._set_analysis(item, Analysis.from_dict(cached))
+            else:
+                stats["analysis_cache_misses"] += 1
+                item["cache_key"] = key
+        return item
 
-        # Build processed item
+    def _build_item(self, item: dict) -> ProcessedItem:
+        """Build the processed item from _prepare_item's fields and its analysis."""
+        raw_item = item["raw_item"]
         return ProcessedItem(
-            id=item_id,
+            id=raw_item["id"],
             source_type=raw_item["source_type"],
             source_name=raw_item["source_name"],
             url=raw_item["url"],
-            title=raw_item.get("title", ""),
-            content=raw_item.get("content", ""),
+            title=item["title"],
+            content=item["content"],
             author=raw_item.get("author"),
             published_at=datetime.fromisoformat(raw_item["published_at"]),
             collected_at=datetime.fromisoformat(raw_item["collected_at"]),
             processed_at=datetime.now(),
             search_phrase=raw_item["search_phrase"],
-            analysis=analysis,
-            raw_storage_path=raw_path
+            analysis=item["analysis"],
+            raw_storage_path=item["raw_path"],
+            cluster_id=item["cluster_id"]
         )
 
+    # Claimed batches not written within this many seconds are released
+    BULK_CLAIM_TIMEOUT = 3600
+
+    def submit_bulk(self, max_items: int = 10000) -> dict:
+        """
+        Submit up to ``max_items`` queued items as one provider batch.
+
+        Items are skipped, prepared and (with a reused cluster analysis)
+        stored as in process_batch; the rest are submitted and kept in
+        the bulk store until poll_bulk writes their results. They are
+        recorded as pending before the submission, so if the process
+        dies or the batch can't be saved afterwards, poll_bulk analyses
+        them later; if the submission fails they are analysed
+        synchronously at once. Either way nothing taken off the queue is
+        lost.
+
+        Returns process_batch stats plus "batch_id" and "submitted".
+        """
+        stats = self._new_stats()
+        stats["batch_id"] = None
+        stats["submitted"] = 0
+
+        raw_items = itertools.islice(self.queue.consume(self.topic, max_items), max_items)
+        prepared = self._prepare_items(raw_items, stats)
+        pending = [item for item in prepared if item["analysis"] is None]
+        self._insert_items([item for item in prepared if item["analysis"] is not None], stats)
+        if not pending:
+            return stats
+
+        items = {str(i): item for i, item in enumerate(pending)}
+        pending_id = uuid.uuid4().hex
+        try:
+            self.bulk_store.save_pending(pending_id, self.bulk.provider, items)
+        except Exception as e:
+            logger.error(f"Could not record bulk submission, analysing {len(pending)} items now: {e}")
+            self._analyze_items(pending, stats)
+            self._insert_items(pending, stats)
+            return stats
+
+        requests = [
+            BulkRequest(
+                custom_id,
+                self.llm.build_analysis_prompt(
+                    item["title"], item["content"], item["search_phrase"]
+                ),
+                system=ANALYSIS_INSTRUCTIONS,
+            )
+            for custom_id, item in items.items()
+        ]
+        try:
+            batch_id = self.bulk.submit(requests)
+        except Exception as e:
+            logger.error(f"Bulk submission failed, analysing {len(pending)} items now: {e}")
+            self._analyze_items(pending, stats)
+            self._insert_items(pending, stats)
+            try:
+                self.bulk_store.discard_pending(pending_id)
+            except Exception as e:
+                logger.warning(f"Could not discard pending bulk submission {pending_id}: {e}")
+            return stats
+
+        try:
+            self.bulk_store.save(batch_id, self.bulk.provider, items, pending_id=pending_id)
+        except Exception as e:
+            # The provider batch can't be tracked, but its items are still
+            # pending; poll_bulk analyses them once the record is stale
+            logger.error(
+                f"Could not save bulk batch {batch_id}, its items stay pending "
+                f"as {pending_id}: {e}"
+            )
+            stats["errors"].append({"batch_id": batch_id, "error": str(e)})
+            return stats
+        stats["batch_id"] = batch_id
+        stats["submitted"] = len(pending)
+        logger.info(f"Submitted bulk batch {batch_id} with {len(pending)} items")
+        return stats
+
+    def poll_bulk(self) -> dict:
+        """
+        Write the results of bulk batches that have finished.
+
+        Items whose result is missing, errored or unparseable are analysed
+        synchronously, as are the items of submissions that were never
+        saved as a batch (see submit_bulk). Returns process_batch stats
+        for the written items plus the "completed" and "pending" batch
+        ids and the "recovered" pending submissions.
+        """
+        stats = self._new_stats()
+        stats["completed"] = []
+        stats["pending"] = []
+        stats["recovered"] = []
+
+        for pending_id in self.bulk_store.claim_stale_pending(self.BULK_CLAIM_TIMEOUT):
+            try:
+                self._recover_pending(pending_id, stats)
+            except Exception as e:
+                logger.error(f"Could not recover bulk submission {pending_id}: {e}")
+                stats["errors"].append({"batch_id": pending_id, "error": str(e)})
+                continue
+            stats["recovered"].append(pending_id)
+
+        self.bulk_store.release_stale(self.BULK_CLAIM_TIMEOUT)
+        for batch_id in self.bulk_store.open_batches():
+            try:
+                finished = self.bulk.is_finished(batch_id)
+            except Exception as e:
+                logger.error(f"Could not check bulk batch {batch_id}: {e}")
+                finished = False
+            if not finished:
+                stats["pending"].append(batch_id)
+                continue
+            if not self.bulk_store.claim(batch_id):
+                continue  # Another processor is writing it
+
+            try:
+                batch_stats = self._write_bulk_batch(batch_id)
+            except Exception as e:
+                logger.error(f"Could not write bulk batch {batch_id}: {e}")
+                self.bulk_store.release(batch_id)
+                stats["errors"].append({"batch_id": batch_id, "error": str(e)})
+                continue
+
+            self.bulk_store.complete(
+                batch_id, {**batch_stats, "errors": len(batch_stats["errors"])}
+            )
+            self._merge_stats(stats, batch_stats)
+            stats["completed"].append(batch_id)
+            logger.info(
+                f"Wrote bulk batch {batch_id}: {batch_stats['processed']} processed, "
+                f"{len(batch_stats['errors'])} errors"
+            )
+            self._log_usage(batch_stats)
+        return stats
+
+    def _recover_pending(self, pending_id: str, stats: dict) -> None:
+        """Analyse and store the items of a submission that was never saved as a batch."""
+        items = [
+            item for item in self.bulk_store.pending_items(pending_id).values()
+            if not (self.skip_existing and self.database.exists(item["raw_item"]["id"]))
+        ]
+        logger.info(f"Analysing {len(items)} items of unsaved bulk submission {pending_id}")
+        self._analyze_items(items, stats)
+        self._insert_items(items, stats)
+        self.bulk_store.discard_pending(pending_id)
+
+    def _write_bulk_batch(self, batch_id: str) -> dict:
+        stats = self._new_stats()
+        items = self.bulk_store.items(batch_id)
+
+        for result in self.bulk.results(batch_id):
+            item = items.get(result.custom_id)
+            if item is None:
+                continue
+            if result.usage:
+                self._merge_stats(stats, result.usage)
+            if result.text is None:
+                logger.warning(f"Bulk request {batch_id}/{result.custom_id} failed: {result.error}")
+                continue
+            try:
+                self._set_analysis(item, self.llm.parse_analysis(result.text))
+            except Exception as e:
+                logger.warning(f"Could not parse bulk result {batch_id}/{result.custom_id}: {e}")
+
+        failed = [item for item in items.values() if item["analysis"] is None]
+        if failed:
+            logger.info(f"Analysing {len(failed)} items of bulk batch {batch_id} synchronously")
+            self._analyze_items(failed, stats)
+        self._insert_items(list(items.values()), stats)
+        return stats
+
+    def process_bulk_continuous(
+        self,
+        min_backlog: int = 5000,
+        max_items: int = 10000,
+        poll_interval: float = 60
+    ) -> None:
+        """
+        Drain backlogs through the provider batch API until interrupted.
+
+        Submits a batch whenever the queue holds at least ``min_backlog``
+        items, and writes finished batches every ``poll_interval``
+        seconds. Smaller queues are left to the synchronous workers.
+        Returns at once if the queue can't report its depth.
+        """
+        if self.queue.depth(self.topic) is None:
+            # Without a depth no backlog would ever be found and submitted
+            logger.error(
+                "Bulk processing needs the queue depth, which this queue can't "
+                "report (Redis streams are read without consumer groups); "
+                "use a Redis list queue or submit with /bulk/submit"
+            )
+            return
+        logger.info("Starting bulk processing...")
+        try:
+            while True:
+                polled = self.poll_bulk()
+                if polled["completed"]:
+                    logger.info(
+                        f"Wrote {polled['processed']} items from {len(polled['completed'])} batches"
+                    )
+
+                depth = self.queue.depth(self.topic)
+                if depth is not None and depth >= min_backlog:
+                    logger.info(f"Queue backlog of {depth} items, submitting a batch")
+                    if self.submit_bulk(max_items)["submitted"]:
+                        continue
+                time.sleep(poll_interval)
+
+        except KeyboardInterrupt:
+            logger.info("Stopping bulk processing")
+
     def process_continuous(self, batch_size: int = 10) -> None:
         """Continuously process items until interrupted."""
         logger.info("Starting continuous processing...")
@@ -0,0 +1,7 @@
+"""
+Helpers shared by the collector and processor images.
+
+Both services install this package alongside their own, so the queue
+message format and the item normalization live in one place. Keep it
+free of third-party dependencies that only one image installs.
+"""
@@ -0,0 +1,100 @@
+"""
+Content normalization before analysis.
+
+Source bodies arrive with HTML, feed boilerplate ("The post ... appeared
+first on ...", "submitted by /u/..."), tracking links and NewsAPI's
+"[+1234 chars]" suffix. None of that helps the LLM, and all of it is paid
+for in prompt tokens. ContentNormalizer cleans a text and trims it to a
+token budget.
+
+Standard library only, so the processor can apply the same stage to
+items that were queued without it.
+"""
+import html
+import math
+import re
+
+_DROP_BLOCKS = re.compile(r"<(script|style|noscript|iframe)\b.*?</\1\s*>", re.I | re.S)
+_BLOCK_TAGS = re.compile(r"<\s*(br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>", re.I)
+_TAGS = re.compile(r"<[^>]+>")
+_URLS = re.compile(r"https?://([^/\s\"'<>]+)[^\s\"'<>]*")
+_NEWSAPI_SUFFIX = re.compile(r"\s*(…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+# Whole lines that are feed or site furniture rather than content
+_BOILERPLATE = re.compile(
+    r"^\s*(?:"
+    r"the post .* appeared first on .*"
+    r"|submitted by\s+/?u/\S+.*"
+    r"|\[link\]\s*\[comments\]"
+    r"|\[(?:removed|deleted)\]"
+    r"|(?:read more|read the full (?:story|article)|continue reading|click here)\b.{0,60}"
+    r"|(?:sign up|subscribe)\b.{0,80}newsletter.*"
+    r"|(?:image|photo)(?: credit)?:.{0,80}"
+    r")\s*$",
+    re.I | re.M,
+)
+
+
+class ContentNormalizer:
+    """
+    Strips markup and boilerplate and trims text to a token budget.
+
+    Token counts are estimated from length (about four characters per
+    token for English with current LLM tokenizers). That is close enough
+    to set a budget, and much cheaper than running a tokenizer.
+    """
+
+    def __init__(self, max_tokens: int | None = 1000, chars_per_token: float = 4.0):
+        """
+        Args:
+            max_tokens: Budget for normalized content (None = no trimming)
+            chars_per_token: Characters per token for the estimate
+        """
+        self.max_tokens = max_tokens
+        self.chars_per_token = chars_per_token
+
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def normalize(self, text: str, trim: bool = True) -> str:
+        """Return ``text`` cleaned and, with ``trim``, cut to the token budget."""
+        if not text:
+            return ""
+
+        if "<" in text:
+            text = _DROP_BLOCKS.sub(" ", text)
+            text = _BLOCK_TAGS.sub("\n", text)
+            text = _TAGS.sub(" ", text)
+        if "&" in text:
+            text = html.unescape(text)
+
+        text = _NEWSAPI_SUFFIX.sub("", text)
+        # Keep only the host of links: enough context, no tracking parameters
+        text = _URLS.sub(lambda m: m.group(1).removeprefix("www."), text)
+        text = _BOILERPLATE.sub("", text)
+
+        text = _SPACES.sub(" ", text)
+        text = _BLANK_LINES.sub("\n\n", text)
+        text = "\n".join(line.strip() for line in text.split("\n")).strip()
+
+        if trim:
+            text = self.trim(text)
+        return text
+
+    def trim(self, text: str) -> str:
+        """Cut ``text`` to the token budget, at a sentence or word boundary."""
+        if self.max_tokens is None:
+            return text
+        limit = int(self.max_tokens * self.chars_per_token)
+        if len(text) <= limit:
+            return text
+
+        cut = text[:limit]
+        # Prefer ending on a full sentence if one ends in the last fifth
+        sentence = max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("? "), cut.rfind("! "))
+        if sentence >= limit * 0.8:
+            return cut[:sentence + 1]
+        space = cut.rfind(" ")
+        return (cut[:space] if space > 0 else cut) + " …"
@@ -0,0 +1,110 @@
+"""
+URL canonicalization for cross-source deduplication.
+
+The same article reaches us as a NewsAPI url, an RSS link with campaign
+parameters, a Google News redirect or a Reddit link post. canonicalize_url
+maps those to one string, so the processor can recognise the article
+whichever source it came through.
+
+Standard library only, so the processor can canonicalize items queued
+without a canonical_url.
+"""
+from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that track the click rather than identify the page
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gclsrc", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "ref", "ref_src", "ref_url", "referrer",
+    "cmpid", "cmp", "ito", "ncid", "ocid", "sr_share", "smid", "smtyp",
+    "taid", "outputtype", "amp", "guccounter", "guce_referrer",
+    "guce_referrer_sig", "_ga", "_gl", "spm", "rss",
+})
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_", "mtm_", "oly_", "vero_", "__hs", "_hs")
+
+# Redirect wrappers that carry their target in a query parameter:
+# host -> (path prefix, parameter names)
+REDIRECT_HOSTS = {
+    "news.google.com": ("/", ("url",)),
+    "google.com": ("/url", ("url", "q")),
+    "l.facebook.com": ("/l.php", ("u",)),
+    "lm.facebook.com": ("/l.php", ("u",)),
+    "l.instagram.com": ("/", ("u",)),
+    "out.reddit.com": ("/", ("url",)),
+    "t.umblr.com": ("/redirect", ("z",)),
+    "href.li": ("/", ()),
+}
+
+_DROP_SUBDOMAINS = ("www.", "m.", "amp.", "mobile.")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _unwrap(parts: SplitResult, params: list[tuple[str, str]]) -> str | None:
+    """Target URL of a known redirect wrapper, or None."""
+    host = parts.hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    if host not in REDIRECT_HOSTS:
+        return None
+    path, names = REDIRECT_HOSTS[host]
+    if not parts.path.startswith(path):
+        return None
+    if names:
+        target = next((v for k, v in params if k in names), "")
+    else:
+        # href.li/?https://example.com/...
+        target = parts.query
+    return target if target.startswith(("http://", "https://")) else None
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL, or "" if ``url`` isn't http(s).
+
+    Unwraps redirect wrappers whose target is in the URL itself (no
+    network requests), then normalizes: https scheme, lowercase host
+    without www./m./amp., no default port, fragment, tracking parameters
+    or AMP suffix, sorted query and no trailing slash.
+    """
+    url = (url or "").strip()
+    for _ in range(3):
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return ""
+        if parts.scheme.lower() not in _DEFAULT_PORTS or not parts.hostname:
+            return ""
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        target = _unwrap(parts, params)
+        if target is None:
+            break
+        url = target
+    else:
+        return ""
+
+    host = parts.hostname.rstrip(".")
+    for prefix in _DROP_SUBDOMAINS:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    try:
+        port = parts.port
+    except ValueError:
+        return ""
+    if port and port != _DEFAULT_PORTS[parts.scheme.lower()]:
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    while "//" in path:
+        path = path.replace("//", "/")
+    for suffix in ("/amp/", "/amp", ".amp"):
+        if path.endswith(suffix) and len(path) > len(suffix):
+            path = path[:-len(suffix)]
+            break
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (k, v) for k, v in params
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ))
+    return urlunsplit(("https", host, path, query, ""))
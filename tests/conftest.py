@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+import redis
+
+from collector.models import SearchRequest
+from collector.replay import ReplayTransport
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# The window the fixture cassettes were recorded for
+WINDOW_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+WINDOW_END = datetime(2024, 1, 8, tzinfo=timezone.utc)
+
+
+def search_request(phrase: str = "climate", job_id: str = "test", **kwargs) -> SearchRequest:
+    return SearchRequest(
+        phrase=phrase,
+        start_date=kwargs.pop("start_date", WINDOW_START),
+        end_date=kwargs.pop("end_date", WINDOW_END),
+        job_id=job_id,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def replay():
+    """ReplayTransport over a cassette in tests/fixtures, by source name."""
+    def transport(name: str) -> ReplayTransport:
+        return ReplayTransport([FIXTURES / f"{name}.json"])
+    return transport
+
+
+@pytest.fixture
+def redis_url(monkeypatch):
+    """A Redis URL served by an in-memory fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis, "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs),
+    )
+    return "redis://fake"
@@ -0,0 +1,114 @@
+"""Bulk submission and polling against processor/batch_standin.py."""
+import anthropic
+import pytest
+from fastapi.testclient import TestClient
+
+from processor.batch_standin import create_app
+from processor.bulk import AnthropicBulkBackend, BulkBatchStore
+from processor.llm.anthropic import AnthropicLLMClient
+from processor.service import ProcessorService
+from tests.test_processor import ListQueue, MemoryDatabase, MemoryStorage, raw_item
+
+
+def make_service(redis_url: str, items: list[dict], batch_delay: float = 0) -> ProcessorService:
+    llm = AnthropicLLMClient("test", model="standin")
+    llm.client = anthropic.Anthropic(
+        api_key="test",
+        base_url="http://standin",
+        http_client=TestClient(create_app(batch_delay), base_url="http://standin"),
+    )
+    return ProcessorService(
+        ListQueue(items), llm, MemoryStorage(), MemoryDatabase(),
+        bulk=AnthropicBulkBackend(llm.client, llm.model),
+        bulk_store=BulkBatchStore(redis_url),
+    )
+
+
+def stories() -> list[dict]:
+    return [
+        raw_item("a", "Rates rise"),
+        raw_item("b", "Jobs report"),
+        raw_item("c", "STANDIN_ERROR in this one"),
+    ]
+
+
+def summaries(service: ProcessorService) -> dict:
+    return {item_id: item.analysis.summary for item_id, item in service.database.items.items()}
+
+
+def test_submitted_batches_are_written_once_finished(redis_url):
+    service = make_service(redis_url, stories())
+
+    submitted = service.submit_bulk()
+    polled = service.poll_bulk()
+
+    assert submitted["submitted"] == 3
+    assert polled["completed"] == [submitted["batch_id"]]
+    assert polled["processed"] == 3
+    assert polled["input_tokens"] > 0 and polled["output_tokens"] > 0
+    # The errored request was analysed synchronously instead
+    assert summaries(service) == {
+        "a": "Stand-in analysis of: Rates rise",
+        "b": "Stand-in analysis of: Jobs report",
+        "c": "Stand-in analysis of: STANDIN_ERROR in this one",
+    }
+    assert service.bulk_store.get(submitted["batch_id"])["status"] == "completed"
+    assert service.bulk_store.open_batches() == []
+
+
+def test_running_batches_stay_pending(redis_url):
+    service = make_service(redis_url, stories(), batch_delay=60)
+
+    submitted = service.submit_bulk()
+    polled = service.poll_bulk()
+
+    assert polled["pending"] == [submitted["batch_id"]]
+    assert polled["processed"] == 0
+    assert service.database.items == {}
+
+
+def test_failed_submissions_are_analysed_at_once(redis_url, monkeypatch):
+    service = make_service(redis_url, stories())
+
+    def refuse(requests):
+        raise RuntimeError("batch API unavailable")
+    monkeypatch.setattr(service.bulk, "submit", refuse)
+
+    stats = service.submit_bulk()
+
+    assert stats["batch_id"] is None
+    assert stats["processed"] == 3
+    assert service.bulk_store.claim_stale_pending(0) == []
+
+
+def test_items_of_an_unsaved_batch_are_recovered_by_a_later_poll(redis_url, monkeypatch):
+    service = make_service(redis_url, stories())
+
+    def lose_connection(*args, **kwargs):
+        raise ConnectionError("Redis went away")
+    with monkeypatch.context() as patch:
+        patch.setattr(service.bulk_store, "save", lose_connection)
+        submitted = service.submit_bulk()
+
+    assert submitted["batch_id"] is None
+    assert submitted["errors"][0]["error"] == "Redis went away"
+    # Too recent: the submitting process may still be saving it
+    assert service.poll_bulk()["recovered"] == []
+
+    monkeypatch.setattr(ProcessorService, "BULK_CLAIM_TIMEOUT", 0)
+    polled = service.poll_bulk()
+
+    assert len(polled["recovered"]) == 1
+    assert polled["processed"] == 3
+    assert sorted(service.database.items) == ["a", "b", "c"]
+    assert service.poll_bulk()["recovered"] == []
+
+
+@pytest.mark.parametrize("status", ["submitted", "processing"])
+def test_batches_are_listed_until_written(redis_url, status):
+    service = make_service(redis_url, stories(), batch_delay=60)
+    batch_id = service.submit_bulk()["batch_id"]
+    if status == "processing":
+        service.bulk_store.claim(batch_id)
+
+    assert [batch["status"] for batch in service.bulk_store.list()] == [status]
@@ -0,0 +1,68 @@
+from processor.dedup import NearDuplicateIndex
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, "
+    "its fourth increase this year, and signalled that further rises were "
+    "likely as inflation remains well above the target set by policymakers"
+)
+
+
+def test_signatures_are_deterministic(redis_url):
+    first = NearDuplicateIndex(redis_url).signature("Rates rise", STORY)
+    second = NearDuplicateIndex(redis_url).signature("Rates rise", STORY)
+
+    assert first == second
+    assert len(first) == 16 * 4
+
+
+def test_short_texts_have_no_signature(redis_url):
+    assert NearDuplicateIndex(redis_url).signature("Rates rise", "Rates went up") is None
+
+
+def test_only_similar_texts_share_bands(redis_url):
+    index = NearDuplicateIndex(redis_url)
+    original = index._band_keys(index.signature("Rates rise", STORY))
+    edited = index._band_keys(index.signature("Rates rise again", STORY + " next month"))
+    unrelated = index._band_keys(index.signature(
+        "Storm season",
+        "Forecasters expect an unusually active hurricane season along the "
+        "Atlantic coast this summer, with warmer ocean water feeding stronger "
+        "storms and more of them reaching land than in an average year",
+    ))
+
+    assert set(original) & set(edited)
+    assert not set(original) & set(unrelated)
+
+
+def test_clusters_near_duplicates_under_the_first_item(redis_url):
+    index = NearDuplicateIndex(redis_url)
+
+    assert index.cluster("a", "", "Rates rise", STORY, now=1000) == "a"
+    assert index.cluster("b", "", "Rates rise", STORY + " next month", now=1001) == "a"
+    assert index.cluster("c", "", "Storm season", "word " * 30, now=1002) == "c"
+
+
+def test_near_duplicates_expire_with_the_window(redis_url):
+    index = NearDuplicateIndex(redis_url, window_hours=1)
+
+    index.cluster("a", "", "Rates rise", STORY, now=1000)
+
+    assert index.cluster("b", "", "Rates rise", STORY, now=1000 + 3601) == "b"
+
+
+def test_clusters_same_url_without_text(redis_url):
+    index = NearDuplicateIndex(redis_url)
+
+    assert index.cluster("a", "https://example.com/a", "Short", "", now=1000) == "a"
+    assert index.cluster("b", "https://example.com/a", "Other", "", now=1001) == "a"
+    assert index.cluster("c", "", "Short", "", now=1002) is None
+
+
+def test_analyses_are_stored_per_phrase(redis_url):
+    index = NearDuplicateIndex(redis_url)
+
+    index.put_analysis("a", "Climate", {"summary": "first"})
+    index.put_analysis("a", "climate ", {"summary": "second"})
+
+    assert index.get_analysis("a", "climate") == {"summary": "first"}
+    assert index.get_analysis("a", "energy") is None
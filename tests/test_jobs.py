@@ -0,0 +1,118 @@
+"""JobStore and JobRunner against fakeredis."""
+import threading
+import time
+import pytest
+
+from collector.jobs import JobConflict, JobRunner, JobStore
+
+
+def wait_for_status(store: JobStore, job_id: str, status: str, timeout: float = 2.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job and job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never became {status}: {store.get(job_id)}")
+
+
+def test_runs_a_job_and_records_progress(redis_url):
+    store = JobStore(redis_url)
+    runner = JobRunner(store)
+
+    def run(on_event):
+        on_event({"type": "progress", "source": "RSS", "count": 3})
+        return {"total": 3}
+
+    runner.submit(run, job_id="job-1", params={"phrase": "climate"})
+    job = wait_for_status(store, "job-1", "completed")
+
+    assert job["stats"] == {"total": 3}
+    assert job["progress"]["by_source"] == {"RSS": 3}
+    events = [event for _, event in store.follow("job-1", heartbeat=0.01)]
+    assert [e.get("status", e["type"]) for e in events] == [
+        "queued", "running", "progress", "completed",
+    ]
+
+
+def test_failed_jobs_record_the_error(redis_url):
+    store = JobStore(redis_url)
+
+    def run(on_event):
+        raise RuntimeError("all sources failed")
+
+    JobRunner(store).submit(run, job_id="job-1")
+
+    assert wait_for_status(store, "job-1", "failed")["error"] == "all sources failed"
+
+
+def test_an_unfinished_job_id_cannot_be_submitted_again(redis_url):
+    store = JobStore(redis_url)
+    runner = JobRunner(store)
+    release = threading.Event()
+    runner.submit(lambda on_event: release.wait(2) and {}, job_id="job-1")
+
+    with pytest.raises(JobConflict):
+        runner.submit(lambda on_event: {}, job_id="job-1")
+    release.set()
+    wait_for_status(store, "job-1", "completed")
+
+    # Finished jobs release their ID, and the new run starts a fresh event stream
+    runner.submit(lambda on_event: {"total": 1}, job_id="job-1")
+    job = wait_for_status(store, "job-1", "completed")
+    assert job["stats"] == {"total": 1}
+    statuses = [e.get("status") for _, e in store.follow("job-1", heartbeat=0.01)]
+    assert statuses == ["queued", "running", "completed"]
+
+
+def test_creating_a_job_is_atomic(redis_url):
+    stores = [JobStore(redis_url) for _ in range(8)]
+    barrier = threading.Barrier(len(stores))
+    created = []
+
+    def create(store):
+        barrier.wait()
+        created.append(store.create({"id": "job-1", "status": "queued"}, lease=10))
+
+    threads = [threading.Thread(target=create, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(created) == [False] * 7 + [True]
+
+
+def test_running_jobs_keep_renewing_their_lease(redis_url):
+    store = JobStore(redis_url)
+    release = threading.Event()
+    JobRunner(store, lease=0.1).submit(lambda on_event: release.wait(2) and {}, job_id="job-1")
+    wait_for_status(store, "job-1", "running")
+
+    time.sleep(0.3)
+    assert store.get("job-1")["status"] == "running"
+    release.set()
+    wait_for_status(store, "job-1", "completed")
+
+
+def test_jobs_of_a_stopped_replica_fail_once_their_lease_expires(redis_url):
+    store = JobStore(redis_url)
+    # A replica that created the job and then died
+    store.create({"id": "job-1", "status": "running", "error": None}, lease=0.05)
+    store.append_event("job-1", {"type": "status", "status": "running"})
+
+    events = [event for _, event in store.follow("job-1", heartbeat=0.02)]
+
+    assert events[0] == {"type": "status", "status": "running"}
+    assert events[-1]["status"] == "failed"
+    assert "stopped" in events[-1]["error"]
+    assert store.create({"id": "job-1", "status": "queued"}, lease=10)
+
+
+def test_follow_sends_heartbeats_while_a_job_is_quiet(redis_url):
+    store = JobStore(redis_url)
+    store.create({"id": "job-1", "status": "running"}, lease=10)
+
+    events = store.follow("job-1", heartbeat=0.01)
+
+    assert next(events) == (None, {"type": "heartbeat"})
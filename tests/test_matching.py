@@ -0,0 +1,33 @@
+from collector.matching import PhraseMatcher
+
+
+def test_finds_every_phrase_including_overlapping_ones():
+    matcher = PhraseMatcher(["climate", "climate change", "change"])
+
+    assert matcher.find("Climate Change is here") == {"climate", "climate change", "change"}
+
+
+def test_matches_case_insensitively_and_returns_lowercased_phrases():
+    matcher = PhraseMatcher(["Solar", "WIND power"])
+
+    assert matcher.find("wind Power and SOLAR panels") == {"solar", "wind power"}
+
+
+def test_finds_a_phrase_after_a_partial_match_of_another():
+    matcher = PhraseMatcher(["abcd", "bce"])
+
+    assert matcher.find("xabce") == {"bce"}
+
+
+def test_single_phrase():
+    matcher = PhraseMatcher(["climate"])
+
+    assert matcher.find("CLIMATE news") == {"climate"}
+    assert matcher.find("weather news") == set()
+
+
+def test_ignores_empty_and_duplicate_phrases():
+    matcher = PhraseMatcher(["", "Climate", "climate"])
+
+    assert matcher.phrases == ["climate"]
+    assert matcher.find("") == set()
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+import httpx
+import pytest
+
+from collector.sources.newsapi import NewsAPISource
+from tests.conftest import WINDOW_START, search_request
+
+
+class EverythingAPI:
+    """Serves /everything over a fixed set of articles, newest first."""
+
+    def __init__(self, count: int, page_size: int, fail_page: int | None = None):
+        self.page_size = page_size
+        self.fail_page = fail_page
+        self.requests = []
+        self.articles = [
+            {
+                "source": {"name": "Wire"},
+                "url": f"https://example.com/{i}",
+                "title": f"Story {i}",
+                "description": f"Story {i}.",
+                "publishedAt": (WINDOW_START + timedelta(hours=6 * i + 1)).isoformat(),
+            }
+            for i in range(count)
+        ]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        start = datetime.fromisoformat(params["from"] + "+00:00")
+        end = datetime.fromisoformat(params["to"] + "+00:00")
+        page = int(params["page"])
+        self.requests.append((start, end, page))
+        if page == self.fail_page:
+            return httpx.Response(500)
+        found = sorted(
+            (a for a in self.articles
+             if start <= datetime.fromisoformat(a["publishedAt"]) <= end),
+            key=lambda a: a["publishedAt"], reverse=True,
+        )
+        offset = (page - 1) * self.page_size
+        return httpx.Response(200, json={
+            "status": "ok",
+            "totalResults": len(found),
+            "articles": found[offset:offset + self.page_size],
+        })
+
+
+def test_newsapi_windows_skip_the_range_of_the_first_page():
+    api = EverythingAPI(count=20, page_size=5)
+    source = NewsAPISource("key", page_size=5, transport=httpx.MockTransport(api))
+    request = search_request()
+
+    items = list(source.search(request))
+
+    assert sorted(item.url for item in items) == sorted(a["url"] for a in api.articles)
+    full_range = [r for r in api.requests if r[:2] == (request.start_date, request.end_date)]
+    assert full_range == [(request.start_date, request.end_date, 1)]
+    oldest_on_first_page = datetime.fromisoformat(api.articles[15]["publishedAt"])
+    assert all(end <= oldest_on_first_page for _, end, _ in api.requests[1:])
+
+
+def test_newsapi_yields_window_pages_before_a_later_page_fails():
+    api = EverythingAPI(count=20, page_size=5, fail_page=2)
+    source = NewsAPISource(
+        "key", page_size=5, transport=httpx.MockTransport(api), max_slices=1
+    )
+
+    results = source.search(search_request())
+    items = [next(results) for _ in range(9)]
+    with pytest.raises(RuntimeError, match="500"):
+        next(results)
+
+    # The first page, then the new articles on page 1 of the window
+    assert len({item.url for item in items}) == 9
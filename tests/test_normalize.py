@@ -0,0 +1,53 @@
+from shared.normalize import ContentNormalizer
+
+
+def test_strips_markup_and_unescapes_entities():
+    text = "<p>Rates &amp; prices</p><script>track()</script><div>rose <b>again</b></div>"
+
+    assert ContentNormalizer().normalize(text) == "Rates & prices\nrose again"
+
+
+def test_keeps_only_the_host_of_links():
+    text = "Read it at https://www.example.com/a/b?utm_source=x today"
+
+    assert ContentNormalizer().normalize(text) == "Read it at example.com today"
+
+
+def test_drops_boilerplate_lines_and_newsapi_suffixes():
+    text = (
+        "Storms hit the coast.\n"
+        "The post Storm update appeared first on Example News.\n"
+        "submitted by /u/someone\n"
+        "[link] [comments]\n"
+        "Crews are out… [+1200 chars]"
+    )
+
+    assert ContentNormalizer().normalize(text) == "Storms hit the coast.\n\nCrews are out"
+
+
+def test_collapses_whitespace():
+    assert ContentNormalizer().normalize("  a \t b c\n\n\n\nd  ") == "a b c\n\nd"
+
+
+def test_trims_at_a_sentence_boundary():
+    normalizer = ContentNormalizer(max_tokens=10)
+    text = "The first sentence ends near the limit. " + "More words follow. " * 5
+
+    assert normalizer.normalize(text) == "The first sentence ends near the limit."
+
+
+def test_trims_at_a_word_boundary_without_a_late_sentence_end():
+    normalizer = ContentNormalizer(max_tokens=5)
+
+    assert normalizer.normalize("Short. " + "word " * 20) == "Short. word word …"
+
+
+def test_leaves_text_untrimmed_without_a_budget():
+    text = "word " * 2000
+
+    assert ContentNormalizer(max_tokens=None).normalize(text) == text.strip()
+    assert ContentNormalizer().normalize(text, trim=False) == text.strip()
+
+
+def test_estimates_tokens_from_length():
+    assert ContentNormalizer().estimate_tokens("a" * 9) == 3
@@ -0,0 +1,203 @@
+"""ProcessorService against in-memory queue, storage and database."""
+import threading
+
+from processor.cache import RedisAnalysisCache
+from processor.llm.base import LLMClient
+from processor.models import Analysis, Sentiment
+from processor.queue import QueueConsumer
+from processor.service import ProcessorService
+from processor.storage.base import ObjectStorage
+import processor.service
+
+
+def raw_item(item_id: str, title: str = "Rates rise", phrase: str = "rates") -> dict:
+    return {
+        "id": item_id,
+        "source_type": "rss",
+        "source_name": "Feed",
+        "url": f"https://example.com/{item_id}",
+        "title": title,
+        "content": f"{title}. More on that below.",
+        "author": None,
+        "published_at": "2024-01-02T00:00:00+00:00",
+        "collected_at": "2024-01-02T01:00:00+00:00",
+        "search_phrase": phrase,
+        "metadata": {},
+    }
+
+
+class ListQueue(QueueConsumer):
+    def __init__(self, items: list[dict]):
+        self.items = list(items)
+
+    def consume(self, topic, batch_size=10):
+        while self.items and batch_size > 0:
+            batch_size -= 1
+            yield self.items.pop(0)
+
+    def health_check(self):
+        return True
+
+
+class MemoryStorage(ObjectStorage):
+    def __init__(self):
+        self.objects = {}
+
+    def put(self, key, data):
+        self.objects[key] = data
+        return key
+
+    def get(self, key):
+        return self.objects[key]
+
+    def exists(self, key):
+        return key in self.objects
+
+    def health_check(self):
+        return True
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self.items = {}
+
+    def exists(self, item_id):
+        return item_id in self.items
+
+    def insert(self, item):
+        self.items[item.id] = item
+
+
+class CountingLLM(LLMClient):
+    """Summarises an item as its title; fails for titles in ``failing``."""
+
+    def __init__(self, model: str = "test-model", failing: tuple = ()):
+        self.model = model
+        self.failing = failing
+        self.analyzed = []
+
+    def analyze(self, title, content, search_phrase):
+        self.analyzed.append(title)
+        if title in self.failing:
+            raise RuntimeError(f"cannot analyse {title}")
+        return Analysis([], Sentiment.NEUTRAL, 0.0, title, [], [])
+
+    def complete(self, prompt, max_tokens, system=None):
+        raise NotImplementedError
+
+    def health_check(self):
+        return True
+
+
+def make_service(items: list[dict], llm: LLMClient | None = None, **kwargs) -> ProcessorService:
+    return ProcessorService(
+        ListQueue(items), llm or CountingLLM(), MemoryStorage(), MemoryDatabase(), **kwargs
+    )
+
+
+def test_cached_analyses_are_reused_for_identical_content(redis_url):
+    cache = RedisAnalysisCache(redis_url)
+    first = make_service([raw_item("a")], analysis_cache=cache)
+    first.process_batch()
+    llm = CountingLLM()
+    repost = make_service([raw_item("b")], llm, analysis_cache=cache)
+
+    stats = repost.process_batch()
+
+    assert llm.analyzed == []
+    assert stats["analysis_cache_hits"] == 1
+    assert stats["analysis_cache_misses"] == 0
+    assert repost.database.items["b"].analysis.summary == "Rates rise"
+
+
+def test_cache_misses_analyse_and_store(redis_url):
+    cache = RedisAnalysisCache(redis_url)
+    service = make_service([raw_item("a"), raw_item("b", "Jobs report")], analysis_cache=cache)
+
+    stats = service.process_batch()
+
+    assert service.llm.analyzed == ["Rates rise", "Jobs report"]
+    assert stats["analysis_cache_misses"] == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_failed_analyses_are_not_cached(redis_url):
+    cache = RedisAnalysisCache(redis_url)
+    service = make_service(
+        [raw_item("a")], CountingLLM(failing=("Rates rise",)), analysis_cache=cache
+    )
+
+    stats = service.process_batch()
+
+    assert len(stats["errors"]) == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_analyses_are_evicted(redis_url):
+    cache = RedisAnalysisCache(redis_url, max_entries=1)
+    make_service([raw_item("a"), raw_item("b", "Jobs report")], analysis_cache=cache).process_batch()
+    llm = CountingLLM()
+
+    stats = make_service([raw_item("c")], llm, analysis_cache=cache).process_batch()
+
+    assert llm.analyzed == ["Rates rise"]
+    assert stats["analysis_cache_misses"] == 1
+
+
+def test_a_new_prompt_version_invalidates_cached_analyses(redis_url, monkeypatch):
+    cache = RedisAnalysisCache(redis_url)
+    make_service([raw_item("a")], analysis_cache=cache).process_batch()
+    monkeypatch.setattr(processor.service, "PROMPT_VERSION", "next")
+    llm = CountingLLM()
+
+    stats = make_service([raw_item("b")], llm, analysis_cache=cache).process_batch()
+
+    assert llm.analyzed == ["Rates rise"]
+    assert stats["analysis_cache_misses"] == 1
+
+
+def test_another_model_invalidates_cached_analyses(redis_url):
+    cache = RedisAnalysisCache(redis_url)
+    make_service([raw_item("a")], analysis_cache=cache).process_batch()
+    llm = CountingLLM(model="other-model")
+
+    stats = make_service([raw_item("b")], llm, analysis_cache=cache).process_batch()
+
+    assert llm.analyzed == ["Rates rise"]
+    assert stats["analysis_cache_misses"] == 1
+
+
+def run_with_timeout(target, timeout: float = 5.0):
+    """Run target in a thread; returns its result, or fails if it hangs."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "still running; a concurrency slot leaked"
+    return result["value"]
+
+
+def test_failing_groups_release_their_concurrency_slot(monkeypatch):
+    items = [raw_item(str(i), f"Story {i}") for i in range(6)]
+    service = make_service(items, max_concurrency=2)
+
+    def crash(group):
+        raise RuntimeError("worker crashed")
+    monkeypatch.setattr(service, "_handle_items", crash)
+
+    stats = run_with_timeout(lambda: service.process_batch(batch_size=6))
+
+    assert sorted(e["item_id"] for e in stats["errors"]) == ["0", "1", "2", "3", "4", "5"]
+    assert stats["processed"] == 0
+
+
+def test_concurrent_analysis_failures_stay_with_their_items():
+    items = [raw_item(str(i), f"Story {i}") for i in range(6)]
+    llm = CountingLLM(failing=("Story 1", "Story 4"))
+    service = make_service(items, llm, max_concurrency=3)
+
+    stats = run_with_timeout(lambda: service.process_batch(batch_size=6))
+
+    assert stats["processed"] == 4
+    assert sorted(e["item_id"] for e in stats["errors"]) == ["1", "4"]
+    assert sorted(service.database.items) == ["0", "2", "3", "5"]
@@ -0,0 +1,267 @@
+"""PublishBuffer batching and its background flush, against fakeredis."""
+from datetime import datetime, timezone
+import threading
+import time
+import pytest
+import redis
+
+from collector.models import CollectedItem, SourceType
+from collector.queue import (
+    Backpressure, PublishBuffer, QueueBackpressureTimeout, QueueClient, RedisQueueClient,
+)
+from collector.seen import RedisSeenFilter, seen_key
+from collector.service import CollectorService
+from collector.sources.base import SourceAdapter
+from tests.conftest import search_request
+
+TOPIC = "raw_content"
+
+
+class FailingQueue(QueueClient):
+    def publish(self, topic: str, message: str | bytes) -> None:
+        raise ConnectionError("queue is down")
+
+    def health_check(self) -> bool:
+        return False
+
+
+class DepthQueue(QueueClient):
+    """In-memory queue reporting scripted depths, one per depth() call."""
+
+    def __init__(self, depths):
+        self.depths = depths
+        self.messages = []
+
+    def publish(self, topic: str, message: str | bytes) -> None:
+        self.messages.append(message)
+
+    def depth(self, topic: str) -> int | None:
+        return self.depths() if callable(self.depths) else self.depths.pop(0)
+
+    def health_check(self) -> bool:
+        return True
+
+
+class BlockingSource(SourceAdapter):
+    """Yields one item, then blocks until it shows up on the queue."""
+
+    source_type = "test"
+    name = "Blocking"
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.published_while_blocked = False
+
+    def search(self, request):
+        now = datetime.now(timezone.utc)
+        yield CollectedItem(
+            SourceType.RSS, "feed", "1", "https://example.com/1", "Title", "Body",
+            None, now, now, request.phrase, {},
+        )
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            if self.client.llen(TOPIC):
+                self.published_while_blocked = True
+                return
+            time.sleep(0.01)
+
+    def health_check(self) -> bool:
+        return True
+
+
+class StaticSource(SourceAdapter):
+    """Yields the same entry for every phrase it is asked for."""
+
+    source_type = "test"
+    name = "Static"
+
+    def search(self, request):
+        now = datetime.now(timezone.utc)
+        yield CollectedItem(
+            SourceType.RSS, "feed", "1", "https://example.com/1", "Title", "Body",
+            None, now, now, request.phrase, {},
+        )
+
+    def health_check(self) -> bool:
+        return True
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_flushes_once_the_batch_is_full(redis_url):
+    queue = RedisQueueClient(redis_url)
+    buffer = PublishBuffer(queue, TOPIC, flush_size=3, flush_interval=60)
+
+    assert buffer.add("a") == []
+    assert buffer.add("b") == []
+    assert queue.depth(TOPIC) == 0
+    assert buffer.add("c") == [True, True, True]
+
+    assert queue.client.lrange(TOPIC, 0, -1) == [b"a", b"b", b"c"]
+
+
+def test_close_publishes_what_is_left(redis_url):
+    queue = RedisQueueClient(redis_url)
+    flushed = []
+    buffer = PublishBuffer(queue, TOPIC, flush_size=10, flush_interval=60, on_flush=flushed.append)
+    buffer.start()
+    buffer.add("a")
+    buffer.add("b")
+
+    assert buffer.close() == [True, True]
+
+    assert queue.depth(TOPIC) == 2
+    assert flushed == [[True, True]]
+    assert buffer.flush() == []
+
+
+def test_flushes_on_a_timer_while_the_source_blocks(redis_url):
+    queue = RedisQueueClient(redis_url)
+    source = BlockingSource(redis.from_url(redis_url))
+    service = CollectorService([source], queue, TOPIC, flush_size=100, flush_interval=0.05)
+
+    stats = service.collect(search_request(sources=["test"]))
+
+    assert source.published_while_blocked
+    assert stats["by_source"] == {"Blocking": 1}
+    assert stats["errors"] == []
+
+
+def test_background_flush_errors_are_raised_by_the_next_add():
+    buffer = PublishBuffer(FailingQueue(), TOPIC, flush_size=10, flush_interval=0.05)
+    buffer.start()
+    buffer.add("a")
+    assert wait_for(lambda: buffer._timer_error is not None)
+
+    with pytest.raises(ConnectionError):
+        buffer.add("b")
+    buffer.stop()
+
+
+def test_background_flush_errors_are_raised_by_close():
+    buffer = PublishBuffer(FailingQueue(), TOPIC, flush_size=10, flush_interval=0.05)
+    buffer.start()
+    buffer.add("a")
+    assert wait_for(lambda: buffer._timer_error is not None)
+
+    with pytest.raises(ConnectionError):
+        buffer.close()
+
+
+def test_backpressure_passes_below_the_high_watermark():
+    backpressure = Backpressure(DepthQueue([9]), TOPIC, high_watermark=10, check_interval=0)
+
+    assert backpressure.wait() == 0.0
+
+
+def test_backpressure_pauses_until_the_low_watermark():
+    queue = DepthQueue([10, 8, 6, 5])
+    backpressure = Backpressure(
+        queue, TOPIC, high_watermark=10, low_watermark=5, check_interval=0.01
+    )
+    events = []
+
+    waited = backpressure.wait(events.append)
+
+    assert waited > 0
+    # Still paused at 8 and 6, although both are below the high watermark
+    assert queue.depths == []
+    assert [(e["state"], e["depth"]) for e in events] == [("paused", 10), ("resumed", 5)]
+
+
+def test_backpressure_gives_up_after_max_wait():
+    backpressure = Backpressure(
+        DepthQueue(lambda: 10), TOPIC, high_watermark=10, check_interval=0.01, max_wait=0.05
+    )
+
+    with pytest.raises(QueueBackpressureTimeout):
+        backpressure.wait()
+
+
+def test_adding_does_not_wait_for_a_paused_flush():
+    drained = threading.Event()
+    queue = DepthQueue(lambda: 0 if drained.is_set() else 10)
+    paused = threading.Event()
+    buffer = PublishBuffer(
+        queue, TOPIC, flush_size=10, flush_interval=60,
+        backpressure=Backpressure(queue, TOPIC, high_watermark=10, check_interval=0.01),
+        on_backpressure=lambda event: paused.set(),
+    )
+    buffer.add("a")
+    flushing = threading.Thread(target=buffer.flush)
+    flushing.start()
+    assert paused.wait(2)
+
+    started = time.monotonic()
+    assert buffer.add("b") == []
+    assert time.monotonic() - started < 0.5
+    assert queue.messages == []
+
+    drained.set()
+    flushing.join()
+    assert queue.messages == ["a"]
+    assert buffer.close() == [True]
+    assert queue.messages == ["a", "b"]
+    assert buffer.pauses == 1
+
+
+def test_a_failed_flush_keeps_its_batch_in_front():
+    backpressure = Backpressure(
+        DepthQueue(lambda: 10), TOPIC, high_watermark=10, check_interval=0.01, max_wait=0.02
+    )
+    buffer = PublishBuffer(DepthQueue([]), TOPIC, flush_size=10, backpressure=backpressure)
+    buffer.add("a")
+
+    with pytest.raises(QueueBackpressureTimeout):
+        buffer.flush()
+    buffer.add("b")
+
+    assert buffer._messages == ["a", "b"]
+
+
+def test_seen_pairs_are_dropped_but_other_phrases_still_publish(redis_url):
+    queue = RedisQueueClient(redis_url)
+    seen = RedisSeenFilter(redis_url)
+    seen.mark([seen_key("item-1", "climate")])
+    buffer = PublishBuffer(queue, TOPIC, seen_filter=seen)
+
+    buffer.add("climate copy", key=seen_key("item-1", "climate"))
+    buffer.add("solar copy", key=seen_key("item-1", "solar"))
+    published = buffer.close()
+
+    assert published == [False, True]
+    assert queue.client.lrange(TOPIC, 0, -1) == [b"solar copy"]
+    # Marked once published, so the next run drops it too
+    assert seen.filter_new([seen_key("item-1", "solar")]) == [False]
+
+
+def test_items_are_marked_seen_only_once_published(redis_url):
+    seen = RedisSeenFilter(redis_url)
+    buffer = PublishBuffer(FailingQueue(), TOPIC, seen_filter=seen)
+    buffer.add("message", key=seen_key("item-1", "climate"))
+
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+
+    assert seen.filter_new([seen_key("item-1", "climate")]) == [True]
+
+
+def test_collection_keys_the_seen_filter_by_item_and_phrase(redis_url):
+    queue = RedisQueueClient(redis_url)
+    seen = RedisSeenFilter(redis_url)
+    service = CollectorService([StaticSource()], queue, TOPIC, seen_filter=seen)
+    item = next(StaticSource().search(search_request()))
+    seen.mark([seen_key(item.id, "climate")])
+
+    stats = service.collect_many([search_request("climate"), search_request("solar")])
+
+    assert stats["by_phrase"] == {"solar": 1}
+    assert stats["seen"] == {"Static": {"new": 1, "seen": 1}}
@@ -0,0 +1,45 @@
+import calendar
+from datetime import datetime, timezone
+
+from collector.quota import QuotaPlanner
+
+
+def days_left() -> int:
+    now = datetime.now(timezone.utc)
+    return calendar.monthrange(now.year, now.month)[1] - now.day + 1
+
+
+def test_splits_the_daily_budget_over_phrases(redis_url):
+    planner = QuotaPlanner(redis_url, monthly_cap=3000 * days_left())
+
+    allowance = planner.allowance(["Climate", "solar", "wind"])
+
+    assert allowance == {"climate": 1000, "solar": 1000, "wind": 1000}
+
+
+def test_phrases_spend_their_own_share(redis_url):
+    planner = QuotaPlanner(redis_url, monthly_cap=1000 * days_left())
+    planner.allowance(["climate", "solar"])
+
+    planner.record(300, {"Climate": 300})
+
+    assert planner.allowance(["climate", "solar"]) == {"climate": 200, "solar": 500}
+    assert planner.usage()["today"] == 300
+
+
+def test_items_matching_several_phrases_count_once_towards_the_cap(redis_url):
+    planner = QuotaPlanner(redis_url, monthly_cap=1000)
+    planner.allowance(["climate", "solar"])
+
+    planner.record(100, {"climate": 100, "solar": 100})
+
+    assert planner.usage() == {"monthly_cap": 1000, "month": 100, "today": 100}
+
+
+def test_never_allows_more_than_is_left_this_month(redis_url):
+    planner = QuotaPlanner(redis_url, monthly_cap=100)
+    planner.allowance(["climate"])
+
+    planner.record(100, {"climate": 100})
+
+    assert planner.allowance(["climate"]) == {"climate": 0}
@@ -0,0 +1,51 @@
+import time
+from email.utils import formatdate
+import httpx
+import pytest
+
+from collector.ratelimit import remaining_requests, retry_after
+
+
+def response(**headers) -> httpx.Response:
+    return httpx.Response(429, headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_retry_after_seconds():
+    assert retry_after(response(retry_after="30")) == 30.0
+
+
+def test_retry_after_http_date():
+    wait = retry_after(response(retry_after=formatdate(time.time() + 60, usegmt=True)))
+
+    assert 55 <= wait <= 60
+
+
+def test_retry_after_in_the_past_is_zero():
+    assert retry_after(response(retry_after=formatdate(time.time() - 60, usegmt=True))) == 0.0
+    assert retry_after(response(retry_after="-5")) == 0.0
+
+
+def test_twitter_reset_is_an_epoch_timestamp():
+    wait = retry_after(response(x_rate_limit_reset=str(int(time.time()) + 120)))
+
+    assert 115 <= wait <= 120
+
+
+def test_reddit_reset_is_seconds_from_now():
+    assert retry_after(httpx.Response(200, headers={"X-Ratelimit-Reset": "42"})) == 42.0
+
+
+def test_retry_after_takes_precedence():
+    assert retry_after(response(retry_after="5", x_ratelimit_reset="42")) == 5.0
+
+
+@pytest.mark.parametrize("headers", [{}, {"retry-after": "soon"}, {"x-ratelimit-reset": "x"}])
+def test_no_usable_header(headers):
+    assert retry_after(httpx.Response(429, headers=headers)) is None
+
+
+def test_remaining_requests():
+    assert remaining_requests(response(x_rate_limit_remaining="12")) == 12.0
+    assert remaining_requests(response(x_ratelimit_remaining="99.0")) == 99.0
+    assert remaining_requests(response()) is None
+    assert remaining_requests(response(x_ratelimit_remaining="many")) is None
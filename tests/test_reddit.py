@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+
+from collector.sources.reddit import RedditSource
+from tests.conftest import search_request
+
+
+def test_reddit_yields_pages_before_a_later_page_fails(replay):
+    cassette = replay("reddit")
+
+    def fail_second_pages(request: httpx.Request) -> httpx.Response:
+        if "after" in request.url.params:
+            return httpx.Response(503)
+        return cassette.handle_request(request)
+    source = RedditSource(
+        "id", "secret", "tests", subreddits=["news"],
+        transport=httpx.MockTransport(fail_second_pages),
+    )
+    request = search_request()
+
+    results = source.search(request)
+    items = [next(results), next(results)]
+    with pytest.raises(RuntimeError, match="r/news"):
+        next(results)
+
+    assert [item.external_id for item in items] == ["n1", "n2"]
+    stats = source.pop_request_stats([request])["subreddits"]["news"]
+    assert stats["status"] == "error"
+    assert (stats["pages"], stats["items"]) == (1, 2)
+
+
+def test_reddit_time_filter_allows_for_a_window_that_aged_a_little():
+    source = RedditSource("id", "secret", "tests")
+    now = datetime.now(timezone.utc)
+
+    assert source._time_filter(now - timedelta(weeks=1, minutes=2)) == "week"
+    assert source._time_filter(now - timedelta(weeks=1, hours=1)) == "month"
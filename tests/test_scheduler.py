@@ -0,0 +1,127 @@
+"""Phrase registry, leader lock and scheduler against fakeredis."""
+import threading
+import time
+
+from collector.jobs import JobRunner, JobStore
+from collector.scheduler import CollectionScheduler, LeaderLock, PhraseRegistry, TrackedPhrase
+
+
+class RecordingService:
+    """Stands in for CollectorService; collect_many waits for ``release``."""
+
+    def __init__(self):
+        self.runs = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def collect_many(self, requests, on_event=None):
+        self.runs.append(sorted(r.phrase for r in requests))
+        self.release.wait(2)
+        return {"total": 0}
+
+
+def make_scheduler(redis_url: str, service=None) -> CollectionScheduler:
+    return CollectionScheduler(
+        service or RecordingService(),
+        PhraseRegistry(redis_url),
+        LeaderLock(redis_url),
+        JobRunner(JobStore(redis_url)),
+        jitter=0,
+    )
+
+
+def wait_until_finished(scheduler: CollectionScheduler, job_ids: list[str]) -> None:
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        if not scheduler._in_flight(set(job_ids)):
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"jobs still running: {job_ids}")
+
+
+def test_registry_keys_phrases_case_insensitively(redis_url):
+    registry = PhraseRegistry(redis_url)
+    registry.save(TrackedPhrase("Climate", interval=60))
+
+    assert registry.get("climate").phrase == "Climate"
+    assert [t.phrase for t in registry.list()] == ["Climate"]
+    assert registry.remove("CLIMATE")
+    assert registry.get("climate") is None
+    assert not registry.remove("climate")
+
+
+def test_registry_updates_never_bring_back_removed_phrases(redis_url):
+    registry = PhraseRegistry(redis_url)
+    registry.save(TrackedPhrase("climate", interval=60))
+
+    assert registry.update("climate", next_run=100.0).next_run == 100.0
+    registry.remove("climate")
+
+    assert registry.update("climate", next_run=200.0) is None
+    assert registry.get("climate") is None
+
+
+def test_only_one_replica_leads_until_its_lock_expires(redis_url):
+    first = LeaderLock(redis_url, ttl=0.1)
+    second = LeaderLock(redis_url, ttl=0.1)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # Renewing keeps the lead
+
+    time.sleep(0.15)
+    assert second.acquire()
+    assert not first.acquire()
+
+
+def test_submits_due_phrases_grouped_by_sources(redis_url):
+    scheduler = make_scheduler(redis_url)
+    for phrase in ("climate", "solar"):
+        scheduler.registry.save(TrackedPhrase(phrase, interval=60))
+    scheduler.registry.save(TrackedPhrase("wind", interval=60, sources=["rss"]))
+    scheduler.registry.save(TrackedPhrase("later", interval=60, next_run=time.time() + 60))
+
+    job_ids = scheduler.run_due()
+    wait_until_finished(scheduler, job_ids)
+
+    assert len(job_ids) == 2
+    assert sorted(scheduler.service.runs) == [["climate", "solar"], ["wind"]]
+    climate = scheduler.registry.get("climate")
+    assert climate.last_job_id in job_ids
+    assert climate.next_run > time.time() + 50
+    assert scheduler.run_due() == []
+
+
+def test_phrases_removed_during_a_pass_stay_removed(redis_url, monkeypatch):
+    scheduler = make_scheduler(redis_url)
+    for phrase in ("climate", "solar"):
+        scheduler.registry.save(TrackedPhrase(phrase, interval=60))
+    listed = scheduler.registry.list()
+    # Removed through the API after the scheduler listed the due phrases
+    scheduler.registry.remove("solar")
+    monkeypatch.setattr(scheduler.registry, "list", lambda: listed)
+
+    job_ids = scheduler.run_due()
+    wait_until_finished(scheduler, job_ids)
+
+    assert scheduler.service.runs == [["climate"]]
+    assert scheduler.registry.get("solar") is None
+
+
+def test_skips_phrases_whose_last_run_is_still_in_flight(redis_url):
+    service = RecordingService()
+    service.release.clear()
+    scheduler = make_scheduler(redis_url, service)
+    scheduler.registry.save(TrackedPhrase("climate", interval=60))
+    first = scheduler.run_due()
+    # Due again while the first run is still going
+    scheduler.registry.update("climate", next_run=0.0)
+
+    assert scheduler.run_due() == []
+
+    service.release.set()
+    wait_until_finished(scheduler, first)
+    second = scheduler.run_due()
+    wait_until_finished(scheduler, second)
+    assert len(second) == 1 and second != first
+    assert service.runs == [["climate"], ["climate"]]
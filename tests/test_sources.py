@@ -0,0 +1,143 @@
+"""Collector sources replaying the cassettes in tests/fixtures."""
+from datetime import datetime, timezone
+import httpx
+
+from collector.cache import ValidatorCache
+from collector.sources.newsapi import NewsAPISource
+from collector.sources.reddit import RedditSource
+from collector.sources.rss import RSSSource
+from collector.sources.twitter import TwitterSource
+from tests.conftest import search_request
+
+FEEDS = {
+    "World": "https://feeds.example.com/world.xml",
+    "Science": "https://feeds.example.com/science.xml",
+}
+
+
+class MemoryValidatorCache(ValidatorCache):
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key: str) -> dict:
+        return dict(self.entries.get(key, {}))
+
+    def set(self, key: str, validators: dict) -> None:
+        self.entries[key] = validators
+
+
+def test_newsapi_pages_and_skips_repeated_articles(replay):
+    source = NewsAPISource("key", page_size=2, transport=replay("newsapi"), max_workers=1)
+    request = search_request()
+
+    items = list(source.search(request))
+
+    assert [item.source_name for item in items] == ["Reuters", "The Verge", "BBC News"]
+    assert items[0].published_at == datetime(2024, 1, 6, 9, 30, tzinfo=timezone.utc)
+    # Falls back to the description when there is no content
+    assert items[1].content == "Heat pump sales keep rising."
+    assert items[0].canonical_url == "https://reuters.com/world/climate-talks-stall"
+    assert source.pop_request_stats([request])["pages"] == 2
+
+
+def test_reddit_trims_to_the_window_across_pages(replay):
+    source = RedditSource(
+        "id", "secret", "tests", subreddits=["news", "technology"],
+        transport=replay("reddit"),
+    )
+    request = search_request()
+
+    items = list(source.search(request))
+
+    assert sorted(item.external_id for item in items) == ["k2", "n1", "n2", "n3"]
+    assert all(item.search_phrase == "climate" for item in items)
+    link = next(item for item in items if item.external_id == "k2")
+    assert link.canonical_url == "https://techcrunch.com/2024/01/04/carbon-capture"
+
+    stats = source.pop_request_stats([request])["subreddits"]
+    assert stats["news"]["pages"] == 2
+    assert stats["news"]["items"] == 3
+    assert stats["technology"]["items"] == 1
+
+
+def test_rss_matches_phrases_in_one_pass(replay):
+    source = RSSSource(FEEDS, transport=replay("rss"))
+    requests = [search_request("climate"), search_request("SUMMIT")]
+
+    items = list(source.search_many(requests))
+
+    found = sorted((item.search_phrase, item.title) for item in items)
+    assert found == [
+        ("SUMMIT", "Climate summit opens"),
+        ("climate", "Climate summit opens"),
+        ("climate", "Election results"),
+        ("climate", "Ocean heat and climate"),
+    ]
+
+
+def test_rss_stores_validators_with_the_window_they_cover(replay):
+    cache = MemoryValidatorCache()
+    source = RSSSource(FEEDS, validator_cache=cache, transport=replay("rss"))
+
+    list(source.search(search_request()))
+
+    world = cache.get(source._cache_key(FEEDS["World"]))
+    assert world["etag"] == '"world-1"'
+    # Every entry is inside the window, so any window gets the same items
+    assert world["window_start"] == world["window_end"] == "*"
+    # The Science feed has an entry from before the window
+    science = cache.get(source._cache_key(FEEDS["Science"]))
+    assert science["window_start"] == "2024-01-01T00:00:00+00:00"
+    assert science["window_end"] == "*"
+
+
+def test_rss_conditional_gets_carry_over_between_phrase_mixes(replay):
+    cassette = replay("rss")
+
+    def not_modified(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"world-1"':
+            return httpx.Response(304)
+        return cassette.handle_request(request)
+    source = RSSSource(
+        {"World": FEEDS["World"]}, validator_cache=MemoryValidatorCache(),
+        transport=httpx.MockTransport(not_modified),
+    )
+
+    def status(*phrases: str) -> str:
+        requests = [search_request(phrase) for phrase in phrases]
+        list(source.search_many(requests))
+        return source.pop_request_stats(requests)["feeds"]["World"]["status"]
+
+    assert status("climate") == "fetched"
+    # A phrase the cached feed version was never matched for needs the feed
+    assert status("summit") == "fetched"
+    assert status("climate") == "not_modified"
+    assert status("summit", "climate") == "not_modified"
+
+
+def test_twitter_pages_through_a_single_phrase(replay):
+    source = TwitterSource("token", transport=replay("twitter"))
+
+    items = list(source.search(search_request()))
+
+    assert [item.external_id for item in items] == [
+        "1744000000000000003", "1744000000000000002", "1744000000000000001",
+    ]
+    assert items[1].author == "User 2"
+
+
+def test_twitter_routes_batched_results_to_their_phrases(replay):
+    source = TwitterSource("token", transport=replay("twitter"))
+    requests = [search_request("climate"), search_request("solar")]
+
+    items = list(source.search_many(requests))
+
+    routed = sorted((item.search_phrase, item.external_id) for item in items)
+    assert routed == [
+        ("climate", "1744000000000000013"),
+        ("solar", "1744000000000000012"),
+        ("solar", "1744000000000000013"),
+    ]
+    stats = source.pop_request_stats(requests)
+    assert stats["queries"] == 1
+    assert stats["unrouted"] == 1
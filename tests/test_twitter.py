@@ -0,0 +1,77 @@
+import pytest
+
+from collector.quota import QuotaPlanner
+from collector.replay import TIME_PARAMS, ReplayTransport
+from collector.sources.twitter import TwitterSource
+from tests.conftest import FIXTURES, search_request
+from tests.test_quota import days_left
+
+
+def quota_source(redis_url: str, daily_cap: int) -> TwitterSource:
+    # Page sizes follow the quota, so they are left out of request matching
+    transport = ReplayTransport(
+        [FIXTURES / "twitter.json"], ignore_params=TIME_PARAMS | {"max_results"}
+    )
+    quota = QuotaPlanner(redis_url, monthly_cap=daily_cap * days_left())
+    return TwitterSource("token", transport=transport, quota=quota)
+
+
+def test_twitter_keeps_phrases_that_differ_only_in_case_apart(replay):
+    source = TwitterSource("token", transport=replay("twitter"))
+    requests = [search_request("climate"), search_request("Climate"), search_request("solar")]
+
+    items = list(source.search_many(requests))
+
+    phrases = sorted(item.search_phrase for item in items if item.external_id.endswith("13"))
+    assert phrases == ["Climate", "climate", "solar"]
+
+
+def test_twitter_rejects_phrases_too_long_for_a_query(replay):
+    source = TwitterSource("token", transport=replay("twitter"))
+    requests = [search_request("climate"), search_request("x" * TwitterSource.MAX_QUERY_LENGTH)]
+
+    results = source.search_many(requests)
+    items = [next(results) for _ in range(3)]
+    with pytest.raises(RuntimeError, match="too long"):
+        next(results)
+
+    assert {item.search_phrase for item in items} == {"climate"}
+
+
+def test_twitter_batches_fit_the_query_length_limit():
+    source = TwitterSource("token")
+    # Five terms this long fill the limit if the space before the suffix
+    # isn't counted
+    size = (TwitterSource.MAX_QUERY_LENGTH - len("()") - len(TwitterSource.QUERY_SUFFIX)
+            - 4 * len(" OR ")) // 5
+    requests = [search_request(f"{i}" * size) for i in range(5)]
+
+    batches = source._batches(requests)
+
+    assert len(batches) == 2
+    for batch in batches:
+        terms = " OR ".join(source._term(r.phrase) for r in batch)
+        assert len(f"({terms}) {TwitterSource.QUERY_SUFFIX}") <= TwitterSource.MAX_QUERY_LENGTH
+
+
+def test_twitter_stops_routing_to_a_phrase_once_its_share_is_spent(redis_url):
+    # One tweet a day for each phrase
+    source = quota_source(redis_url, daily_cap=2)
+    requests = [search_request("climate"), search_request("solar")]
+
+    items = list(source.search_many(requests))
+
+    # The second solar tweet is over solar's share; climate's is untouched
+    routed = sorted((item.search_phrase, item.external_id) for item in items)
+    assert routed == [("climate", "1744000000000000013"), ("solar", "1744000000000000013")]
+    assert source.quota.allowance(["climate", "solar"]) == {"climate": 0, "solar": 0}
+
+
+def test_twitter_stops_paging_once_every_share_is_spent(redis_url):
+    source = quota_source(redis_url, daily_cap=1)
+    request = search_request()
+
+    items = list(source.search(request))
+
+    assert [item.external_id for item in items] == ["1744000000000000003"]
+    assert source.pop_request_stats([request])["queries"] == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from shared.urls import canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Scheme, host and default port
+    ("http://WWW.Example.com:80/news/story", "https://example.com/news/story"),
+    ("https://m.example.com/news/story/", "https://example.com/news/story"),
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+    # Tracking parameters, fragment and query order
+    ("https://example.com/a?utm_source=x&b=2&fbclid=y&a=1#top", "https://example.com/a?a=1&b=2"),
+    # AMP pages
+    ("https://amp.example.com/news/story/amp/", "https://example.com/news/story"),
+    ("https://example.com/news/story.amp", "https://example.com/news/story"),
+    # Redirect wrappers
+    ("https://www.google.com/url?q=https://example.com/a?utm_medium=x&sa=D",
+     "https://example.com/a"),
+    ("https://l.facebook.com/l.php?u=https%3A%2F%2Fexample.com%2Fa&h=abc", "https://example.com/a"),
+    ("https://href.li/?https://example.com/a", "https://example.com/a"),
+    # Wrappers without a usable target are kept as they are
+    ("https://www.google.com/search?q=climate", "https://google.com/search?q=climate"),
+])
+def test_canonicalizes(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["", None, "mailto:someone@example.com", "not a url", "https://"])
+def test_non_http_urls_have_no_canonical_form(url):
+    assert canonicalize_url(url) == ""
+
+
+def test_same_article_from_different_sources():
+    urls = [
+        "https://www.reuters.com/world/climate-talks-stall?utm_source=newsapi",
+        "http://reuters.com/world/climate-talks-stall/#comments",
+        "https://out.reddit.com/?url=https%3A%2F%2Fwww.reuters.com%2Fworld%2Fclimate-talks-stall",
+    ]
+
+    assert len({canonicalize_url(url) for url in urls}) == 1
@@ -0,0 +1,44 @@
+import json
+import pytest
+
+from shared.wire import FLAG_ZLIB, VERSION, MessageEncoder, decode
+
+ITEM = {"id": "abc", "title": "Climate talks", "content": "Delegates met. " * 200}
+
+
+def test_json_is_the_default_format():
+    message = MessageEncoder().encode(ITEM)
+
+    assert isinstance(message, str)
+    assert json.loads(message) == ITEM
+    assert decode(message) == ITEM
+
+
+def test_binary_round_trip_compresses_large_payloads():
+    message = MessageEncoder("binary", compress_threshold=1024).encode(ITEM)
+
+    assert message[0] == VERSION
+    assert message[1] & FLAG_ZLIB
+    assert decode(message) == ITEM
+
+
+def test_binary_leaves_small_payloads_uncompressed():
+    item = {"id": "abc", "title": "Short"}
+    message = MessageEncoder("binary", compress_threshold=1024).encode(item)
+
+    assert message[1] == 0
+    assert decode(message) == item
+
+
+def test_decodes_legacy_json_bytes():
+    assert decode(json.dumps(ITEM).encode()) == ITEM
+
+
+def test_rejects_unknown_versions():
+    with pytest.raises(ValueError, match="version"):
+        decode(bytes((VERSION + 1, 0)) + b"{}")
+
+
+def test_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        MessageEncoder("msgpack")